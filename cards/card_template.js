@@ -0,0 +1,51 @@
+// Generated by combine_spells.py from card_template.html - do not edit
+(function () {
+    const ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;', '`': '&#x60;', '=': '&#x3D;' };
+
+    // Same rules as Handlebars: {{#if}} is false for empty arrays, {{x}} escapes HTML
+    const truthy = (value) => !!value && !(Array.isArray(value) && value.length === 0);
+    const raw = (value) => (value == null ? '' : String(value));
+    const escape = (value) => raw(value).replace(/[&<>"'`=]/g, (char) => ESCAPES[char]);
+
+    window.precompiledCardTemplate = function (data) {
+        let out = '';
+        out += "<div class=\"spell-card\">\n    <div class=\"spell-name\">\n";
+        if (truthy(data.isRitual)) {
+            out += "        <div class=\"ritual-indicator\"><span>R</span></div>\n";
+        }
+        out += "        <span class=\"spell-title-text\">";
+        out += escape(data.spellTitle);
+        out += "</span>\n";
+        if (truthy(data.levelText)) {
+            out += "        <div class=\"spell-level-circle\"><span>";
+            out += escape(data.levelText);
+            out += "</span></div>\n";
+        }
+        out += "    </div>\n    <div class=\"spell-content\">\n        <div class=\"spell-header\"></div>\n";
+        if (truthy(data.hasHeader)) {
+            out += "        <div class=\"spell-header-bar\">\n            <div class=\"spell-header-column\">\n                <div class=\"spell-header-label\">RANGE</div>\n                <div class=\"spell-header-value\">";
+            out += escape(data.formattedRange);
+            out += "</div>\n            </div>\n            <div class=\"spell-header-column\">\n                <div class=\"spell-header-label\">COMPONENTS</div>\n                <div class=\"spell-header-value\">";
+            out += escape(data.formattedComponents);
+            out += "</div>\n            </div>\n            <div class=\"spell-header-column\">\n                <div class=\"spell-header-label\">DURATION</div>\n                <div class=\"spell-header-value\">";
+            out += raw(data.formattedDuration);
+            out += "</div>\n            </div>\n            <div class=\"spell-header-column\">\n                <div class=\"spell-header-label\">CASTING TIME</div>\n                <div class=\"spell-header-value\">";
+            out += escape(data.formattedCastingTime);
+            out += "</div>\n            </div>\n        </div>\n";
+        }
+        out += "        <div class=\"spell-body\">\n            <div class=\"spell-description\">\n                <div class=\"spell-description-content\">\n";
+        if (truthy(data.formattedMaterialComponent)) {
+            out += "                    <em>Material Component:</em> ";
+            out += raw(data.formattedMaterialComponent);
+            out += "<br/><br/>\n";
+        }
+        out += "                    <span class=\"description-content\">";
+        out += raw(data.description);
+        out += "</span>\n                </div>\n            </div>\n        </div>\n    </div>\n    <div class=\"spell-footer\">\n        <div class=\"spell-school\">";
+        out += escape(data.school_of_magic);
+        out += "</div>\n        <div class=\"spell-classes\">";
+        out += escape(data.classes);
+        out += "</div>\n    </div>\n</div>\n";
+        return out;
+    };
+})();
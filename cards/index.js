@@ -67,6 +67,7 @@ function saveSettings(state) {
 }
 
 // Parse CSV line (handles quoted fields with semicolon delimiter)
+// Columns: level;name;school_of_magic;casting_time;range;components;material_component;duration;description;classes
 function parseCSVLine(line) {
     const result = [];
     let current = '';
@@ -104,9 +105,9 @@ function parseCSVLine(line) {
             casting_time: result[3],
             range: result[4],
             components: result[5],
-            duration: result[6],
-            description: result[7],
-            material_component: result[8],
+            material_component: result[6],
+            duration: result[7],
+            description: result[8],
             classes: result[9]
         };
     }
@@ -117,6 +118,12 @@ function parseCSVLine(line) {
 // Load card template
 async function loadCardTemplate() {
     console.log('🔄 Loading card template...');
+
+    // card_template.js (written by combine_spells.py) defines the template already compiled
+    if (typeof window.precompiledCardTemplate === 'function') {
+        console.log('✅ Using precompiled card template');
+        return window.precompiledCardTemplate;
+    }
     
     try {
         // Check if Handlebars is available
@@ -236,8 +243,17 @@ function createFallbackTemplate() {
     };
 }
 
-// Load spells from CSV
+// Load spells pre-parsed by combine_spells.py, or from the CSV when there is no JSON
 async function loadSpells() {
+    try {
+        const jsonResponse = await fetch('all_spells.json');
+        if (jsonResponse.ok) {
+            return await jsonResponse.json();
+        }
+    } catch (error) {
+        console.warn('all_spells.json unavailable, parsing all_spells.csv:', error);
+    }
+
     try {
         const response = await fetch('all_spells.csv');
         const csvText = await response.text();
@@ -438,7 +454,7 @@ const App = () => {
         // Apply level filters
         if (state.spellSelection.selectedLevels.size > 0) {
             result = result.filter(spell =>
-                state.spellSelection.selectedLevels.has(spell.level)
+                state.spellSelection.selectedLevels.has(String(spell.level))
             );
         }
 
@@ -1121,7 +1137,7 @@ function generateSpellCardData(spell) {
     }
 
     const hasHeader = !!(formattedRange || formattedComponents || formattedDuration || formattedCastingTime);
-    const levelText = isContinuation ? '' : (spell.level === '0' ? '0' : spell.level);
+    const levelText = isContinuation ? '' : String(spell.level);
 
     return {
         levelText,
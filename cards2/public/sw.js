@@ -0,0 +1,261 @@
+/**
+ * Service worker: offline copies of the app and its card data
+ *
+ * Data files are listed in precache-manifest.json (written by
+ * spells/precache_manifest.py) with a content hash per file. Files marked
+ * "precache" are downloaded on install; the others are cached the first time
+ * they are requested. A cached data file is served without touching the
+ * network for as long as the manifest lists the same revision.
+ *
+ * The app shell (index.html and the built scripts and styles it references)
+ * is cached on install too, so the app opens offline after a single visit.
+ * App files are served from the cache when present and refreshed in the
+ * background; a refreshed index.html caches its new assets for the next start.
+ */
+
+const DATA_CACHE = 'card-data-v1';
+const APP_CACHE = 'card-app-v2';
+const MANIFEST_URL = 'precache-manifest.json';
+
+// src/href attributes of the built index.html (scripts, styles, module preloads, icons)
+const SHELL_ASSET_PATTERN = /\b(?:src|href)="([^"]+)"/g;
+
+const scopeUrl = new URL(self.registration.scope);
+
+let manifestPromise = null;
+
+/**
+ * Cache key of one revision of a data file
+ * @param {string} url - Path relative to the scope
+ * @param {string} revision - Content hash from the manifest
+ * @returns {string} Absolute URL used as the cache key
+ */
+function revisionKey(url, revision) {
+  return new URL(`${url}?rev=${revision}`, scopeUrl).href;
+}
+
+/**
+ * Fetch the manifest, falling back to the last cached copy when offline
+ * @returns {Promise<Response|undefined>} Manifest response
+ */
+async function manifestResponse() {
+  const cache = await caches.open(DATA_CACHE);
+  const manifestUrl = new URL(MANIFEST_URL, scopeUrl).href;
+  try {
+    const response = await fetch(manifestUrl, { cache: 'no-cache' });
+    if (response.ok) {
+      await cache.put(manifestUrl, response.clone());
+      return response;
+    }
+  } catch {
+    // Offline: use the cached copy
+  }
+  return cache.match(manifestUrl);
+}
+
+/**
+ * Fetch and parse the manifest
+ * @returns {Promise<Map<string, Object>>} Manifest entries by relative URL
+ */
+async function fetchManifest() {
+  const response = await manifestResponse();
+  if (!response) return new Map();
+  const manifest = await response.json();
+  return new Map(manifest.files.map(entry => [entry.url, entry]));
+}
+
+/**
+ * Current manifest entries (fetched once per worker start, refreshed on navigation)
+ * @returns {Promise<Map<string, Object>>}
+ */
+function loadManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetchManifest();
+  }
+  return manifestPromise;
+}
+
+/**
+ * Fetch one revision of a data file into the cache, dropping older revisions
+ * @param {Cache} cache - Data cache
+ * @param {Object} entry - Manifest entry
+ * @returns {Promise<Response>} Fresh response
+ */
+async function cacheRevision(cache, entry) {
+  const response = await fetch(new URL(entry.url, scopeUrl).href, { cache: 'no-cache' });
+  if (!response.ok) return response;
+
+  const key = revisionKey(entry.url, entry.revision);
+  await cache.put(key, response.clone());
+  const prefix = new URL(`${entry.url}?rev=`, scopeUrl).href;
+  const keys = await cache.keys();
+  await Promise.all(keys
+    .filter(request => request.url.startsWith(prefix) && request.url !== key)
+    .map(request => cache.delete(request)));
+  return response;
+}
+
+/**
+ * Serve a data file listed in the manifest, cache first by revision
+ * @param {Object} entry - Manifest entry
+ * @returns {Promise<Response>}
+ */
+async function serveData(entry) {
+  const cache = await caches.open(DATA_CACHE);
+  const cached = await cache.match(revisionKey(entry.url, entry.revision));
+  if (cached) return cached;
+  try {
+    return await cacheRevision(cache, entry);
+  } catch (error) {
+    // Offline with a stale revision: any older copy beats nothing
+    const keys = await cache.keys();
+    const prefix = new URL(`${entry.url}?rev=`, scopeUrl).href;
+    const older = keys.find(request => request.url.startsWith(prefix));
+    if (older) return cache.match(older);
+    throw error;
+  }
+}
+
+/**
+ * Same-scope asset URLs an index.html references
+ * @param {string} html - Page source
+ * @returns {Array<string>} Absolute URLs
+ */
+function shellAssets(html) {
+  const urls = new Set();
+  for (const [, href] of html.matchAll(SHELL_ASSET_PATTERN)) {
+    const url = new URL(href, scopeUrl);
+    if (url.origin === scopeUrl.origin && url.pathname.startsWith(scopeUrl.pathname) && url.href !== scopeUrl.href) {
+      urls.add(url.href);
+    }
+  }
+  return [...urls];
+}
+
+/**
+ * Cache a fetched index.html as the shell, with every asset it references.
+ * Assets referenced by neither this page nor the one it replaces are dropped.
+ * @param {Cache} cache - App cache
+ * @param {Response} response - Fresh index.html response
+ */
+async function cacheShell(cache, response) {
+  const html = await response.clone().text();
+  const previous = await cache.match(scopeUrl.href);
+  const keep = new Set([scopeUrl.href, ...shellAssets(html)]);
+  if (previous) {
+    shellAssets(await previous.text()).forEach(url => keep.add(url));
+  }
+
+  await Promise.all(shellAssets(html).map(async (url) => {
+    if (!await cache.match(url)) {
+      const asset = await fetch(url);
+      if (asset.ok) await cache.put(url, asset);
+    }
+  }));
+  await cache.put(scopeUrl.href, response);
+
+  const keys = await cache.keys();
+  await Promise.all(keys
+    .filter(request => !keep.has(request.url))
+    .map(request => cache.delete(request)));
+}
+
+/**
+ * Fetch the shell (index.html and its assets) into the app cache
+ * @returns {Promise<void>}
+ */
+async function precacheShell() {
+  const cache = await caches.open(APP_CACHE);
+  const response = await fetch(scopeUrl.href, { cache: 'no-cache' });
+  if (response.ok) {
+    await cacheShell(cache, response);
+  }
+}
+
+/**
+ * Serve an app file from the cache, refreshing it in the background
+ * (stale-while-revalidate); without a cached copy, from the network
+ * @param {FetchEvent} event - Fetch event
+ * @returns {Promise<Response>}
+ */
+async function serveApp(event) {
+  const { request } = event;
+  const isPage = request.mode === 'navigate';
+  const cache = await caches.open(APP_CACHE);
+  // Every page of the single-page app is the same shell
+  const cached = isPage ? await cache.match(scopeUrl.href) : await cache.match(request);
+
+  const refresh = (async () => {
+    const response = await fetch(request, isPage ? { cache: 'no-cache' } : undefined);
+    if (response.ok) {
+      if (isPage) {
+        await cacheShell(cache, response.clone());
+      } else {
+        await cache.put(request, response.clone());
+      }
+    }
+    return response;
+  })();
+
+  if (cached) {
+    event.waitUntil(refresh.catch(() => {
+      // Offline: the cached copy stands
+    }));
+    return cached;
+  }
+  return refresh;
+}
+
+self.addEventListener('install', (event) => {
+  event.waitUntil((async () => {
+    const manifest = await loadManifest();
+    const cache = await caches.open(DATA_CACHE);
+    const precache = [...manifest.values()].filter(entry => entry.precache);
+    await Promise.all([
+      precacheShell(),
+      ...precache.map(async (entry) => {
+        if (!await cache.match(revisionKey(entry.url, entry.revision))) {
+          await cacheRevision(cache, entry);
+        }
+      })
+    ]);
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names
+      .filter(name => name !== DATA_CACHE && name !== APP_CACHE)
+      .map(name => caches.delete(name)));
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || url.origin !== scopeUrl.origin || !url.pathname.startsWith(scopeUrl.pathname)) {
+    return;
+  }
+
+  if (request.mode === 'navigate') {
+    // A page load picks up a newly deployed manifest
+    manifestPromise = null;
+    event.respondWith(serveApp(event));
+    return;
+  }
+
+  const path = url.pathname.slice(scopeUrl.pathname.length);
+  if (path === MANIFEST_URL) {
+    event.respondWith(manifestResponse().then(response => response || fetch(request)));
+    return;
+  }
+
+  event.respondWith((async () => {
+    const manifest = await loadManifest();
+    const entry = manifest.get(path);
+    return entry ? serveData(entry) : serveApp(event);
+  })());
+});
@@ -1,4 +1,5 @@
-import React, { useMemo, useState } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
+import { loadSearchIndex, searchSpellNames } from '../utils/spellSearchIndex';
 import './AdditionalSpells.css';
 import './SelectorCommon.css';
 
@@ -12,14 +13,31 @@ import './SelectorCommon.css';
  */
 const AdditionalSpells = ({ allSpells = [], activeSpellNames = new Set(), selectedNames = [], onChange }) => {
   const [query, setQuery] = useState('');
+  const [searchIndex, setSearchIndex] = useState(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    loadSearchIndex().then(index => {
+      if (!cancelled) setSearchIndex(index);
+    });
+    return () => { cancelled = true; };
+  }, []);
 
   const normalizedQuery = query.trim().toLowerCase();
 
+  const allItems = useMemo(() => allSpells.map(s => ({ name: s.name })), [allSpells]);
+  const availableNames = useMemo(() => new Set(allItems.map(i => i.name)), [allItems]);
+
   const items = useMemo(() => {
-    const list = allSpells.map(s => ({ name: s.name }));
-    if (!normalizedQuery) return list;
-    return list.filter(i => i.name.toLowerCase().includes(normalizedQuery));
-  }, [allSpells, normalizedQuery]);
+    if (!normalizedQuery) return allItems;
+    if (searchIndex) {
+      // Index covers every source; keep only spells that are currently loaded
+      return searchSpellNames(searchIndex, normalizedQuery)
+        .filter(name => availableNames.has(name))
+        .map(name => ({ name }));
+    }
+    return allItems.filter(i => i.name.toLowerCase().includes(normalizedQuery));
+  }, [allItems, availableNames, searchIndex, normalizedQuery]);
 
   const selectedSet = useMemo(() => new Set(selectedNames), [selectedNames]);
 
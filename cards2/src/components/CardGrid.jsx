@@ -1,27 +1,42 @@
 import React from 'react';
 import Card from './Card';
+import CardThumbnail from './CardThumbnail';
 import { getCardDimensions, calculateGridLayout } from '../utils/layoutConfig';
 import './CardGrid.css';
 
-const CardGrid = ({ cardData = [], cardSize = 'standard', pageSize = 'letter' }) => {
+const CardGrid = ({ cardData = [], cardSize = 'standard', pageSize = 'letter', onClick }) => {
   const cardDimensions = getCardDimensions(cardSize);
   const { cardsPerRow, cardsPerColumn } = calculateGridLayout(pageSize, cardSize);
 
   return (
     <div 
-      className="card-grid"
+      className={`card-grid${onClick ? ' card-grid--zoomable' : ''}`}
+      onClick={onClick}
       style={{
         gridTemplateColumns: `repeat(${cardsPerRow}, ${cardDimensions.width})`,
         gridTemplateRows: `repeat(${cardsPerColumn}, ${cardDimensions.height})`
       }}
     >
       {cardData.map((card, cardIndex) => (
-        <Card 
-          key={`${card.title}-${cardIndex}`}
-          cardData={card} 
-          cardSize={cardSize}
-          className="grid-card"
-        />
+        card?.thumbnail ? (
+          // Overview: a prebuilt image of the card instead of the full component
+          <CardThumbnail
+            key={`${card.title}-${cardIndex}`}
+            entry={card}
+            cardSize={cardSize}
+            className="grid-card"
+          />
+        ) : card ? (
+          <Card 
+            key={`${card.title}-${cardIndex}`}
+            cardData={card} 
+            cardSize={cardSize}
+            className="grid-card"
+          />
+        ) : (
+          // Empty slot left by guillotine packing so rows line up with the cuts
+          <div key={`empty-${cardIndex}`} className="grid-card grid-card--empty" />
+        )
       ))}
     </div>
   );
@@ -0,0 +1,27 @@
+import React from 'react';
+import { getCardDimensions } from '../utils/layoutConfig';
+import './CardThumbnail.css';
+
+const CardThumbnail = ({ entry, cardSize = 'standard', className = '' }) => {
+  const dimensions = getCardDimensions(cardSize);
+  const { atlas, column, row, columns, rows } = entry.thumbnail;
+
+  // The cell fills the card; percentages keep the sprite aligned at any card size
+  return (
+    <div
+      className={`card-thumbnail ${className}`}
+      role="img"
+      aria-label={entry.title}
+      title={entry.title}
+      style={{
+        width: dimensions.width,
+        height: dimensions.height,
+        backgroundImage: `url(./${atlas})`,
+        backgroundSize: `${columns * 100}% ${rows * 100}%`,
+        backgroundPosition: `${columns > 1 ? (column / (columns - 1)) * 100 : 0}% ${rows > 1 ? (row / (rows - 1)) * 100 : 0}%`
+      }}
+    />
+  );
+};
+
+export default CardThumbnail;
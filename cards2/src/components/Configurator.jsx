@@ -34,6 +34,10 @@ const Configurator = ({ cardMode, onCardModeChange, onSelectionChange, onLayoutC
     const initialState = stateManager.getState();
     return initialState.layoutConfig.cardSize || 'standard';
   });
+  const [guillotine, setGuillotine] = useState(() => {
+    const initialState = stateManager.getState();
+    return !!initialState.layoutConfig.guillotine;
+  });
 
   // Additional spells selection (by name)
   const [additionalSpellNames, setAdditionalSpellNames] = useState(() => {
@@ -202,10 +206,11 @@ const Configurator = ({ cardMode, onCardModeChange, onSelectionChange, onLayoutC
     if (onLayoutChange) {
       onLayoutChange({
         pageSize,
-        cardSize
+        cardSize,
+        guillotine
       });
     }
-  }, [pageSize, cardSize, onLayoutChange]);
+  }, [pageSize, cardSize, guillotine, onLayoutChange]);
 
   const handleClassChange = (newSelectedClasses) => {
     setSelectedClasses(newSelectedClasses);
@@ -245,6 +250,15 @@ const Configurator = ({ cardMode, onCardModeChange, onSelectionChange, onLayoutC
     });
   };
 
+  const handleGuillotineChange = (newGuillotine) => {
+    setGuillotine(newGuillotine);
+    const currentState = stateManager.getState();
+    stateManager.updateLayoutConfig({
+      ...currentState.layoutConfig,
+      guillotine: newGuillotine
+    });
+  };
+
   const handleAdditionalSpellsChange = (names) => {
     setAdditionalSpellNames(names);
     const currentState = stateManager.getState();
@@ -295,8 +309,10 @@ const Configurator = ({ cardMode, onCardModeChange, onSelectionChange, onLayoutC
                 <LayoutSelector
                   pageSize={pageSize}
                   cardSize={cardSize}
+                  guillotine={guillotine}
                   onPageSizeChange={handlePageSizeChange}
                   onCardSizeChange={handleCardSizeChange}
+                  onGuillotineChange={handleGuillotineChange}
                 />
               </>
             ) : (
@@ -312,8 +328,10 @@ const Configurator = ({ cardMode, onCardModeChange, onSelectionChange, onLayoutC
                 <LayoutSelector
                   pageSize={pageSize}
                   cardSize={cardSize}
+                  guillotine={guillotine}
                   onPageSizeChange={handlePageSizeChange}
                   onCardSizeChange={handleCardSizeChange}
+                  onGuillotineChange={handleGuillotineChange}
                 />
               </>
             )}
@@ -3,7 +3,7 @@ import { getPageSizeOptions, getCardSizeOptions } from '../utils/layoutConfig';
 import './LayoutSelector.css';
 import './SelectorCommon.css';
 
-const LayoutSelector = ({ pageSize, cardSize, onPageSizeChange, onCardSizeChange }) => {
+const LayoutSelector = ({ pageSize, cardSize, guillotine = false, onPageSizeChange, onCardSizeChange, onGuillotineChange }) => {
   const pageSizes = getPageSizeOptions();
   const cardSizes = getCardSizeOptions();
 
@@ -49,6 +49,15 @@ const LayoutSelector = ({ pageSize, cardSize, onPageSizeChange, onCardSizeChange
             ))}
           </select>
         </div>
+
+        <label className="selector-checkbox-label layout-row">
+          <input
+            type="checkbox"
+            checked={guillotine}
+            onChange={(e) => onGuillotineChange(e.target.checked)}
+          />
+          <span className="selector-checkbox-text">Keep split cards in one row (for cutting into strips)</span>
+        </label>
       </div>
     </div>
   );
@@ -1,14 +1,59 @@
 import React, { useState, useEffect } from 'react';
 import Page from './Page';
 import CardGrid from './CardGrid';
-import { calculateCardsPerPage } from '../utils/layoutConfig';
+import { calculateCardsPerPage, calculateGridLayout } from '../utils/layoutConfig';
+import { packPages } from '../utils/pagePacker';
 import { reflowCalculator } from '../utils/reflowCalculator';
 import { SpellToCardDataTransformer } from '../utils/SpellToCardDataTransformer';
+import { loadThumbnailIndex, thumbnailEntries } from '../utils/cardThumbnails';
 import './PageContainer.css';
 
+// Selections larger than this can be browsed as prebuilt thumbnails
+const OVERVIEW_THRESHOLD = 48;
+
 const PageContainer = ({ cards = [], layoutConfig }) => {
   const [reflowedCardData, setReflowedCardData] = useState([]);
   const [isCalculating, setIsCalculating] = useState(false);
+  // null while there is no overview for the selection (small, loading or missing thumbnails)
+  const [overviewEntries, setOverviewEntries] = useState(null);
+  const [showOverview, setShowOverview] = useState(false);
+  const [zoomedPage, setZoomedPage] = useState(null);
+
+  const cardSize = layoutConfig?.cardSize || 'standard';
+
+  // Large selections offer an overview of thumbnails when every card has one. Full
+  // cards stay the default, so printing a deck never depends on leaving the overview
+  useEffect(() => {
+    let cancelled = false;
+    setShowOverview(false);
+    setZoomedPage(null);
+    setOverviewEntries(null);
+
+    if (!cards || cards.length <= OVERVIEW_THRESHOLD) {
+      return;
+    }
+
+    loadThumbnailIndex(cardSize).then(index => {
+      if (!cancelled) {
+        setOverviewEntries(index ? thumbnailEntries(cards, index) : null);
+      }
+    });
+    return () => { cancelled = true; };
+  }, [cards, cardSize]);
+
+  // Thumbnails are for browsing: printing from the overview switches back to full
+  // cards. That print can't wait for the layout, so print CSS hides the overview
+  // pages and shows a notice instead of printing thumbnails
+  useEffect(() => {
+    const showFullCardsForPrint = () => {
+      setShowOverview(false);
+      setZoomedPage(null);
+    };
+    window.addEventListener('beforeprint', showFullCardsForPrint);
+    return () => window.removeEventListener('beforeprint', showFullCardsForPrint);
+  }, []);
+
+  const isOverview = !!overviewEntries && showOverview;
 
   // Calculate reflowed cards when input cards or layout config changes
   useEffect(() => {
@@ -18,6 +63,11 @@ const PageContainer = ({ cards = [], layoutConfig }) => {
         return;
       }
 
+      // The overview doesn't need measured cards; the full layout is kept for switching back
+      if (isOverview) {
+        return;
+      }
+
       setIsCalculating(true);
       
       // Check if cards are already CardData objects (from creature or spell transformer)
@@ -44,7 +94,7 @@ const PageContainer = ({ cards = [], layoutConfig }) => {
     };
 
     calculateReflow();
-  }, [cards, layoutConfig?.cardSize]);
+  }, [cards, layoutConfig?.cardSize, isOverview]);
 
   if (!cards || cards.length === 0) {
     return (
@@ -62,29 +112,83 @@ const PageContainer = ({ cards = [], layoutConfig }) => {
     layoutConfig?.cardSize || 'standard'
   );
   
-  // Split reflowed cardData into pages
-  const pages = [];
-  for (let i = 0; i < reflowedCardData.length; i += cardsPerPage) {
-    pages.push(reflowedCardData.slice(i, i + cardsPerPage));
-  }
+  const { cardsPerRow } = calculateGridLayout(
+    layoutConfig?.pageSize || 'letter',
+    layoutConfig?.cardSize || 'standard'
+  );
+
+  /**
+   * Show one overview page as full cards
+   * @param {number} pageIndex - Page to zoom
+   * @param {Array<Object>} entries - Thumbnail entries on that page
+   */
+  const zoomPage = async (pageIndex, entries) => {
+    if (zoomedPage?.index === pageIndex) {
+      setZoomedPage(null);
+      return;
+    }
+    const pageCards = [...new Set(entries.filter(Boolean).map(entry => entry.source))];
+    setZoomedPage({ index: pageIndex, pages: null });
+    const reflowed = await reflowCalculator(pageCards, cardSize);
+    setZoomedPage(current => (current?.index === pageIndex
+      ? { index: pageIndex, pages: packPages(reflowed, cardsPerPage, cardsPerRow, !!layoutConfig?.guillotine) }
+      : current));
+  };
+
+  // Pack reflowed cardData (or thumbnails) into pages, keeping continuation cards with their parent
+  const pages = packPages(isOverview ? overviewEntries : reflowedCardData, cardsPerPage, cardsPerRow, !!layoutConfig?.guillotine);
+
+  const renderPage = (pageCardData, key, onClick) => (
+    <Page key={key} layoutConfig={layoutConfig}>
+      <CardGrid 
+        cardData={pageCardData}
+        cardSize={cardSize}
+        pageSize={layoutConfig?.pageSize || 'letter'}
+        onClick={onClick}
+      />
+    </Page>
+  );
 
   return (
     <div className="page-container">
-      {isCalculating && (
+      {overviewEntries && (
+        <div className="overview-controls">
+          <button type="button" onClick={() => { setShowOverview(!showOverview); setZoomedPage(null); }}>
+            {showOverview ? 'Show full cards (for printing)' : 'Show overview'}
+          </button>
+          {isOverview && <span>Overview of {cards.length} cards. Click a page to see its cards in full.</span>}
+        </div>
+      )}
+      {isCalculating && !isOverview && (
         <div className="calculating-message">
           <p>Calculating card layouts...</p>
         </div>
       )}
-      <div className="pages-preview">
-        {pages.map((pageCardData, pageIndex) => (
-          <Page key={pageIndex} layoutConfig={layoutConfig}>
-            <CardGrid 
-              cardData={pageCardData}
-              cardSize={layoutConfig?.cardSize || 'standard'}
-              pageSize={layoutConfig?.pageSize || 'letter'}
-            />
-          </Page>
-        ))}
+      {isOverview && (
+        <div className="overview-print-notice">
+          <p>The overview shows card previews only. Full cards are being laid out; print again once they appear.</p>
+        </div>
+      )}
+      <div className={`pages-preview${isOverview ? ' pages-preview--overview' : ''}`}>
+        {pages.map((pageCardData, pageIndex) => {
+          if (!isOverview) {
+            return renderPage(pageCardData, pageIndex);
+          }
+          const zoomPageCards = () => zoomPage(pageIndex, pageCardData);
+          if (zoomedPage?.index !== pageIndex) {
+            return renderPage(pageCardData, pageIndex, zoomPageCards);
+          }
+          if (!zoomedPage.pages) {
+            return (
+              <div key={pageIndex} className="calculating-message">
+                <p>Calculating card layouts...</p>
+              </div>
+            );
+          }
+          return zoomedPage.pages.map((zoomedCardData, zoomedIndex) => (
+            renderPage(zoomedCardData, `${pageIndex}-${zoomedIndex}`, zoomedIndex === 0 ? zoomPageCards : undefined)
+          ));
+        })}
       </div>
     </div>
   );
@@ -13,7 +13,9 @@ export class CardData {
     bottomRight = '',
     fontScale = 1,
     error = false,
-    sizeReduced = false
+    sizeReduced = false,
+    fitHints = null,
+    thumbnailKey = null
   } = {}) {
     this.title = title;
     this.leftIndicator = leftIndicator;
@@ -25,6 +27,8 @@ export class CardData {
     this.fontScale = fontScale; // scaling factor applied to body text only
     this.error = error; // true if reflow could not make it fit
     this.sizeReduced = sizeReduced; // true if fontScale < 1 was applied
+    this.fitHints = fitHints; // precomputed fit per card size, used as a starting point by reflow
+    this.thumbnailKey = thumbnailKey; // key into the prebuilt thumbnail atlases, e.g. 'spell:fireball'
   }
 
   /**
@@ -51,7 +55,9 @@ export class CardData {
       bottomRight: this.bottomRight,
       fontScale: this.fontScale,
       error: this.error,
-      sizeReduced: this.sizeReduced
+      sizeReduced: this.sizeReduced,
+      fitHints: this.fitHints,
+      thumbnailKey: this.thumbnailKey
     };
   }
 
@@ -51,6 +51,10 @@ export class Creature {
     this.traits = Array.isArray(data.special_abilities) ? data.special_abilities : (Array.isArray(data.traits) ? data.traits : []);
     this.reactions = Array.isArray(data.reactions) ? data.reactions : [];
     this.legendaryActions = Array.isArray(data.legendary_actions) ? data.legendary_actions : [];
+
+    // Card fields and fit hints precomputed at build time (spells/creature_cards.py), if present
+    this.card = data.card || null;
+    this.fitHints = data.fit || null;
   }
   
   /**
@@ -1,5 +1,6 @@
 import { Creature } from './Creature.js';
 import { CardData } from './CardData.js';
+import { spellId } from './datasetCache.js';
 
 /**
  * Transformer utility to convert Creature objects to CardData objects
@@ -14,6 +15,15 @@ export class CreatureToCardDataTransformer {
     if (!creature) {
       return new CardData();
     }
+
+    // Precomputed at build time: the same fields, without the formatting work
+    if (creature.card) {
+      return new CardData({
+        ...creature.card,
+        fitHints: creature.fitHints,
+        thumbnailKey: `creature:${spellId(creature.name)}`
+      });
+    }
     
     const formattedCR = creature.getFormattedCR();
     
@@ -127,7 +137,8 @@ export class CreatureToCardDataTransformer {
       specs: specs,
       body: body,
       bottomLeft: creature.getSizeAndType(),
-      bottomRight: creature.alignment
+      bottomRight: creature.alignment,
+      thumbnailKey: `creature:${spellId(creature.name)}`
     });
   }
   
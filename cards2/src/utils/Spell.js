@@ -23,6 +23,9 @@ export class Spell {
     this.classes = this.parseClasses(data.classes);
     this.isRitual = data.ritual || false;
     this.isConcentration = data.concentration || false;
+
+    // Offline fit hints per card size (spells/spell_fitting.py), if the data has them
+    this.fitHints = data.fit || null;
   }
 
   /**
@@ -1,5 +1,7 @@
 import { Spell } from './Spell';
 import { CardData } from './CardData';
+import { spellId } from './datasetCache';
+import { abbreviate } from './abbreviations';
 
 /**
  * Transformer utility to convert Spell objects to CardData objects
@@ -56,7 +58,9 @@ export class SpellToCardDataTransformer {
       specs: specs,
       body: body,
       bottomLeft: spell.schoolOfMagic,
-      bottomRight: spell.classes.join(', ')
+      bottomRight: spell.classes.join(', '),
+      fitHints: spell.fitHints,
+      thumbnailKey: `spell:${spellId(spell.name)}`
     });
   }
 
@@ -99,38 +103,21 @@ export class SpellToCardDataTransformer {
     if (!duration) return { formatted: '', isConcentration: false };
     
     const isConcentration = duration.toLowerCase().includes('concentration');
-    let formatted = duration;
-    
-    if (isConcentration) {
-      formatted = formatted.replace(/^Concentration,\s*/i, '');
-    }
-    // Replace "up to" with less-than-or-equal-to symbol
-    formatted = formatted.replace(/up to/gi, '≤');
-    
-    // Apply abbreviations
-    formatted = this.abbreviateSpecValue(formatted);
+
+    // Drops the "Concentration, " prefix, "up to" becomes ≤, plus the spec abbreviations
+    const formatted = abbreviate('duration', duration);
     
     return { formatted, isConcentration };
   }
 
   /**
-   * Apply abbreviations to spec values (range, duration, casting time)
+   * Apply abbreviations to spec values (range, casting time)
+   * The rules live in spells/abbreviations.json, shared with the Python scripts
    * @param {string} value - Original spec value
    * @returns {string} Abbreviated value
    */
   static abbreviateSpecValue(value) {
-    if (!value) return value;
-    
-    let abbreviated = value;
-    
-    // Replace "feet" and "foot" with "ft"
-    abbreviated = abbreviated.replace(/\bfeet\b/gi, 'ft');
-    abbreviated = abbreviated.replace(/\bfoot\b/gi, 'ft');
-    
-    // Replace "Instantaneous" with "Instant"
-    abbreviated = abbreviated.replace(/\bInstantaneous\b/gi, 'Instant');
-    
-    return abbreviated;
+    return abbreviate('spec', value);
   }
 
   /** Inline color palette for damage types */
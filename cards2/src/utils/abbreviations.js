@@ -0,0 +1,65 @@
+/**
+ * Spec value abbreviations
+ *
+ * Generated by spells/abbreviations.py from spells/abbreviations.json - do not
+ * edit. The tables are Aho-Corasick automata, so the Python analysis scripts
+ * and the cards abbreviate with exactly the same rules.
+ */
+
+const TABLES = {"spec":{"rules":[{"to":"ft","word":true,"start":false,"strip":false},{"to":"Instant","word":true,"start":false,"strip":false}],"goto":[{"f":1,"i":8},{"e":2,"o":5},{"e":3},{"t":4},{},{"o":6},{"t":7},{},{"n":9},{"s":10},{"t":11},{"a":12},{"n":13},{"t":14},{"a":15},{"n":16},{"e":17},{"o":18},{"u":19},{"s":20},{}],"fail":[0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],"output":[[],[],[],[],[[0,4]],[],[],[[0,4]],[],[],[],[],[],[],[],[],[],[],[],[],[[1,13]]]},"duration":{"rules":[{"to":"ft","word":true,"start":false,"strip":false},{"to":"Instant","word":true,"start":false,"strip":false},{"to":"","word":false,"start":true,"strip":true},{"to":"≤","word":false,"start":false,"strip":false}],"goto":[{"f":1,"i":8,"c":21,"u":35},{"e":2,"o":5},{"e":3},{"t":4},{},{"o":6},{"t":7},{},{"n":9},{"s":10},{"t":11},{"a":12},{"n":13},{"t":14},{"a":15},{"n":16},{"e":17},{"o":18},{"u":19},{"s":20},{},{"o":22},{"n":23},{"c":24},{"e":25},{"n":26},{"t":27},{"r":28},{"a":29},{"t":30},{"i":31},{"o":32},{"n":33},{",":34},{},{"p":36},{" ":37},{"t":38},{"o":39},{}],"fail":[0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,35,0,0,0,0,21,0,0,0,0,0,0,8,0,0,0,0,0,0,0,0],"output":[[],[],[],[],[[0,4]],[],[],[[0,4]],[],[],[],[],[],[],[],[],[],[],[],[],[[1,13]],[],[],[],[],[],[],[],[],[],[],[],[],[],[[2,14]],[],[],[],[],[[3,5]]]}};
+
+const isWordChar = (char) => char !== undefined && /^[A-Za-z0-9_]$/.test(char);
+
+const fold = (char) => {
+  const lower = char.toLowerCase();
+  return lower.length === char.length ? lower : char;
+};
+
+/**
+ * Abbreviate a value in one scan; the leftmost, then longest, match wins
+ * @param {string} table - Table name
+ * @param {string} text - Value to abbreviate
+ * @returns {string} Abbreviated value
+ */
+export function abbreviate(table, text) {
+  if (!text) return text;
+  const { rules, goto, fail, output } = TABLES[table];
+  const chars = Array.from(text);
+
+  const found = new Map();
+  let state = 0;
+  chars.forEach((rawChar, position) => {
+    const char = fold(rawChar);
+    while (state && !(char in goto[state])) {
+      state = fail[state];
+    }
+    state = goto[state][char] ?? 0;
+    const end = position + 1;
+    for (const [index, length] of output[state]) {
+      const start = end - length;
+      const rule = rules[index];
+      if (rule.start && start !== 0) continue;
+      if (rule.word && (isWordChar(chars[start - 1]) || isWordChar(chars[end]))) continue;
+      if (!found.has(start) || found.get(start)[0] < end) {
+        found.set(start, [end, index]);
+      }
+    }
+  });
+  if (found.size === 0) return text;
+
+  let result = '';
+  for (let position = 0; position < chars.length;) {
+    const match = found.get(position);
+    if (match) {
+      result += rules[match[1]].to;
+      position = match[0];
+      if (rules[match[1]].strip) {
+        while (position < chars.length && /\s/.test(chars[position])) position += 1;
+      }
+    } else {
+      result += chars[position];
+      position += 1;
+    }
+  }
+  return result;
+}
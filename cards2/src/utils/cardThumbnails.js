@@ -0,0 +1,80 @@
+import { loadSpellSources } from './spellDataParser.js';
+
+/**
+ * Prebuilt card thumbnails (built by spells/card_thumbnails.py)
+ *
+ * Each card size has an index of sprite atlases; every card lists the atlas
+ * cells of its parts (the card and its continuation cards).
+ */
+
+const indexPromises = {};
+
+/**
+ * Fetch the thumbnail index for a card size once
+ * @param {string} cardSize - Card size id
+ * @returns {Promise<Object|null>} Thumbnail index, or null if none is built
+ */
+export function loadThumbnailIndex(cardSize) {
+  if (!indexPromises[cardSize]) {
+    indexPromises[cardSize] = (async () => {
+      const sourcesConfig = await loadSpellSources();
+      const indexFile = sourcesConfig.thumbnails?.[cardSize];
+      if (!indexFile) return null;
+
+      const response = await fetch(`./${indexFile}`);
+      if (!response.ok) {
+        throw new Error(`Failed to fetch ${indexFile}: ${response.status} ${response.statusText}`);
+      }
+      return response.json();
+    })().catch(error => {
+      console.warn('Card thumbnails unavailable:', error.message);
+      delete indexPromises[cardSize];
+      return null;
+    });
+  }
+  return indexPromises[cardSize];
+}
+
+/**
+ * Locate one atlas cell
+ * @param {Object} index - Thumbnail index
+ * @param {number} cell - Cell number
+ * @returns {Object} { atlas, column, row, columns, rows } with the atlas sheet size in cells
+ */
+function locateCell(index, cell) {
+  const sheet = Math.floor(cell / index.perAtlas);
+  const offset = cell % index.perAtlas;
+  const [columns, rows] = index.sheets[sheet];
+  return {
+    atlas: index.atlases[sheet],
+    column: offset % index.columns,
+    row: Math.floor(offset / index.columns),
+    columns,
+    rows
+  };
+}
+
+/**
+ * Thumbnail entries for a deck: one per card part, in deck order
+ * Continuation parts are marked isOverflowing, like reflowed cards, so the
+ * page packer keeps them with their parent
+ * @param {Array<CardData>} cards - Cards to show
+ * @param {Object} index - Thumbnail index for the card size
+ * @returns {Array<Object>|null} Entries, or null if any card has no thumbnail
+ */
+export function thumbnailEntries(cards, index) {
+  const entries = [];
+  for (const card of cards) {
+    const cells = card?.thumbnailKey && index.cards[card.thumbnailKey];
+    if (!cells) return null;
+    cells.forEach((cell, part) => {
+      entries.push({
+        title: card.title,
+        thumbnail: locateCell(index, cell),
+        isOverflowing: part > 0,
+        source: card
+      });
+    });
+  }
+  return entries;
+}
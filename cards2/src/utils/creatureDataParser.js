@@ -1,4 +1,5 @@
 import { Creature } from './Creature.js';
+import { createDataLoader, loadArtifactRevisions } from './datasetCache.js';
 
 /**
  * JSON Parser Utility for D&D Creatures
@@ -135,17 +136,36 @@ export class CreatureDataParser {
   }
 }
 
+/**
+ * Fetch and parse a creature data file
+ * @param {string} filePath - Path relative to the public directory
+ * @returns {Promise<Array>} Array of creature objects
+ */
+async function fetchCreatureFile(filePath) {
+  const response = await fetch(`./${filePath}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch ${filePath}: ${response.status} ${response.statusText}`);
+  }
+  return response.json();
+}
+
 /**
  * Load creature data from JSON file
  * @returns {Promise<Object>} Creature data and metadata
  */
 export async function loadCreatureData() {
   try {
-    const response = await fetch('./data/5e-SRD-Monsters.json');
-    if (!response.ok) {
-      throw new Error(`Failed to fetch creature data: ${response.status} ${response.statusText}`);
+    // Parsed copies come from the IndexedDB cache when it holds the current revision
+    const loadFile = createDataLoader(undefined, fetchCreatureFile, await loadArtifactRevisions());
+    
+    // Prefer the precomputed creature cards; fall back to the raw SRD monsters
+    let jsonData;
+    try {
+      jsonData = await loadFile('data/creature-cards.json');
+    } catch (error) {
+      console.warn(`Precomputed creature cards unavailable (${error.message}), loading SRD monsters`);
+      jsonData = await loadFile('data/5e-SRD-Monsters.json');
     }
-    const jsonData = await response.json();
     
     const parser = new CreatureDataParser();
     const data = parser.parseJSON(jsonData);
@@ -157,4 +177,3 @@ export async function loadCreatureData() {
     throw new Error(`Failed to load creature data: ${error.message}`);
   }
 }
-
@@ -0,0 +1,189 @@
+/**
+ * Versioned IndexedDB cache for the card data files
+ *
+ * Each data file the app loads (a spell source, bundle or catalog, or the
+ * creature cards) is kept in IndexedDB, parsed, together with its artifact
+ * hash from precache-manifest.json (spells/precache_manifest.py) and the
+ * dataset version from spells.json ("release", spells/spell_releases.py).
+ * On the next load, a copy whose hash matches the manifest is used without
+ * fetching the file; an older copy is brought up to date with the
+ * per-version delta patches in data/releases/, and only copies too old to
+ * patch are downloaded again.
+ */
+
+const DB_NAME = 'dnd-spell-data';
+const DB_VERSION = 1;
+const STORE_NAME = 'files';
+
+const MANIFEST_FILE = 'precache-manifest.json';
+
+let dbPromise = null;
+let revisionsPromise = null;
+
+/**
+ * Open the cache database once
+ * @returns {Promise<IDBDatabase|null>} Database, or null if IndexedDB is unavailable
+ */
+function openDatabase() {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve) => {
+      if (typeof indexedDB === 'undefined') {
+        resolve(null);
+        return;
+      }
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+      request.onupgradeneeded = () => {
+        request.result.createObjectStore(STORE_NAME);
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        console.warn('Spell data cache unavailable:', request.error?.message);
+        resolve(null);
+      };
+    });
+  }
+  return dbPromise;
+}
+
+/**
+ * Run one request against the files store
+ * @param {IDBDatabase} db - Cache database
+ * @param {string} mode - 'readonly' or 'readwrite'
+ * @param {Function} makeRequest - Called with the object store, returns an IDBRequest
+ * @returns {Promise<*>} Request result
+ */
+function storeRequest(db, mode, makeRequest) {
+  return new Promise((resolve, reject) => {
+    const request = makeRequest(db.transaction(STORE_NAME, mode).objectStore(STORE_NAME));
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+/**
+ * Fetch the artifact hashes from the precache manifest once
+ * @returns {Promise<Object>} Revision by file path; empty if the manifest is unavailable
+ */
+export function loadArtifactRevisions() {
+  if (!revisionsPromise) {
+    revisionsPromise = (async () => {
+      const response = await fetch(`./${MANIFEST_FILE}`);
+      if (!response.ok) {
+        throw new Error(`Failed to fetch ${MANIFEST_FILE}: ${response.status} ${response.statusText}`);
+      }
+      const manifest = await response.json();
+      return Object.fromEntries(manifest.files.map(entry => [entry.url, entry.revision]));
+    })().catch(error => {
+      console.warn('Artifact revisions unavailable:', error.message);
+      revisionsPromise = null;
+      return {};
+    });
+  }
+  return revisionsPromise;
+}
+
+/**
+ * Convert a spell name to its id (mirrors spell_id() in spells/spell_store.py)
+ * @param {string} name - Spell name
+ * @returns {string} Id, e.g. 'acid-arrow'
+ */
+export function spellId(name) {
+  if (!name) return '';
+  return name.trim().toLowerCase()
+    .replace(/[’']/g, '')
+    .replace(/[^a-z0-9]+/g, '-')
+    .replace(/^-+|-+$/g, '');
+}
+
+/**
+ * Apply one file's delta patch (mirrors apply_patch() in spells/spell_releases.py)
+ * @param {Array<Object>} records - Records at the previous version
+ * @param {Object} patch - { added, changed, removed, order?, count }
+ * @returns {Array<Object>} Records at the patch's version
+ */
+export function applyPatch(records, patch) {
+  const byId = new Map(records.map(record => [spellId(record.name), record]));
+  patch.removed.forEach(id => byId.delete(id));
+  [...patch.added, ...patch.changed].forEach(record => byId.set(spellId(record.name), record));
+
+  const order = patch.order || records.map(record => spellId(record.name)).filter(id => byId.has(id));
+  return order.map(id => byId.get(id)).filter(Boolean);
+}
+
+/**
+ * Create a loader for data files that caches them by artifact hash and dataset version
+ * Without IndexedDB, it just fetches
+ * @param {Object|undefined} release - { version, index } from spells.json, if any
+ * @param {Function} fetchFile - Fetches and parses a data file by path
+ * @param {Object} revisions - Artifact hash by file path (see loadArtifactRevisions)
+ * @returns {Function} async (filePath) => Array of records
+ */
+export function createDataLoader(release, fetchFile, revisions = {}) {
+  let patchesPromise = null;
+
+  // Fetch the patch index and the patches once per loader
+  const loadPatches = () => {
+    if (!patchesPromise) {
+      patchesPromise = (async () => {
+        const index = await fetchFile(release.index);
+        const patches = await Promise.all(index.patches.map(entry => fetchFile(entry.file)));
+        return { version: index.version, minVersion: index.minVersion, patches };
+      })();
+    }
+    return patchesPromise;
+  };
+
+  const entryFor = (filePath, records) => ({
+    version: release?.version ?? null,
+    revision: revisions[filePath] ?? null,
+    records
+  });
+
+  const fetchAndStore = async (db, filePath) => {
+    const records = await fetchFile(filePath);
+    storeRequest(db, 'readwrite', store => store.put(entryFor(filePath, records), filePath))
+      .catch(error => console.warn(`Failed to cache ${filePath}:`, error?.message));
+    return records;
+  };
+
+  return async (filePath) => {
+    const db = await openDatabase();
+    if (!db) return fetchFile(filePath);
+
+    let cached = null;
+    try {
+      cached = await storeRequest(db, 'readonly', store => store.get(filePath));
+    } catch (error) {
+      console.warn(`Failed to read cached ${filePath}:`, error?.message);
+    }
+    if (cached && revisions[filePath] && cached.revision === revisions[filePath]) return cached.records;
+    if (!cached || !release || cached.version === null || cached.version > release.version) {
+      return fetchAndStore(db, filePath);
+    }
+    if (cached.version === release.version) return cached.records;
+
+    try {
+      const { version, minVersion, patches } = await loadPatches();
+      if (cached.version < minVersion || version < release.version) return fetchAndStore(db, filePath);
+
+      let records = cached.records;
+      let applied = 0;
+      for (const patch of patches) {
+        if (patch.to <= cached.version || patch.to > release.version) continue;
+        const filePatch = patch.files[filePath];
+        if (!filePatch) continue;
+        if (filePatch.reset) return fetchAndStore(db, filePath);
+        records = applyPatch(records, filePatch);
+        if (records.length !== filePatch.count) return fetchAndStore(db, filePath);
+        applied++;
+      }
+
+      console.log(`Updated cached ${filePath} from version ${cached.version} to ${release.version} (${applied} patches)`);
+      await storeRequest(db, 'readwrite', store => store.put(entryFor(filePath, records), filePath));
+      return records;
+    } catch (error) {
+      console.warn(`Failed to patch cached ${filePath}:`, error?.message);
+      return fetchAndStore(db, filePath);
+    }
+  };
+}
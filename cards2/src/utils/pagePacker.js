@@ -0,0 +1,172 @@
+/**
+ * Page packing for printed card decks
+ * Port of spells/page_packing.py - keep the two in step
+ *
+ * Reflowed cards come in groups: a card followed by its continuation cards
+ * (marked isOverflowing). Groups are packed onto pages first-fit decreasing,
+ * so continuations stay on their parent's page whenever they fit and the
+ * deck prints on as few pages as possible.
+ */
+
+/**
+ * Turn reflowed cards into group sizes (a card plus its continuations)
+ * @param {Array} cards - Reflowed card data in deck order
+ * @returns {Array<number>} Cards per group
+ */
+export const groupSizes = (cards) => {
+  const sizes = [];
+  cards.forEach((card) => {
+    if (card?.isOverflowing && sizes.length > 0) {
+      sizes[sizes.length - 1] += 1;
+    } else {
+      sizes.push(1);
+    }
+  });
+  return sizes;
+};
+
+/**
+ * Place items into bins, largest first, each into the first bin with room
+ * @param {Array} items - Items with size, start, count and anchor
+ * @param {number} capacity - Slots per bin
+ * @param {Array} bins - Existing bins; new bins are appended
+ * @returns {Array} The bins
+ */
+const firstFitDecreasing = (items, capacity, bins) => {
+  // Array.prototype.sort is stable, so equal sizes keep their original order
+  const sorted = [...items].sort((a, b) => b.size - a.size);
+  sorted.forEach((item) => {
+    const target = bins.find((bin) => bin.free >= item.size);
+    if (target) {
+      target.free -= item.size;
+      target.items.push(item);
+      // Pages print in order of their earliest card; split bins stay behind their group
+      if (!target.fixed) {
+        target.anchor = Math.min(target.anchor, item.anchor);
+      }
+    } else {
+      bins.push({ free: capacity - item.size, items: [item], anchor: item.anchor });
+    }
+  });
+  return bins;
+};
+
+/**
+ * Pack groups into bins of the given capacity
+ * @param {Array<number>} sizes - Cards per group
+ * @param {number} capacity - Slots per bin
+ * @returns {Array} Ordered bins
+ */
+const packGroups = (sizes, capacity) => {
+  const bins = [];
+  const items = [];
+  let start = 0;
+
+  sizes.forEach((size) => {
+    // Groups are contiguous, so the start index orders them
+    const anchor = start;
+    if (size > capacity) {
+      // Full bins for the oversized group, then a bin seeded with its remainder
+      let offset = 0;
+      while (size - offset > capacity) {
+        bins.push({ free: 0, items: [{ start: start + offset, count: capacity, anchor }], anchor, fixed: true });
+        offset += capacity;
+      }
+      const remainder = size - offset;
+      bins.push({
+        free: capacity - remainder,
+        items: [{ start: start + offset, count: remainder, anchor, seed: true }],
+        anchor,
+        fixed: true
+      });
+    } else {
+      items.push({ size, start, count: size, anchor });
+    }
+    start += size;
+  });
+
+  firstFitDecreasing(items, capacity, bins);
+
+  bins.forEach((bin) => {
+    bin.items.sort((a, b) => (b.seed ? 1 : 0) - (a.seed ? 1 : 0) || a.start - b.start);
+  });
+  return bins.sort((a, b) => a.anchor - b.anchor);
+};
+
+/**
+ * Expand packed items into card indices
+ * @param {Array} items - Packed items
+ * @returns {Array<number>} Card indices
+ */
+const expand = (items) => {
+  const indices = [];
+  items.forEach((item) => {
+    for (let i = item.start; i < item.start + item.count; i++) {
+      indices.push(i);
+    }
+  });
+  return indices;
+};
+
+/**
+ * Pack group sizes onto pages
+ * @param {Array<number>} sizes - Cards per group
+ * @param {number} cardsPerPage - Slots per page
+ * @param {number} cardsPerRow - Slots per row (guillotine mode)
+ * @param {boolean} guillotine - Keep groups within rows so sheets can be cut into strips
+ * @returns {Array<Array<number|null>>} Card indices per page; null marks an empty slot
+ */
+export const packPageIndices = (sizes, cardsPerPage, cardsPerRow = 0, guillotine = false) => {
+  if (!guillotine || !cardsPerRow) {
+    const pages = packGroups(sizes, cardsPerPage).map((page) => expand(page.items));
+    const total = sizes.reduce((sum, size) => sum + size, 0);
+    if (pages.length > Math.ceil(total / cardsPerPage)) {
+      // Never print more pages than plain slicing; split groups across pages instead
+      const sliced = [];
+      for (let i = 0; i < total; i += cardsPerPage) {
+        sliced.push(expand([{ start: i, count: Math.min(cardsPerPage, total - i) }]));
+      }
+      return sliced;
+    }
+    return pages;
+  }
+
+  const rowsPerPage = Math.max(1, Math.floor(cardsPerPage / cardsPerRow));
+
+  // Pack groups into rows, padding each row so slots line up with the cuts
+  const rows = [];
+  const rowSizes = [];
+  let previousAnchor = null;
+  packGroups(sizes, cardsPerRow).forEach((row) => {
+    const indices = expand(row.items);
+    while (indices.length < cardsPerRow) {
+      indices.push(null);
+    }
+    rows.push(indices);
+    // Rows split from one oversized group share its anchor and move as one block
+    if (rowSizes.length > 0 && row.anchor === previousAnchor) {
+      rowSizes[rowSizes.length - 1] += 1;
+    } else {
+      rowSizes.push(1);
+    }
+    previousAnchor = row.anchor;
+  });
+
+  // Then pack row blocks onto pages; item start/count index into rows
+  return packGroups(rowSizes, rowsPerPage).map((page) =>
+    page.items.flatMap((item) => rows.slice(item.start, item.start + item.count).flat())
+  );
+};
+
+/**
+ * Pack reflowed cards onto pages
+ * @param {Array} cards - Reflowed card data in deck order
+ * @param {number} cardsPerPage - Slots per page
+ * @param {number} cardsPerRow - Slots per row (guillotine mode)
+ * @param {boolean} guillotine - Keep groups within rows so sheets can be cut into strips
+ * @returns {Array<Array>} Cards per page; null marks an empty slot
+ */
+export const packPages = (cards, cardsPerPage, cardsPerRow = 0, guillotine = false) => {
+  return packPageIndices(groupSizes(cards), cardsPerPage, cardsPerRow, guillotine)
+    .map((page) => page.map((index) => (index === null ? null : cards[index])));
+};
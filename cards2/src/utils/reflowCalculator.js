@@ -20,6 +20,25 @@ const SCALE_STEP = 0.01;
 const LETTER_SPACING_STEP = -0.005; // em units
 const MIN_LETTER_SPACING = -0.02; // em units
 
+// Settings tried in order: letter spacing first, then font scale at minimum letter spacing.
+// spells/spell_fitting.py generates its fit hints from the same list; keep the two in step.
+const FIT_PROBES = [];
+for (let spacing = 0; spacing >= MIN_LETTER_SPACING; spacing += LETTER_SPACING_STEP) {
+  FIT_PROBES.push({ fontScale: 1.0, letterSpacing: spacing, letterSpacingReduced: spacing < 0 });
+}
+for (let scale = 1.0; scale >= MIN_SCALE; scale -= SCALE_STEP) {
+  FIT_PROBES.push({ fontScale: scale, letterSpacing: MIN_LETTER_SPACING, sizeReduced: scale < 1.0, letterSpacingReduced: true });
+}
+
+// Find the probe a fit hint points at (hints are rounded), or -1
+const findHintProbe = (hint) => {
+  if (!hint || typeof hint.fontScale !== 'number') return -1;
+  return FIT_PROBES.findIndex((probe) =>
+    Math.abs(probe.fontScale - hint.fontScale) < 1e-6 &&
+    Math.abs(probe.letterSpacing - (hint.letterSpacing || 0)) < 1e-6
+  );
+};
+
 // Shared helper: normalize leading <br> and whitespace-only text nodes
 const normalizeLeading = (fragmentHtml) => {
   const d = document.createElement('div');
@@ -224,52 +243,68 @@ const performCalculation = async (spellsOrCards, cardSize) => {
       return parts;
     };
 
+    // Split a body at precomputed paragraph indices; null unless every part fits
+    const splitAtBreaks = (baseData, breaks) => {
+      if (!Array.isArray(breaks) || breaks.length === 0) return null;
+      const paragraphs = (baseData.body || '').match(/<p[\s\S]*?<\/p>/g) || [];
+      if (paragraphs.join('') !== baseData.body || breaks[breaks.length - 1] >= paragraphs.length) return null;
+
+      const bounds = [0, ...breaks, paragraphs.length];
+      const parts = [];
+      for (let b = 0; b < bounds.length - 1; b++) {
+        const body = paragraphs.slice(bounds[b], bounds[b + 1]).join('');
+        const part = b === 0 ? { ...baseData, body } : { ...baseData, specs: [], body, isOverflowing: true };
+        if (measureOverflow(part) > 0) return null;
+        parts.push(part);
+      }
+      return parts;
+    };
+
     for (let i = 0; i < cardDataArray.length; i++) {
       const original = cardDataArray[i];
-      let overflowPx = 0;
       let fits = false;
 
       // Declare probeData outside, recreate per attempt
       let probeData;
-
-      // First, try reducing letter spacing (0 to -0.02em in steps of -0.005em)
-      let letterSpacingAdjusted = false;
-      for (let spacing = 0; spacing >= MIN_LETTER_SPACING; spacing += LETTER_SPACING_STEP) {
-        probeData = { 
-          ...original, 
-          fontScale: 1.0, 
-          letterSpacing: spacing,
-          letterSpacingReduced: spacing < 0
-        };
-        overflowPx = measureOverflow(probeData);
-        if (overflowPx <= 0) {
+      const probeFits = (index) => {
+        probeData = { ...original, ...FIT_PROBES[index] };
+        return measureOverflow(probeData) <= 0;
+      };
+
+      // Offline fit hint (spells/spell_fitting.py): confirm it with at most two
+      // measurements instead of searching; fitting only gets easier along FIT_PROBES
+      let searchFrom = 0;
+      let searchTo = FIT_PROBES.length;
+      const hintIndex = findHintProbe(original.fitHints?.[cardSize]);
+      if (hintIndex >= 0) {
+        if (!probeFits(hintIndex)) {
+          searchFrom = hintIndex + 1;
+        } else if (hintIndex === 0 || !probeFits(hintIndex - 1)) {
           fits = true;
-          letterSpacingAdjusted = true;
-          break;
+          probeData = { ...original, ...FIT_PROBES[hintIndex] };
+        } else {
+          // A larger setting fits too, so the answer is before the hint
+          searchTo = hintIndex - 1;
         }
       }
 
-      // If letter spacing adjustment didn't work, try reducing font scale
+      // Try reducing letter spacing (0 to -0.02em), then font scale at minimum letter spacing
+      for (let index = searchFrom; !fits && index < searchTo; index++) {
+        fits = probeFits(index);
+      }
+      if (!fits && searchTo < FIT_PROBES.length) {
+        // Everything before the hint's neighbour failed, and that one is known to fit
+        fits = true;
+        probeData = { ...original, ...FIT_PROBES[searchTo] };
+      }
       if (!fits) {
-        for (let scale = 1.0; scale >= MIN_SCALE; scale -= SCALE_STEP) {
-          probeData = { 
-            ...original, 
-            fontScale: scale, 
-            letterSpacing: MIN_LETTER_SPACING, // use minimum letter spacing
-            sizeReduced: scale < 1.0,
-            letterSpacingReduced: true
-          };
-          overflowPx = measureOverflow(probeData);
-          if (overflowPx <= 0) {
-            fits = true;
-            break;
-          }
-        }
+        probeData = { ...original, ...FIT_PROBES[FIT_PROBES.length - 1] };
       }
 
       if (!fits) {
         // Couldn't fit by reducing font scale, split it into parts.
-        const parts = splitHTMLRecursive(probeData);
+        // Use the precomputed paragraph breaks when every part fits, otherwise split by words.
+        const parts = splitAtBreaks(probeData, original.fitHints?.[cardSize]?.breaks) || splitHTMLRecursive(probeData);
         reflowed.push(...parts);
         continue;
       }
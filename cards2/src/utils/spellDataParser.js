@@ -1,4 +1,5 @@
 import { Spell } from './Spell.js';
+import { createDataLoader, loadArtifactRevisions } from './datasetCache.js';
 
 /**
  * JSON Parser Utility for D&D Spells
@@ -157,6 +158,65 @@ async function loadSpellDataFromFile(filePath) {
   }
 }
 
+/**
+ * Add classes from another copy to the winner's list, in the winner's format
+ * (mirrors union_classes in spells/spell_catalog.py)
+ * @param {Array<Object|string>} winnerClasses - Winning copy's classes
+ * @param {Array<Object|string>} otherClasses - Another copy's classes
+ * @returns {Array<Object|string>} Merged classes
+ */
+function unionClasses(winnerClasses, otherClasses) {
+  const merged = [...winnerClasses];
+  const className = cls => (typeof cls === 'object' ? cls.name : cls);
+  const names = new Set(merged.map(className));
+  const usesObjects = merged.some(cls => typeof cls === 'object');
+
+  for (const cls of otherClasses) {
+    const name = className(cls);
+    if (names.has(name)) continue;
+    names.add(name);
+    merged.push(usesObjects ? { index: name.toLowerCase(), name } : name);
+  }
+  return merged;
+}
+
+/**
+ * A catalog spell as merging only the enabled sources gives it
+ * (mirrors select_sources in spells/spell_catalog.py)
+ * @param {Object} spell - Catalog or bundle spell
+ * @param {Set<string>} ids - Enabled source IDs
+ * @returns {Object|null} The copy from the first enabled source with the enabled sources' classes, or null
+ */
+function selectSources(spell, ids) {
+  const provenance = (spell.provenance || []).filter(id => ids.has(id));
+  if (provenance.length === 0) return null;
+  if (!spell.copies) return spell;
+
+  const { copies, source_classes: sourceClasses, ...merged } = spell;
+  if (provenance.length === spell.provenance.length) return merged;
+
+  const winner = provenance[0] === spell.provenance[0] ? merged : copies[provenance[0]];
+  const classes = provenance.slice(1).reduce(
+    (result, id) => unionClasses(result, sourceClasses[id]),
+    sourceClasses[provenance[0]]
+  );
+  return { ...winner, provenance, classes };
+}
+
+/**
+ * Find a prebuilt bundle covering exactly the given sources
+ * @param {Array<Object>|undefined} bundles - Bundle entries from spells.json
+ * @param {Array<Object>} sources - Sources to load
+ * @returns {Object|null} Matching bundle entry, or null
+ */
+function findBundle(bundles, sources) {
+  if (!bundles) return null;
+  const ids = new Set(sources.map(source => source.id));
+  return bundles.find(bundle =>
+    bundle.sources.length === ids.size && bundle.sources.every(id => ids.has(id))
+  ) || null;
+}
+
 /**
  * Fetch and parse spell data from multiple sources
  * @param {Array<string>} enabledSources - Array of source IDs to load
@@ -178,19 +238,54 @@ export async function loadSpellData(enabledSources = null) {
     
     console.log('Loading spell data from sources:', sourcesToLoad.map(s => s.name));
     
-    // Load data from all enabled sources
+    // Data files come from the IndexedDB cache when it holds the current revision
+    const loadFile = createDataLoader(sourcesConfig.release, loadSpellDataFromFile, await loadArtifactRevisions());
+    
     const allSpells = [];
-    for (const source of sourcesToLoad) {
+    let loaded = false;
+    const ids = new Set(sourcesToLoad.map(source => source.id));
+    const bundle = findBundle(sourcesConfig.bundles, sourcesToLoad);
+    if (bundle) {
+      // Prebuilt, already deduplicated bundle for this exact source combination
+      try {
+        // The bundle of every source is the catalog itself
+        const spells = (await loadFile(bundle.file)).map(spell => selectSources(spell, ids));
+        console.log(`Loaded ${spells.length} spells from bundle ${bundle.file}`);
+        allSpells.push(...spells);
+        loaded = true;
+      } catch (error) {
+        console.warn(`Failed to load bundle ${bundle.file}:`, error.message);
+      }
+    } else if (sourcesConfig.catalog) {
+      // Merged catalog: each spell once, as merging only the enabled sources gives it
       try {
-        const spells = await loadSpellDataFromFile(source.file);
-        console.log(`Loaded ${spells.length} spells from ${source.name}`);
+        const catalog = await loadFile(sourcesConfig.catalog);
+        const spells = catalog.map(spell => selectSources(spell, ids)).filter(Boolean);
+        console.log(`Loaded ${spells.length} spells from catalog ${sourcesConfig.catalog}`);
         allSpells.push(...spells);
+        loaded = true;
       } catch (error) {
-        console.warn(`Failed to load ${source.name}:`, error.message);
-        // Continue loading other sources even if one fails
+        console.warn(`Failed to load catalog ${sourcesConfig.catalog}:`, error.message);
       }
     }
     
+    if (!loaded) {
+      // Load data from all enabled sources concurrently
+      const results = await Promise.allSettled(
+        sourcesToLoad.map(source => loadFile(source.file))
+      );
+      results.forEach((result, index) => {
+        const source = sourcesToLoad[index];
+        if (result.status === 'fulfilled') {
+          console.log(`Loaded ${result.value.length} spells from ${source.name}`);
+          allSpells.push(...result.value);
+        } else {
+          // Continue with the other sources even if one fails
+          console.warn(`Failed to load ${source.name}:`, result.reason.message);
+        }
+      });
+    }
+    
     // Parse combined spell data
     const parser = new SpellDataParser();
     const data = parser.parseJSON(allSpells);
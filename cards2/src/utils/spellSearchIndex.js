@@ -0,0 +1,80 @@
+import { loadSpellSources } from './spellDataParser.js';
+
+const GRAM_SIZE = 3;
+
+let indexPromise = null;
+
+/**
+ * Fetch the prebuilt spell name search index (built by spells/spell_search.py)
+ * The index is fetched once and shared by all callers
+ * @returns {Promise<Object|null>} Search index, or null if none is configured
+ */
+export function loadSearchIndex() {
+  if (!indexPromise) {
+    indexPromise = (async () => {
+      const sourcesConfig = await loadSpellSources();
+      if (!sourcesConfig.searchIndex) return null;
+
+      const response = await fetch(`./${sourcesConfig.searchIndex}`);
+      if (!response.ok) {
+        throw new Error(`Failed to fetch ${sourcesConfig.searchIndex}: ${response.status} ${response.statusText}`);
+      }
+      return response.json();
+    })().catch(error => {
+      console.warn('Spell search index unavailable:', error.message);
+      indexPromise = null;
+      return null;
+    });
+  }
+  return indexPromise;
+}
+
+/**
+ * Rank a matching name: 0 exact, 1 name prefix, 2 word prefix, 3 substring
+ * @param {string} lowered - Lowercased spell name
+ * @param {string} query - Lowercased query
+ * @returns {number} Rank (lower is better)
+ */
+function matchRank(lowered, query) {
+  if (lowered === query) return 0;
+  if (lowered.startsWith(query)) return 1;
+  let position = lowered.indexOf(query);
+  while (position !== -1) {
+    if (!/[a-z0-9]/.test(lowered[position - 1])) return 2;
+    position = lowered.indexOf(query, position + 1);
+  }
+  return 3;
+}
+
+/**
+ * Find spell names containing the query using the n-gram index
+ * Mirrors search() in spells/spell_search.py
+ * @param {Object} index - Search index
+ * @param {string} query - Search text
+ * @returns {Array<string>} Matching names, best matches first
+ */
+export function searchSpellNames(index, query) {
+  const normalized = query.trim().toLowerCase();
+  if (!normalized) return index.names;
+
+  let candidates;
+  if (normalized.length <= GRAM_SIZE) {
+    candidates = index.grams[normalized] || [];
+  } else {
+    const lists = [];
+    for (let i = 0; i + GRAM_SIZE <= normalized.length; i++) {
+      lists.push(index.grams[normalized.slice(i, i + GRAM_SIZE)] || []);
+    }
+    lists.sort((a, b) => a.length - b.length);
+    const others = lists.slice(1).map(list => new Set(list));
+    candidates = lists[0].filter(id => others.every(set => set.has(id)));
+  }
+
+  return candidates
+    .map(id => index.names[id])
+    .map(name => ({ name, lowered: name.toLowerCase() }))
+    .filter(({ lowered }) => lowered.includes(normalized))
+    .map(item => ({ ...item, rank: matchRank(item.lowered, normalized) }))
+    .sort((a, b) => a.rank - b.rank || a.lowered.localeCompare(b.lowered))
+    .map(({ name }) => name);
+}
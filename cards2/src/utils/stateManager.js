@@ -22,7 +22,8 @@ const DEFAULT_STATE = {
   },
   layoutConfig: {
     pageSize: 'letter',
-    cardSize: 'standard'
+    cardSize: 'standard',
+    guillotine: false  // keep multi-card spells within one row so sheets can be cut into strips
   },
   debug: {
     showOutlines: false
@@ -2,10 +2,18 @@
 """
 Script to combine all spell CSV files from different classes into one unified CSV.
 Handles deduplication and warns about conflicts.
+
+Also writes what the legacy cards app (cards/index.js) loads, so it doesn't
+have to parse the CSV or compile its Handlebars template in the browser:
+  - cards/all_spells.json: cards/all_spells.csv (the app's edited copy of the
+    combined CSV), already parsed, with numeric levels
+  - cards/card_template.js: card_template.html compiled to a plain JS function
 """
 
 import csv
+import json
 import os
+import re
 import sys
 from collections import defaultdict
 
@@ -80,9 +88,95 @@ def read_csv_file(filepath):
         
     return spells
 
+def write_spells_json(csv_file, output_file):
+    """Write cards/all_spells.csv, parsed, in the shape the legacy cards app uses.
+
+    The JSON is read from the CSV the app falls back to (by its header, not by
+    position), so both load paths show the same spells with the same text.
+    """
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f, delimiter=';'))
+
+    records = [{
+        'level': int(row['level']) if row['level'].isdigit() else 0,
+        'title': row['name'],
+        'school_of_magic': row['school_of_magic'],
+        'casting_time': row['casting_time'],
+        'range': row['range'],
+        'components': row['components'],
+        'duration': row['duration'],
+        'description': row['description'],
+        'material_component': row['material_component'],
+        'classes': row['classes']
+    } for row in rows]
+    records.sort(key=lambda record: (record['level'], record['title'].lower()))
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Wrote {len(records)} parsed spells from {os.path.basename(csv_file)} to {output_file}")
+
+# The Handlebars subset card_template.html uses
+TEMPLATE_TAG = re.compile(r'\{\{\{(\w+)\}\}\}|\{\{#if (\w+)\}\}|\{\{/if\}\}|\{\{(\w+)\}\}')
+
+def compile_template(template):
+    """Compile a Handlebars template ({{x}}, {{{x}}}, {{#if x}}) to JS function source."""
+    # Block tags alone on their line take the line with them, as in Handlebars
+    template = re.sub(r'^[ \t]*(\{\{[#/][^}]*\}\})[ \t]*\n', r'\1', template, flags=re.MULTILINE)
+
+    lines = ['function (data) {', '    let out = \'\';']
+    indent = '    '
+    position = 0
+    for match in TEMPLATE_TAG.finditer(template):
+        if match.start() > position:
+            lines.append(f"{indent}out += {json.dumps(template[position:match.start()])};")
+        raw, condition, escaped = match.group(1), match.group(2), match.group(3)
+        if raw:
+            lines.append(f"{indent}out += raw(data.{raw});")
+        elif condition:
+            lines.append(f"{indent}if (truthy(data.{condition})) {{")
+            indent += '    '
+        elif escaped:
+            lines.append(f"{indent}out += escape(data.{escaped});")
+        else:
+            if len(indent) <= 4:
+                raise ValueError("Unbalanced {{/if}} in card template")
+            indent = indent[:-4]
+            lines.append(f"{indent}}}")
+        position = match.end()
+    if len(indent) > 4:
+        raise ValueError("Unclosed {{#if}} in card template")
+    if position < len(template):
+        lines.append(f"{indent}out += {json.dumps(template[position:])};")
+    lines += ['    return out;', '}']
+    return '\n'.join(lines)
+
+TEMPLATE_RUNTIME = """// Generated by combine_spells.py from card_template.html - do not edit
+(function () {
+    const ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;', '`': '&#x60;', '=': '&#x3D;' };
+
+    // Same rules as Handlebars: {{#if}} is false for empty arrays, {{x}} escapes HTML
+    const truthy = (value) => !!value && !(Array.isArray(value) && value.length === 0);
+    const raw = (value) => (value == null ? '' : String(value));
+    const escape = (value) => raw(value).replace(/[&<>"'`=]/g, (char) => ESCAPES[char]);
+
+    window.precompiledCardTemplate = %s;
+})();
+"""
+
+def write_template_module(template_file, output_file):
+    """Compile the card template into a script that defines window.precompiledCardTemplate."""
+    with open(template_file, 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    function = compile_template(template).replace('\n', '\n    ')
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE_RUNTIME % function)
+    print(f"Compiled {os.path.basename(template_file)} to {output_file}")
+
 def combine_spells():
     """Main function to combine all spell CSV files."""
-    spells_dir = "spells"
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    spells_dir = os.path.join(repo_dir, "spells")
     
     if not os.path.exists(spells_dir):
         print(f"Error: Directory '{spells_dir}' not found")
@@ -204,7 +298,7 @@ def combine_spells():
     
     # Write the combined CSV
     if deduplicated_spells:
-        output_file = "all_spells.csv"
+        output_file = os.path.join(repo_dir, "all_spells.csv")
         
         # Define specific field order (excluding 'class' and 'source_class')
         fieldnames = ['level', 'name', 'school_of_magic', 'casting_time', 'range', 'components', 'material_component', 'duration', 'description', 'classes']
@@ -224,6 +318,11 @@ def combine_spells():
                 writer.writerow(row)
         
         print(f"Successfully wrote {len(deduplicated_spells)} spells to {output_file}")
+
+        cards_dir = os.path.join(repo_dir, "cards")
+        write_spells_json(os.path.join(cards_dir, "all_spells.csv"), os.path.join(cards_dir, "all_spells.json"))
+        write_template_module(os.path.join(cards_dir, "card_template.html"),
+                              os.path.join(cards_dir, "card_template.js"))
         
         # Show all conflicts if any
         if conflicts:
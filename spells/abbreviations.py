@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Abbreviations for card spec values, shared by the analysis scripts and the
+frontend.
+
+abbreviations.json declares the replacements per field kind, e.g.
+
+    "duration": {"include": ["spec"],
+                 "rules": [{"from": ["up to"], "to": "≤"}, ...]}
+
+Rule options: "word" only matches whole words (ASCII word characters, as in
+a JS \\b), "start" only matches at the start of the value, "strip" also drops
+the run of whitespace after a match (like \\s* in a regex). Matching ignores
+case. Each table is compiled into one Aho-Corasick automaton, so a value is
+abbreviated in a single scan however many rules there are; where matches
+overlap, the leftmost and then the longest wins.
+
+The frontend doesn't re-implement the rules: write_js() writes the compiled
+tables and the same matcher to cards2/src/utils/abbreviations.js (the
+pipeline's abbreviations stage), which SpellToCardDataTransformer uses.
+
+Usage:
+    python abbreviations.py                          # write the JS module
+    python abbreviations.py duration "Concentration, up to 1 minute"
+"""
+
+import json
+import sys
+from pathlib import Path
+
+TABLE_FILE = Path(__file__).parent / 'abbreviations.json'
+JS_MODULE = Path(__file__).parent.parent / 'cards2' / 'src' / 'utils' / 'abbreviations.js'
+
+def fold(char):
+    """Lowercase one character, keeping it one character long (as the JS matcher does)."""
+    lower = char.lower()
+    return lower if len(lower) == 1 else char
+
+def is_word_char(char):
+    """ASCII word character, the definition JS regexes use for \\b."""
+    return char.isascii() and (char.isalnum() or char == '_')
+
+class Abbreviator:
+    """Aho-Corasick automaton for one table of abbreviation rules."""
+
+    def __init__(self, rules):
+        self.rules = [{'to': rule['to'], 'word': bool(rule.get('word')), 'start': bool(rule.get('start')),
+                       'strip': bool(rule.get('strip'))}
+                      for rule in rules]
+        self.goto = [{}]
+        self.output = [[]]
+        for index, rule in enumerate(rules):
+            for pattern in rule['from']:
+                state = 0
+                for char in pattern:
+                    char = fold(char)
+                    if char not in self.goto[state]:
+                        self.goto.append({})
+                        self.output.append([])
+                        self.goto[state][char] = len(self.goto) - 1
+                    state = self.goto[state][char]
+                self.output[state].append([index, len(pattern)])
+
+        # Failure links, breadth first; each state also reports its suffixes' matches
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, target in self.goto[state].items():
+                queue.append(target)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[target] = self.goto[fallback].get(char, 0)
+                self.output[target] = self.output[target] + self.output[self.fail[target]]
+
+    def matches(self, text):
+        """Return {start: (end, rule index)} with the longest valid match at each start."""
+        found = {}
+        state = 0
+        for position, char in enumerate(text):
+            char = fold(char)
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            end = position + 1
+            for index, length in self.output[state]:
+                start = end - length
+                rule = self.rules[index]
+                if rule['start'] and start != 0:
+                    continue
+                if rule['word'] and ((start > 0 and is_word_char(text[start - 1]))
+                                     or (end < len(text) and is_word_char(text[end]))):
+                    continue
+                if start not in found or found[start][0] < end:
+                    found[start] = (end, index)
+        return found
+
+    def replace(self, text):
+        """Apply the table to a value."""
+        if not text:
+            return text
+        found = self.matches(text)
+        if not found:
+            return text
+        parts = []
+        position = 0
+        while position < len(text):
+            if position in found:
+                end, index = found[position]
+                parts.append(self.rules[index]['to'])
+                position = end
+                if self.rules[index]['strip']:
+                    while position < len(text) and text[position].isspace():
+                        position += 1
+            else:
+                parts.append(text[position])
+                position += 1
+        return ''.join(parts)
+
+    def to_json(self):
+        """The compiled tables, as the JS matcher reads them."""
+        return {'rules': self.rules, 'goto': self.goto, 'fail': self.fail, 'output': self.output}
+
+def load_tables(table_file=TABLE_FILE):
+    """Compile every table in abbreviations.json, resolving includes."""
+    with open(table_file, 'r', encoding='utf-8') as f:
+        tables = json.load(f)
+
+    def table_rules(name, seen=()):
+        if name in seen:
+            raise ValueError(f"Abbreviation table '{name}' includes itself")
+        rules = []
+        for included in tables[name].get('include', []):
+            rules += table_rules(included, seen + (name,))
+        return rules + tables[name]['rules']
+
+    return {name: Abbreviator(table_rules(name)) for name in tables}
+
+_tables = None
+
+def abbreviate(table, text):
+    """Abbreviate a value with one of the tables ('spec', 'duration')."""
+    global _tables
+    if _tables is None:
+        _tables = load_tables()
+    return _tables[table].replace(str(text) if text is not None else '')
+
+JS_TEMPLATE = """/**
+ * Spec value abbreviations
+ *
+ * Generated by spells/abbreviations.py from spells/abbreviations.json - do not
+ * edit. The tables are Aho-Corasick automata, so the Python analysis scripts
+ * and the cards abbreviate with exactly the same rules.
+ */
+
+const TABLES = %s;
+
+const isWordChar = (char) => char !== undefined && /^[A-Za-z0-9_]$/.test(char);
+
+const fold = (char) => {
+  const lower = char.toLowerCase();
+  return lower.length === char.length ? lower : char;
+};
+
+/**
+ * Abbreviate a value in one scan; the leftmost, then longest, match wins
+ * @param {string} table - Table name
+ * @param {string} text - Value to abbreviate
+ * @returns {string} Abbreviated value
+ */
+export function abbreviate(table, text) {
+  if (!text) return text;
+  const { rules, goto, fail, output } = TABLES[table];
+  const chars = Array.from(text);
+
+  const found = new Map();
+  let state = 0;
+  chars.forEach((rawChar, position) => {
+    const char = fold(rawChar);
+    while (state && !(char in goto[state])) {
+      state = fail[state];
+    }
+    state = goto[state][char] ?? 0;
+    const end = position + 1;
+    for (const [index, length] of output[state]) {
+      const start = end - length;
+      const rule = rules[index];
+      if (rule.start && start !== 0) continue;
+      if (rule.word && (isWordChar(chars[start - 1]) || isWordChar(chars[end]))) continue;
+      if (!found.has(start) || found.get(start)[0] < end) {
+        found.set(start, [end, index]);
+      }
+    }
+  });
+  if (found.size === 0) return text;
+
+  let result = '';
+  for (let position = 0; position < chars.length;) {
+    const match = found.get(position);
+    if (match) {
+      result += rules[match[1]].to;
+      position = match[0];
+      if (rules[match[1]].strip) {
+        while (position < chars.length && /\s/.test(chars[position])) position += 1;
+      }
+    } else {
+      result += chars[position];
+      position += 1;
+    }
+  }
+  return result;
+}
+"""
+
+def write_js(output_file=JS_MODULE):
+    """Write the compiled tables and matcher as an ES module."""
+    tables = {name: abbreviator.to_json() for name, abbreviator in load_tables().items()}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(JS_TEMPLATE % json.dumps(tables, ensure_ascii=False, separators=(',', ':')))
+    print(f"Wrote {len(tables)} abbreviation tables to {Path(output_file).name}")
+
+def main():
+    """Write the JS module, or abbreviate a value given on the command line."""
+    if len(sys.argv) == 3:
+        print(abbreviate(sys.argv[1], sys.argv[2]))
+    else:
+        write_js()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Build the card data as one declarative graph of stages.
+
+    ingest    CSVs + SRD JSON -> spells/<Source>.json, spells.store, spells.merkle.json
+    normalize spells/<Source>.json -> cards2/public/data (the copy that used to be manual)
+    merge     public sources -> data/catalog.json (with fit hints)
+    index     public sources -> data/search-index.json
+    bundle    public sources -> data/bundles/*.json (with fit hints)
+    release   catalog, bundles, sources -> dataset version + data/releases/patch-*.json
+    layout    SRD monsters -> data/creature-cards.json
+    thumbnails catalog + creature cards -> data/thumbnails/*.png sprite atlases and indexes
+    abbreviations abbreviations.json -> cards2/src/utils/abbreviations.js (generated matcher)
+    fuzz      worst-case latency gate for the CSV text transforms (regex_fuzz.py);
+              manual: only built when named, e.g. python build_pipeline.py fuzz
+    precache  all of the above -> precache-manifest.json (service worker revisions)
+    deploy    check that every file spells.json registers exists and parses
+
+Every stage declares its input and output files. Before a stage runs, its
+inputs (including the scripts that implement it) are content-hashed; when the
+hash and the hashes of its outputs match the last build, the stage is skipped.
+Stages whose dependencies are done run in parallel worker processes, except
+that stages sharing a lock (the spells.json registry they all update) never
+run at the same time. An exclusive stage runs alone, for timing-sensitive
+checks, and a manual stage is left out of the default build. All paths are relative to the repository root, so the
+runner works from any directory.
+
+Usage:
+    python build_pipeline.py                 # build everything that changed
+    python build_pipeline.py merge index     # build these stages and what they need
+    python build_pipeline.py --force         # ignore the cache
+    python build_pipeline.py --list          # show the graph
+"""
+
+import argparse
+import hashlib
+import importlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_FILE = "spells/.build-cache.json"
+CACHE_VERSION = 1
+
+PUBLIC_DIR = "cards2/public"
+REGISTRY = "cards2/public/spells.json"
+SPELL_SOURCES = ["5e-SRD-Spells.json", "Core.json", "XanatharsGuide.json", "TashasCauldron.json", "FizbansTreasury.json"]
+PUBLIC_SOURCES = [f"cards2/public/data/{filename}" for filename in SPELL_SOURCES]
+FITTING = ["spells/spell_fitting.py", "spells/spell_store.py"]
+
+# Each stage runs module.function(*args) in a worker; args are paths relative to ROOT.
+# The stage's own module is always part of its inputs.
+STAGES = [
+    {
+        "name": "ingest",
+        "run": ("convert_extra_spells", "main", []),
+        "deps": [],
+        "inputs": ["spells/*.csv", "spells/5e-SRD-Spells.json", "spells/class_aliases.json",
+                   "spells/class_csv.py", "spells/columnar_normalize.py", "spells/spell_extraction.py",
+                   "spells/source_classifier.py", "spells/spell_store.py", "spells/spell_diff.py",
+                   "spells/conflict_memo.py"],
+        # conflict_resolutions.json is also read; as an output, hand edits to it trigger a rebuild
+        "outputs": [f"spells/{filename}" for filename in SPELL_SOURCES[1:]]
+                   + ["spells/spells.store", "spells/spells.merkle.json", "spells/conflict_resolutions.json"],
+    },
+    {
+        "name": "normalize",
+        "run": ("build_pipeline", "publish_sources", ["spells", "cards2/public/data"]),
+        "deps": ["ingest"],
+        "inputs": [f"spells/{filename}" for filename in SPELL_SOURCES],
+        "outputs": PUBLIC_SOURCES,
+    },
+    {
+        "name": "merge",
+        "run": ("spell_catalog", "main", []),
+        "deps": ["normalize"],
+        "inputs": PUBLIC_SOURCES + FITTING + [REGISTRY],
+        "outputs": ["cards2/public/data/catalog.json"],
+        "locks": [REGISTRY],
+    },
+    {
+        "name": "index",
+        "run": ("spell_search", "write_index", [PUBLIC_DIR]),
+        "deps": ["normalize"],
+        "inputs": PUBLIC_SOURCES + ["spells/spell_catalog.py", REGISTRY],
+        "outputs": ["cards2/public/data/search-index.json"],
+        "locks": [REGISTRY],
+    },
+    {
+        "name": "bundle",
+        "run": ("spell_bundles", "build_bundles", [PUBLIC_DIR]),
+        "deps": ["normalize", "merge"],
+        "inputs": PUBLIC_SOURCES + FITTING + ["spells/spell_catalog.py", REGISTRY],
+        "outputs": ["cards2/public/data/bundles/*.json"],
+        "locks": [REGISTRY],
+    },
+    {
+        "name": "release",
+        "run": ("spell_releases", "write_release", [PUBLIC_DIR]),
+        "deps": ["merge", "bundle"],
+        "inputs": PUBLIC_SOURCES + ["cards2/public/data/catalog.json", "cards2/public/data/bundles/*.json",
+                                    "spells/spell_catalog.py", "spells/spell_diff.py", REGISTRY],
+        "outputs": ["cards2/public/data/releases/*.json", "spells/dataset-release.json"],
+        "locks": [REGISTRY],
+    },
+    {
+        "name": "layout",
+        "run": ("creature_cards", "build_creature_cards", [PUBLIC_DIR]),
+        "deps": [],
+        "inputs": ["cards2/public/data/5e-SRD-Monsters.json"] + FITTING,
+        "outputs": ["cards2/public/data/creature-cards.json"],
+    },
+    {
+        "name": "thumbnails",
+        "run": ("card_thumbnails", "build_thumbnails", [PUBLIC_DIR]),
+        "deps": ["merge", "layout"],
+        "inputs": ["cards2/public/data/catalog.json", "cards2/public/data/creature-cards.json",
+                   "spells/spell_catalog.py", "spells/abbreviations.py", "spells/abbreviations.json",
+                   REGISTRY] + FITTING,
+        "outputs": ["cards2/public/data/thumbnails/*"],
+        "locks": [REGISTRY],
+    },
+    {
+        "name": "abbreviations",
+        "run": ("abbreviations", "write_js", ["cards2/src/utils/abbreviations.js"]),
+        "deps": [],
+        "inputs": ["spells/abbreviations.json"],
+        "outputs": ["cards2/src/utils/abbreviations.js"],
+    },
+    {
+        "name": "fuzz",
+        "run": ("regex_fuzz", "run_gate", []),
+        "deps": [],
+        # Wall-clock timings: run alone, and only on request, so a busy machine can't fail a deploy
+        "manual": True,
+        "exclusive": True,
+        "inputs": ["spells/convert_extra_spells.py", "spells/spell_extraction.py", "spells/source_classifier.py",
+                   "spells/class_aliases.json"],
+        "outputs": [],
+    },
+    {
+        "name": "precache",
+        "run": ("precache_manifest", "write_manifest", [PUBLIC_DIR]),
+        "deps": ["merge", "index", "bundle", "release", "layout", "thumbnails"],
+        "inputs": [REGISTRY, "cards2/public/data/*.json", "cards2/public/data/bundles/*.json",
+                   "cards2/public/data/releases/*.json", "cards2/public/data/thumbnails/*",
+                   "spells/spell_catalog.py"],
+        "outputs": ["cards2/public/precache-manifest.json"],
+    },
+    {
+        "name": "deploy",
+        "run": ("build_pipeline", "check_artifacts", [PUBLIC_DIR]),
+        "deps": ["precache"],
+        "inputs": [REGISTRY, "cards2/public/data/*.json", "cards2/public/data/bundles/*.json",
+                   "cards2/public/data/releases/*.json", "cards2/public/precache-manifest.json"],
+        "outputs": [],
+    },
+]
+
+def publish_sources(spells_dir, data_dir):
+    """Copy the generated spell sources into the frontend's data directory."""
+    for filename in SPELL_SOURCES:
+        source = spells_dir / filename
+        target = data_dir / filename
+        if not target.exists() or source.read_bytes() != target.read_bytes():
+            shutil.copyfile(source, target)
+            print(f"Published {filename}")
+
+def check_artifacts(public_dir):
+    """Fail unless every data file registered in spells.json exists and parses."""
+    with open(public_dir / "spells.json", 'r', encoding='utf-8') as f:
+        registry = json.load(f)
+
+    files = [source['file'] for source in registry.get('sources', [])]
+    files += [bundle['file'] for bundle in registry.get('bundles', [])]
+    files += [registry[key] for key in ('catalog', 'searchIndex') if registry.get(key)]
+    files += list(registry.get('thumbnails', {}).values())
+    if registry.get('release'):
+        with open(public_dir / registry['release']['index'], 'r', encoding='utf-8') as f:
+            files += [registry['release']['index']] + [patch['file'] for patch in json.load(f)['patches']]
+    for filename in files:
+        with open(public_dir / filename, 'r', encoding='utf-8') as f:
+            json.load(f)
+    print(f"Checked {len(files)} registered data files")
+
+    # A stale revision would make the service worker keep serving an old copy
+    from precache_manifest import MANIFEST_FILE, revision
+    if (public_dir / MANIFEST_FILE).exists():
+        with open(public_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            entries = json.load(f)['files']
+        stale = [entry['url'] for entry in entries if revision(public_dir / entry['url']) != entry['revision']]
+        if stale:
+            raise ValueError(f"{MANIFEST_FILE} is out of date for: {', '.join(stale)}")
+        print(f"Checked {len(entries)} precache revisions")
+
+def expand_paths(patterns):
+    """Expand glob patterns relative to ROOT into a sorted list of existing files."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(path for path in ROOT.glob(pattern) if path.is_file())
+    return sorted(paths)
+
+def hash_files(patterns):
+    """Content hash of the files matching the patterns (paths and bytes)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in expand_paths(patterns):
+        digest.update(path.relative_to(ROOT).as_posix().encode('utf-8') + b'\0')
+        digest.update(hashlib.blake2b(path.read_bytes(), digest_size=16).digest())
+    return digest.hexdigest()
+
+def stage_inputs(stage):
+    """Input patterns of a stage, including the module that implements it."""
+    return stage['inputs'] + [f"spells/{stage['run'][0]}.py"]
+
+def load_cache():
+    """Load the stage cache, or an empty one."""
+    try:
+        with open(ROOT / CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('stages', {}) if cache.get('version') == CACHE_VERSION else {}
+
+def save_cache(stages):
+    """Write the stage cache."""
+    with open(ROOT / CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'stages': stages}, f, indent=2, ensure_ascii=False)
+
+def run_stage(module_name, function_name, args):
+    """Worker entry point: run one stage and return (ok, captured output)."""
+    sys.argv = [f"{module_name}.py"]
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            function = getattr(importlib.import_module(module_name), function_name)
+            function(*[ROOT / arg for arg in args])
+    except Exception:
+        return False, output.getvalue() + traceback.format_exc()
+    return True, output.getvalue()
+
+def select_stages(targets):
+    """
+    Return the names of the target stages and everything they depend on, in graph order.
+    Without targets, every stage except the manual ones.
+    """
+    by_name = {stage['name']: stage for stage in STAGES}
+    unknown = [target for target in targets if target not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    wanted = set()
+    pending = list(targets or [name for name, stage in by_name.items() if not stage.get('manual')])
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(by_name[name]['deps'])
+    return [stage['name'] for stage in STAGES if stage['name'] in wanted]
+
+def run_pipeline(targets=None, jobs=None, force=False, verbose=False):
+    """
+    Run the selected stages (all by default) and their dependencies.
+    Returns a dict of stage name -> "built", "cached", "failed" or "blocked".
+    """
+    by_name = {stage['name']: stage for stage in STAGES}
+    waiting = select_stages(targets or [])
+    cache = load_cache()
+    results = {}
+    running = {}  # future -> (stage, input hash, start time)
+
+    def claims(stage):
+        return set(stage.get('locks', [])) | set(stage['outputs'])
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        while waiting or running:
+            busy = set().union(*(claims(stage) for stage, _, _ in running.values()))
+            for name in list(waiting):
+                stage = by_name[name]
+                if any(other.get('exclusive') for other, _, _ in running.values()):
+                    break
+                states = [results.get(dep) for dep in stage['deps'] if dep in by_name]
+                if any(state in ('failed', 'blocked') for state in states):
+                    results[name] = 'blocked'
+                    waiting.remove(name)
+                    print(f"[{name}] blocked by a failed dependency")
+                    continue
+                if any(state is None for state in states) or claims(stage) & busy:
+                    continue
+                if stage.get('exclusive') and running:
+                    continue
+
+                waiting.remove(name)
+                key = hash_files(stage_inputs(stage))
+                previous = cache.get(name, {})
+                if not force and previous.get('inputs') == key and previous.get('outputs') == hash_files(stage['outputs']):
+                    results[name] = 'cached'
+                    print(f"[{name}] up to date")
+                    continue
+
+                print(f"[{name}] running")
+                future = executor.submit(run_stage, *stage['run'])
+                running[future] = (stage, key, time.perf_counter())
+                busy |= claims(stage)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key, start = running.pop(future)
+                ok, output = future.result()
+                if verbose or not ok:
+                    for line in output.rstrip().splitlines():
+                        print(f"  {line}")
+                if ok:
+                    results[stage['name']] = 'built'
+                    cache[stage['name']] = {'inputs': key, 'outputs': hash_files(stage['outputs'])}
+                    print(f"[{stage['name']}] built in {time.perf_counter() - start:.1f}s")
+                else:
+                    results[stage['name']] = 'failed'
+                    cache.pop(stage['name'], None)
+                    print(f"[{stage['name']}] FAILED")
+            save_cache(cache)
+
+    return results
+
+def main():
+    """Run the build graph from the command line."""
+    parser = argparse.ArgumentParser(description="Build the card data for cards2/public.")
+    parser.add_argument('stages', nargs='*', help="stages to build (default: all)")
+    parser.add_argument('--jobs', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="rebuild even when inputs are unchanged")
+    parser.add_argument('--verbose', action='store_true', help="show each stage's output")
+    parser.add_argument('--list', action='store_true', help="list the stages and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for stage in STAGES:
+            deps = ', '.join(stage['deps']) or '-'
+            manual = ' (manual)' if stage.get('manual') else ''
+            print(f"{stage['name']:10} after {deps:30} -> {', '.join(stage['outputs']) or '(checks only)'}{manual}")
+        return
+
+    try:
+        results = run_pipeline(args.stages, args.jobs, args.force, args.verbose)
+    except ValueError as e:
+        parser.error(str(e))
+
+    counts = {state: sum(1 for result in results.values() if result == state) for state in ('built', 'cached', 'failed', 'blocked')}
+    print(', '.join(f"{count} {state}" for state, count in counts.items() if count))
+    if counts['failed'] or counts['blocked']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Local card-generation service.
+
+A small asyncio HTTP server on top of the Python pipeline, for people and
+scripts that want card data or printable sheets without opening the SPA. The
+merged catalog (with fit hints) is loaded once at startup. Every endpoint
+takes the same query:
+
+    classes=Wizard,Cleric  levels=0,1  sources=srd,core
+    cardSize=standard  pageSize=letter  guillotine=1
+
+Endpoints:
+    GET /health   catalog size and cache statistics
+    GET /cards    filtered spells as JSON, with the fit hint for the card size
+    GET /sheet    printable HTML sheets, packed with page_packing
+
+Responses are cached in an LRU keyed on the normalized query and carry an
+ETag, so repeat requests are answered from memory (or with 304 Not
+Modified). Sheets are rendered in a bounded process pool, and concurrent
+requests for the same uncached query share one render.
+
+Usage:
+    python card_service.py [--host 127.0.0.1] [--port 8765] [--workers 4] [--cache-size 128]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from page_packing import CARD_SIZES, PAGE_SIZES, grid_layout, pack_pages
+from spell_catalog import CATALOG_FILE, merge_catalog, select_sources
+from spell_fitting import body_paragraphs, split_body
+from spell_store import spell_id
+
+PUBLIC_DIR = Path(__file__).parent.parent / 'cards2' / 'public'
+CARD_CSS = Path(__file__).parent.parent / 'cards2' / 'src' / 'components' / 'Card.css'
+
+MAX_REQUEST_LINE = 8192
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+# Catalog for the current process: the server and each render worker load it once
+_catalog = None
+
+def load_catalog(public_dir=PUBLIC_DIR):
+    """Load the merged catalog, building it (with fit hints) if it hasn't been written yet."""
+    catalog_path = Path(public_dir) / CATALOG_FILE
+    if catalog_path.exists():
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    spells, _ = merge_catalog(public_dir, with_fit_hints=True)
+    return spells
+
+def init_worker(public_dir):
+    """Process pool initializer: load the catalog once per worker."""
+    global _catalog
+    _catalog = load_catalog(public_dir)
+
+def parse_query(query_string):
+    """Normalize a query string into a hashable, order-independent query."""
+    params = parse_qs(query_string)
+
+    def values(name):
+        items = []
+        for value in params.get(name, []):
+            items.extend(item.strip() for item in value.split(',') if item.strip())
+        return items
+
+    card_size = params.get('cardSize', ['standard'])[0]
+    page_size = params.get('pageSize', ['letter'])[0]
+    if card_size not in CARD_SIZES:
+        raise ValueError(f"Unknown card size: {card_size}")
+    if page_size not in PAGE_SIZES:
+        raise ValueError(f"Unknown page size: {page_size}")
+
+    try:
+        levels = tuple(sorted({int(level) for level in values('levels')}))
+    except ValueError:
+        raise ValueError("levels must be integers")
+
+    return (
+        ('classes', tuple(sorted({name.lower() for name in values('classes')}))),
+        ('levels', levels),
+        ('sources', tuple(sorted(set(values('sources'))))),
+        ('cardSize', card_size),
+        ('pageSize', page_size),
+        ('guillotine', params.get('guillotine', ['0'])[0].lower() in ('1', 'true', 'yes')),
+    )
+
+def spell_classes(spell):
+    """Return the lowercased class names of a spell."""
+    return {(cls['name'] if isinstance(cls, dict) else cls).lower() for cls in spell.get('classes', [])}
+
+def select_spells(catalog, query):
+    """Filter the catalog by class, level and source, sorted like the frontend (level, then name)."""
+    query = dict(query)
+    if query['sources']:
+        catalog = [spell for spell in (select_sources(spell, set(query['sources'])) for spell in catalog) if spell]
+    selected = [
+        spell for spell in catalog
+        if (not query['classes'] or spell_classes(spell) & set(query['classes']))
+        and (not query['levels'] or int(spell.get('level', 0)) in query['levels'])
+    ]
+    return sorted(selected, key=lambda spell: (int(spell.get('level', 0)), spell['name'].lower()))
+
+def card_hint(spell, card_size):
+    """Return the fit hint for a card size, defaulting to one unscaled card."""
+    return spell.get('fit', {}).get(card_size, {'fontScale': 1.0, 'letterSpacing': 0, 'cards': 1})
+
+def render_cards(catalog, query):
+    """Build the /cards response body."""
+    card_size = dict(query)['cardSize']
+    spells = select_spells(catalog, query)
+    cards = []
+    for spell in spells:
+        entry = {key: value for key, value in spell.items() if key not in ('fit', 'source_classes', 'copies')}
+        entry['id'] = spell_id(spell['name'])
+        entry['fit'] = card_hint(spell, card_size)
+        cards.append(entry)
+
+    body = {
+        'query': {key: list(value) if isinstance(value, tuple) else value for key, value in query},
+        'spells': len(cards),
+        'cards': sum(card['fit']['cards'] for card in cards),
+        'results': cards
+    }
+    return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+def inline_markdown(text):
+    """Escape text and convert the markdown the spell data uses (bold, italic, code)."""
+    text = html.escape(text)
+    text = re.sub(r'\*\*\*(.*?)\*\*\*', r'<strong><em>\1</em></strong>', text)
+    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*(.*?)\*', r'<em>\1</em>', text)
+    return re.sub(r'`(.*?)`', r'<code>\1</code>', text)
+
+def body_parts(spell, card_size, hint):
+    """Split the body paragraphs across the hinted number of cards, by rendered height."""
+    desc = spell.get('desc') or []
+    text = '\n\n'.join(desc) if isinstance(desc, list) else (spell.get('description') or '')
+    if spell.get('higher_level'):
+        text += '\n\n' + '\n\n'.join(spell['higher_level'])
+    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+    material = (spell.get('material') or spell.get('material_component') or '').strip()
+    html_paragraphs = [f"<p><em>Material Component:</em> {html.escape(material)}</p>"] if material else []
+    html_paragraphs += [f"<p>{inline_markdown(p).replace(chr(10), '<br/>')}</p>" for p in paragraphs]
+
+    if hint['cards'] <= 1:
+        return [''.join(html_paragraphs)]
+
+    # Whole paragraphs per card, filled by the heights the fitter measured
+    breaks = [0] + split_body(body_paragraphs(spell), card_size, hint) + [len(html_paragraphs)]
+    return [''.join(html_paragraphs[start:end]) for start, end in zip(breaks, breaks[1:])]
+
+def card_html(spell, body, hint, continuation=False):
+    """Render one card with the markup and classes of cards2's Card component."""
+    level = str(spell.get('level', ''))
+    school = spell.get('school', {})
+    school = school.get('name', '') if isinstance(school, dict) else (spell.get('school_of_magic') or '')
+    classes = ', '.join(sorted({cls['name'] if isinstance(cls, dict) else cls for cls in spell.get('classes', [])}))
+    components = spell.get('components', '')
+    components = ', '.join(components) if isinstance(components, list) else components
+    ritual = '<div class="ritual-indicator"><span>R</span></div>' if spell.get('ritual') else ''
+
+    header = ''
+    if not continuation:
+        columns = [('RANGE', spell.get('range', '')), ('COMPONENTS', components),
+                   ('DURATION', spell.get('duration', '')), ('CASTING TIME', spell.get('casting_time', ''))]
+        header = '<div class="spell-header-container"><div class="spell-header-bar">' + ''.join(
+            f'<div class="spell-header-column"><div class="spell-header-label">{label}</div>'
+            f'<div class="spell-header-value">{html.escape(str(value))}</div></div>'
+            for label, value in columns
+        ) + '</div></div>'
+
+    style = f"font-size: {hint['fontScale'] * 100:.0f}%; letter-spacing: {hint['letterSpacing']}em"
+    return (
+        f'<div class="spell-name">{ritual}<span class="spell-title-text">{html.escape(spell["name"])}</span>'
+        f'<div class="spell-level-circle"><span>{level}</span></div></div>'
+        f'<div class="spell-content">{header}<div class="spell-body"><div class="spell-description">'
+        f'<div class="spell-description-content" style="{style}"><span class="description-content">{body}</span>'
+        f'</div></div></div></div>'
+        f'<div class="spell-footer"><div class="spell-school">{html.escape(school)}</div>'
+        f'<div class="spell-classes">{html.escape(classes)}</div></div>'
+    )
+
+def render_card_parts(spell, card_size):
+    """Render a spell as its card plus continuation cards (HTML strings)."""
+    hint = card_hint(spell, card_size)
+    parts = body_parts(spell, card_size, hint)
+    return [card_html(spell, body, hint, continuation=index > 0) for index, body in enumerate(parts)]
+
+def sheet_document(cards, pages, card_size, page_size):
+    """Lay rendered cards out as printable HTML pages; pages hold card indices (None = empty slot)."""
+    card_width, card_height = CARD_SIZES[card_size]
+    page_width, page_height = PAGE_SIZES[page_size]
+    per_row, per_column = grid_layout(page_size, card_size)
+
+    with open(CARD_CSS, 'r', encoding='utf-8') as f:
+        card_css = f.read()
+
+    page_html = []
+    for page in pages:
+        slots = ''.join(
+            f'<div class="spell-card card--{card_size}" style="width: {card_width}in; height: {card_height}in">{cards[index]}</div>'
+            if index is not None else '<div></div>'
+            for index in page
+        )
+        page_html.append(f'<section class="page">{slots}</section>')
+
+    document = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Spell cards</title>
+<style>
+{card_css}
+@page {{ size: {page_width:.3f}in {page_height:.3f}in; margin: 0; }}
+body {{ margin: 0; }}
+.page {{ width: {page_width:.3f}in; height: {page_height:.3f}in; display: grid; justify-content: center; align-content: center;
+  grid-template-columns: repeat({per_row}, {card_width}in); grid-template-rows: repeat({per_column}, {card_height}in);
+  page-break-after: always; }}
+</style></head>
+<body>{''.join(page_html)}</body></html>
+"""
+    return document.encode('utf-8')
+
+def render_sheet(query, catalog=None):
+    """Render printable HTML sheets for a query. Runs in a worker process."""
+    catalog = catalog if catalog is not None else _catalog
+    options = dict(query)
+    card_size, page_size = options['cardSize'], options['pageSize']
+
+    cards = []
+    group_sizes = []
+    for spell in select_spells(catalog, query):
+        parts = render_card_parts(spell, card_size)
+        cards.extend(parts)
+        group_sizes.append(len(parts))
+
+    per_row, per_column = grid_layout(page_size, card_size)
+    pages = pack_pages(group_sizes, per_row * per_column, per_row, options['guillotine'])
+    return sheet_document(cards, pages, card_size, page_size)
+
+class ResponseCache:
+    """LRU cache of rendered responses keyed by (endpoint, normalized query)."""
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, body, content_type):
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.entries[key] = (body, content_type, etag)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return self.entries[key]
+
+class CardService:
+    """HTTP handler: routing, caching, ETags and the render pool."""
+
+    def __init__(self, catalog, workers=4, cache_size=128, public_dir=PUBLIC_DIR):
+        self.catalog = catalog
+        self.cache = ResponseCache(cache_size)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(str(public_dir),))
+        self.pending = {}  # cache key -> task of an in-flight render
+
+    async def respond(self, endpoint, query):
+        """Return (body, content_type, etag) for an endpoint, from cache or freshly rendered."""
+        key = (endpoint, query)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+
+        # Share one render between concurrent requests for the same query. The render
+        # runs as its own task, so a requester that is cancelled (e.g. disconnects)
+        # stops waiting without cancelling the render the others are waiting on
+        if key not in self.pending:
+            task = asyncio.ensure_future(self.render(key, endpoint, query))
+            # Retrieve the error even if every requester has gone, so it isn't logged as unhandled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self.pending[key] = task
+        return await asyncio.shield(self.pending[key])
+
+    async def render(self, key, endpoint, query):
+        """Render one response into the cache. Runs once per in-flight cache key."""
+        try:
+            if endpoint == '/cards':
+                body, content_type = render_cards(self.catalog, query), 'application/json; charset=utf-8'
+            else:
+                loop = asyncio.get_running_loop()
+                body = await loop.run_in_executor(self.pool, render_sheet, query)
+                content_type = 'text/html; charset=utf-8'
+            return self.cache.put(key, body, content_type)
+        finally:
+            del self.pending[key]
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP request per connection."""
+        try:
+            request_line = await reader.readline()
+            if not request_line or len(request_line) > MAX_REQUEST_LINE:
+                return
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                await self.send(writer, 400, b'Malformed request line\n')
+                return
+            method, target, _ = parts
+            if method not in ('GET', 'HEAD'):
+                await self.send(writer, 405, b'Only GET and HEAD are supported\n')
+                return
+
+            url = urlsplit(target)
+            if url.path == '/health':
+                body = json.dumps({
+                    'spells': len(self.catalog),
+                    'cached': len(self.cache.entries),
+                    'hits': self.cache.hits,
+                    'misses': self.cache.misses
+                }).encode('utf-8')
+                await self.send(writer, 200, body, 'application/json', head=method == 'HEAD')
+                return
+            if url.path not in ('/cards', '/sheet'):
+                await self.send(writer, 404, b'Unknown endpoint; use /cards, /sheet or /health\n')
+                return
+
+            try:
+                query = parse_query(url.query)
+            except ValueError as error:
+                await self.send(writer, 400, f"{error}\n".encode('utf-8'))
+                return
+
+            body, content_type, etag = await self.respond(url.path, query)
+            if headers.get('if-none-match') == etag:
+                await self.send(writer, 304, b'', content_type, etag, head=True)
+            else:
+                await self.send(writer, 200, body, content_type, etag, head=method == 'HEAD')
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, body, content_type='text/plain; charset=utf-8', etag=None, head=False):
+        """Write a complete HTTP/1.1 response and close the connection."""
+        lines = [
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        if etag:
+            lines += [f"ETag: {etag}", "Cache-Control: no-cache"]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if not head:
+            writer.write(body)
+        await writer.drain()
+
+async def serve(host, port, workers, cache_size):
+    """Load the catalog and serve until interrupted."""
+    catalog = load_catalog()
+    service = CardService(catalog, workers, cache_size)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving {len(catalog)} spells on http://{host}:{port} ({workers} render workers, cache {cache_size})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.pool.shutdown(cancel_futures=True)
+
+def main():
+    """Parse arguments and run the service."""
+    parser = argparse.ArgumentParser(description="Serve spell card data and printable sheets.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=4, help="render worker processes")
+    parser.add_argument('--cache-size', type=int, default=128, help="cached responses")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        print("Stopped")
+
+if __name__ == "__main__":
+    main()
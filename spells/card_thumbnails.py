@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Low-resolution card thumbnails packed into sprite atlases.
+
+The preview renders a full Card component, measured in hidden DOM, for every
+selected card, which for a full class list is thousands of DOM nodes. For
+overview grids the frontend can show these thumbnails instead and only mount
+full cards for a page that is zoomed or printed.
+
+Every spell in the catalog and every precomputed creature card is drawn at
+each card size, at THUMB_SCALE of its CSS size, with the card's frame, title,
+level, header rows and footer. Body text is "greeked": each line is a grey bar
+as long as the line would be, using spell_fitting's glyph metrics and the fit
+hint's font scale, and long bodies are split across continuation cards at the
+same paragraph breaks the frontend uses. Thumbnails are packed row-major into
+palette PNGs of at most ATLAS_SIZE pixels a side, written with zlib only.
+
+For each card size, data/thumbnails/<size>.json indexes the atlases:
+
+    {"width": 60, "height": 84, "columns": 34, "perAtlas": 816,
+     "atlases": ["data/thumbnails/standard-0.png", ...],
+     "sheets": [[34, 24], ...],
+     "cards": {"spell:fireball": [12], "creature:aboleth": [901, 902]}}
+
+where each card lists the cells of its parts; cell n is in atlas
+n // perAtlas at column (n % perAtlas) % columns, row (n % perAtlas) // columns,
+and "sheets" gives each atlas's size in cells.
+
+Usage:
+    python card_thumbnails.py
+"""
+
+import json
+import re
+import struct
+import unicodedata
+import zlib
+from pathlib import Path
+
+from abbreviations import abbreviate
+from spell_catalog import load_registry
+from spell_fitting import (CARD_METRICS, TEXT_INSET, LINE_HEIGHT, PARAGRAPH_GAP, BREAK_GAP,
+                           body_paragraphs, glyph_units, measure_paragraphs, split_body, text_width)
+from spell_store import spell_id
+
+THUMBNAILS_DIR = "data/thumbnails"
+CATALOG_FILE = "data/catalog.json"
+CREATURE_CARDS_FILE = "data/creature-cards.json"
+
+THUMB_SCALE = 0.25
+ATLAS_SIZE = 2048
+FOOTER_HEIGHT = 18
+CARD_PADDING = 4
+
+# Palette indices
+BLACK, WHITE, TEXT, LIGHT = range(4)
+PALETTE = [(0, 0, 0), (255, 255, 255), (136, 136, 136), (170, 170, 170)]
+
+# 3x5 pixel font for titles and levels; other characters are drawn as gaps
+FONT = {char: rows.split() for char, rows in {
+    'A': ".#. #.# ### #.# #.#", 'B': "##. #.# ##. #.# ##.", 'C': ".## #.. #.. #.. .##",
+    'D': "##. #.# #.# #.# ##.", 'E': "### #.. ##. #.. ###", 'F': "### #.. ##. #.. #..",
+    'G': ".## #.. #.# #.# .##", 'H': "#.# #.# ### #.# #.#", 'I': "### .#. .#. .#. ###",
+    'J': "..# ..# ..# #.# .#.", 'K': "#.# #.# ##. #.# #.#", 'L': "#.. #.. #.. #.. ###",
+    'M': "#.# ### ### #.# #.#", 'N': "##. #.# #.# #.# #.#", 'O': ".#. #.# #.# #.# .#.",
+    'P': "##. #.# ##. #.. #..", 'Q': ".#. #.# #.# ##. .##", 'R': "##. #.# ##. #.# #.#",
+    'S': ".## #.. .#. ..# ##.", 'T': "### .#. .#. .#. .#.", 'U': "#.# #.# #.# #.# ###",
+    'V': "#.# #.# #.# #.# .#.", 'W': "#.# #.# ### ### #.#", 'X': "#.# #.# .#. #.# #.#",
+    'Y': "#.# #.# .#. .#. .#.", 'Z': "### ..# .#. #.. ###",
+    '0': "### #.# #.# #.# ###", '1': ".#. ##. .#. .#. ###", '2': "##. ..# .#. #.. ###",
+    '3': "##. ..# .#. ..# ##.", '4': "#.# #.# ### ..# ..#", '5': "### #.. ##. ..# ##.",
+    '6': ".## #.. ### #.# ###", '7': "### ..# .#. .#. .#.", '8': "### #.# ### #.# ###",
+    '9': "### #.# ### ..# ##.", '-': "... ... ### ... ...", "'": ".#. .#. ... ... ...",
+    '(': "..# .#. .#. .#. ..#", ')': "#.. .#. .#. .#. #..", '/': "..# ..# .#. #.. #..",
+    ',': "... ... ... .#. #..", '.': "... ... ... ... .#.", '&': ".#. #.# .#. #.# .##",
+    ':': "... .#. ... .#. ...", '+': "... .#. ### .#. ...",
+}.items()}
+GLYPH_WIDTH = 3
+GLYPH_HEIGHT = 5
+
+PARAGRAPH_PATTERN = re.compile(r'<p[^>]*>(.*?)</p>', re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+class Canvas:
+    """Palette-indexed raster with rectangle and text drawing."""
+
+    def __init__(self, width, height, color=WHITE):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray([color]) * (width * height)
+
+    def fill(self, x0, y0, x1, y1, color):
+        """Fill the rectangle [x0, x1) x [y0, y1), clipped to the canvas."""
+        x0, x1 = max(0, int(x0)), min(self.width, int(x1))
+        y0, y1 = max(0, int(y0)), min(self.height, int(y1))
+        if x0 >= x1:
+            return
+        run = bytes([color]) * (x1 - x0)
+        for y in range(y0, y1):
+            start = y * self.width + x0
+            self.pixels[start:start + len(run)] = run
+
+    def text(self, x, y, text, color):
+        """Draw text in the 3x5 font with its top-left corner at (x, y)."""
+        for char in text:
+            for row, bits in enumerate(FONT.get(char, ())):
+                for column, bit in enumerate(bits):
+                    if bit == '#':
+                        self.fill(x + column, y + row, x + column + 1, y + row + 1, color)
+            x += GLYPH_WIDTH + 1
+
+    def blit(self, other, x, y):
+        """Copy another canvas into this one at (x, y)."""
+        for row in range(other.height):
+            start = (y + row) * self.width + x
+            self.pixels[start:start + other.width] = other.pixels[row * other.width:(row + 1) * other.width]
+
+def png_bytes(canvas):
+    """Encode a canvas as an 8-bit palette PNG."""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    rows = b''.join(b'\0' + bytes(canvas.pixels[y * canvas.width:(y + 1) * canvas.width]) for y in range(canvas.height))
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', canvas.width, canvas.height, 8, 3, 0, 0, 0))
+            + chunk(b'PLTE', b''.join(bytes(color) for color in PALETTE))
+            + chunk(b'IDAT', zlib.compress(rows, 9))
+            + chunk(b'IEND', b''))
+
+def font_text(text):
+    """Uppercase ASCII approximation of text for the 3x5 font."""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return text.upper().replace('’', "'")
+
+def line_layout(paragraph, font_px, letter_spacing, line_width):
+    """Greedy line breaks of one measured paragraph: [(height, width)] per rendered line."""
+    space_width = text_width(glyph_units(' '), font_px, letter_spacing)
+    line_height = font_px * LINE_HEIGHT
+    lines = []
+    for line_index, line in enumerate(paragraph):
+        width = None
+        first = True
+        for units in line or [(0, 0)]:
+            word = min(text_width(units, font_px, letter_spacing), line_width)
+            if width is not None and width + space_width + word <= line_width:
+                width += space_width + word
+                continue
+            if width is not None:
+                lines.append((line_height + (BREAK_GAP * font_px if first and line_index > 0 else 0), width))
+                first = False
+            width = word
+        lines.append((line_height + (BREAK_GAP * font_px if first and line_index > 0 else 0), width))
+    return lines
+
+def card_parts(paragraphs, card_size, hint, header_rows):
+    """Split measured paragraphs into the cards the frontend shows (lists of paragraph indices)."""
+    breaks = hint.get('breaks')
+    if breaks is None:
+        breaks = split_body(paragraphs, card_size, hint, header_rows) if hint.get('cards', 1) > 1 else []
+    bounds = [0] + list(breaks) + [len(paragraphs)]
+    return [range(start, end) for start, end in zip(bounds, bounds[1:])]
+
+def draw_card(card, paragraphs, card_size, hint, header_rows, continuation):
+    """Draw one card part as a thumbnail canvas."""
+    metrics = CARD_METRICS[card_size]
+    scale = THUMB_SCALE
+    width = round(metrics['width'] * scale)
+    height = round(metrics['height'] * scale)
+    canvas = Canvas(width, height, BLACK)
+
+    # Content panel, from under the middle of the title down to the footer
+    title_h = metrics['title']
+    top = (title_h / 2 + 3) * scale
+    bottom = (metrics['height'] - CARD_PADDING - FOOTER_HEIGHT) * scale
+    canvas.fill(CARD_PADDING * scale, top, width - CARD_PADDING * scale, bottom, WHITE)
+
+    # Title pill with the title, ritual marker and level
+    pill_top = round(3 * scale)
+    pill_bottom = round((3 + title_h) * scale)
+    canvas.fill(8 * scale, pill_top, width - 8 * scale, pill_bottom, WHITE)
+    text_y = (pill_top + pill_bottom - GLYPH_HEIGHT) // 2
+    level = font_text(str(card.get('rightIndicator', '')))[:2]
+    level_x = width - round(8 * scale) - 1 - len(level) * (GLYPH_WIDTH + 1)
+    if level:
+        canvas.text(level_x, text_y, level, BLACK)
+    left = round(8 * scale) + 2
+    if card.get('leftIndicator'):
+        canvas.fill(left, text_y + 1, left + 3, text_y + 4, BLACK)
+        left += 4
+    title = font_text(card.get('title', ''))
+    room = (level_x - 2 - left + 1) // (GLYPH_WIDTH + 1)
+    title = title[:max(room, 0)]
+    canvas.text(left + ((level_x - 2 - left) - (len(title) * (GLYPH_WIDTH + 1) - 1)) // 2, text_y, title, BLACK)
+
+    # Header rows: value bars over a rule, below the content panel's padding for the title
+    y = top + (2 + title_h / 2 - 4) * scale
+    inner_left = CARD_PADDING * scale + 2
+    inner_right = width - CARD_PADDING * scale - 2
+    rows = [] if continuation else (card.get('specs') or [])[:header_rows]
+    for specs in rows:
+        row_h = metrics['header'] * scale
+        column_w = (inner_right - inner_left) / max(len(specs), 1)
+        for index, spec in enumerate(specs):
+            x = inner_left + index * column_w
+            bar = min(column_w - 2, max(1, len(str(spec.get('value', ''))) * column_w / 14))
+            canvas.fill(x + (column_w - bar) / 2, y + row_h * 0.55, x + (column_w + bar) / 2, y + row_h * 0.55 + 1, TEXT)
+        y += row_h
+        canvas.fill(inner_left - 2, y, inner_right + 2, y + 1, BLACK)
+
+    # Body: one grey bar per line of text
+    font_px = metrics['font'] * hint.get('fontScale', 1)
+    line_width = metrics['width'] - TEXT_INSET
+    x = TEXT_INSET / 2 * scale
+    y += 4 * scale
+    for number, paragraph in enumerate(paragraphs):
+        for line_number, (line_height, line_w) in enumerate(line_layout(paragraph, font_px, hint.get('letterSpacing', 0), line_width)):
+            if line_number == 0 and number > 0:
+                y += PARAGRAPH_GAP * font_px * scale
+            y += line_height * scale
+            if y > bottom:
+                break
+            canvas.fill(x, y - 1, x + max(1, line_w * scale), y, TEXT)
+
+    # Footer text bars
+    footer_y = height - 2 - 1
+    for text, align_right in ((card.get('bottomLeft', ''), False), (card.get('bottomRight', ''), True)):
+        bar = min(width / 2 - 3, len(text) * 0.9)
+        if bar >= 1:
+            start = width - 3 - bar if align_right else 3
+            canvas.fill(start, footer_y, start + bar, footer_y + 1, LIGHT)
+    return canvas
+
+def spell_card(spell):
+    """The fields a spell's thumbnail shows, as SpellToCardDataTransformer builds them."""
+    school = spell.get('school') or ''
+    school = school.get('name', '') if isinstance(school, dict) else (spell.get('school_of_magic') or school)
+    classes = [cls['name'] if isinstance(cls, dict) else cls for cls in spell.get('classes', [])]
+    return {
+        'title': spell['name'],
+        'leftIndicator': 'R' if spell.get('ritual') else '',
+        'rightIndicator': str(spell.get('level', '')),
+        'specs': [[{'value': abbreviate('spec', spell.get('range', ''))}, {'value': spell.get('components', '')},
+                   {'value': abbreviate('duration', spell.get('duration', ''))},
+                   {'value': abbreviate('spec', spell.get('casting_time', ''))}]],
+        'bottomLeft': school,
+        'bottomRight': ', '.join(classes)
+    }
+
+def thumbnail_sources(public_dir):
+    """Yield (key, card fields, measured paragraphs, fit hints, header rows) for every card."""
+    with open(public_dir / CATALOG_FILE, 'r', encoding='utf-8') as f:
+        for spell in json.load(f):
+            yield f"spell:{spell_id(spell['name'])}", spell_card(spell), body_paragraphs(spell), spell.get('fit', {}), 1
+
+    creatures_path = public_dir / CREATURE_CARDS_FILE
+    if creatures_path.exists():
+        with open(creatures_path, 'r', encoding='utf-8') as f:
+            for entry in json.load(f):
+                card = entry['card']
+                paragraphs = measure_paragraphs([[TAG_PATTERN.sub('', paragraph)]
+                                                 for paragraph in PARAGRAPH_PATTERN.findall(card.get('body', ''))])
+                yield f"creature:{spell_id(entry['name'])}", card, paragraphs, entry.get('fit', {}), len(card.get('specs') or [])
+
+def build_thumbnails(public_dir):
+    """Draw every card at every size, write the atlases and indexes, and register them in spells.json."""
+    public_dir = Path(public_dir)
+    (public_dir / THUMBNAILS_DIR).mkdir(parents=True, exist_ok=True)
+    sources = list(thumbnail_sources(public_dir))
+
+    indexes = {}
+    for card_size, metrics in CARD_METRICS.items():
+        width = round(metrics['width'] * THUMB_SCALE)
+        height = round(metrics['height'] * THUMB_SCALE)
+        columns = ATLAS_SIZE // width
+        per_atlas = columns * (ATLAS_SIZE // height)
+
+        cells = []
+        cards = {}
+        for key, card, paragraphs, fit, header_rows in sources:
+            hint = fit.get(card_size) or {'fontScale': 1.0, 'letterSpacing': 0, 'cards': 1}
+            parts = card_parts(paragraphs, card_size, hint, header_rows)
+            cards[key] = list(range(len(cells), len(cells) + len(parts)))
+            for index, part in enumerate(parts):
+                cells.append(draw_card(card, [paragraphs[i] for i in part], card_size, hint, header_rows, index > 0))
+
+        atlases = []
+        sheets = []
+        for start in range(0, len(cells), per_atlas):
+            sheet_cells = cells[start:start + per_atlas]
+            rows = -(-len(sheet_cells) // columns)
+            sheet = Canvas(min(len(sheet_cells), columns) * width, rows * height, BLACK)
+            for offset, cell in enumerate(sheet_cells):
+                sheet.blit(cell, (offset % columns) * width, (offset // columns) * height)
+            filename = f"{THUMBNAILS_DIR}/{card_size}-{len(atlases)}.png"
+            (public_dir / filename).write_bytes(png_bytes(sheet))
+            atlases.append(filename)
+            sheets.append([sheet.width // width, rows])
+
+        # Drop atlases left over from a larger previous build
+        for stale in (public_dir / THUMBNAILS_DIR).glob(f"{card_size}-*.png"):
+            if f"{THUMBNAILS_DIR}/{stale.name}" not in atlases:
+                stale.unlink()
+
+        index_file = f"{THUMBNAILS_DIR}/{card_size}.json"
+        with open(public_dir / index_file, 'w', encoding='utf-8') as f:
+            json.dump({'width': width, 'height': height, 'columns': columns, 'perAtlas': per_atlas,
+                       'atlases': atlases, 'sheets': sheets, 'cards': cards}, f, ensure_ascii=False, separators=(',', ':'))
+        indexes[card_size] = index_file
+        size = sum((public_dir / atlas).stat().st_size for atlas in atlases)
+        print(f"Created {index_file}: {len(cells)} thumbnails in {len(atlases)} atlas(es), {size / 1024:.0f} KiB")
+
+    registry = load_registry(public_dir)
+    if registry.get('thumbnails') != indexes:
+        registry['thumbnails'] = indexes
+        with open(public_dir / "spells.json", 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+    return indexes
+
+def main():
+    """Build thumbnails for the frontend's public data directory."""
+    build_thumbnails(Path(__file__).parent.parent / 'cards2' / 'public')
+
+if __name__ == "__main__":
+    main()
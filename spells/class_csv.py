@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Zero-copy reader for the class CSV dialect (spells/*.csv).
+
+The class CSVs are semicolon-separated with every field double-quoted:
+
+    "0";"Acid Splash";"Conjuration cantrip";"1 action";"60 feet";"V, S";"Instantaneous";"...";"Wizard"
+
+iter_rows mmaps the file and finds field boundaries with byte searches on the
+mapping; no text is decoded until a field is read. Each row is a CSVRow view
+that records field spans and decodes a field (from a memoryview slice) only
+when it is indexed, so a consumer that reads one column of nine never decodes
+the other eight. Rows are only valid while the iteration is running.
+
+Tokenizing matches csv.reader(f, delimiter=';') over a file opened in text
+mode exactly (doubled quotes, quoted newlines, universal newlines, blank
+lines as empty rows and the non-strict handling of stray quotes), so the
+loaders get the same rows as before.
+
+Usage:
+    python class_csv.py             # check against csv.reader and benchmark the loaders
+    python class_csv.py FILE.csv    # same, for one file
+"""
+
+import mmap
+import re
+import sys
+from pathlib import Path
+
+QUOTE = ord('"')
+DELIMITER = ord(';')
+CR = ord('\r')
+LF = ord('\n')
+
+COLUMNS = 9
+
+# The common row: nine quoted fields without quotes inside, then a line break.
+# One C-level match finds all field spans; rows it doesn't match use the
+# general scanner.
+QUOTED_ROW = re.compile(rb';'.join([rb'"([^"]*)"'] * COLUMNS) + rb'(?:\r\n|\r|\n|\Z)')
+
+# End of an unquoted field
+UNQUOTED_END = re.compile(rb'[;\r\n]')
+
+# Field kinds stored in a general row's span list
+RAW = 0      # unquoted field, decoded as is
+QUOTED = 1   # quoted field body; doubled quotes and newlines need normalizing
+DECODED = 2  # parsed by the slow path; the span holds the string itself
+
+def normalize_newlines(text):
+    """Translate \\r\\n and \\r to \\n, as reading the file in text mode does."""
+    if '\r' in text:
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+class CSVRow:
+    """Lazy view of one row: field spans into the mapped file, decoded on access."""
+
+    __slots__ = ('_view', '_spans')
+
+    def __init__(self, view, spans):
+        self._view = view
+        self._spans = spans  # flat (kind, start, end) triples; for DECODED, start is the string
+
+    def __len__(self):
+        return len(self._spans) // 3
+
+    def _index(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return index
+
+    def __getitem__(self, index):
+        index = self._index(index)
+        kind, start, end = self._spans[index * 3:index * 3 + 3]
+        if kind == DECODED:
+            return start
+        text = str(self._view[start:end], 'utf-8')
+        if kind == QUOTED:
+            if '"' in text:
+                text = text.replace('""', '"')
+            text = normalize_newlines(text)
+        return text
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def text(self, index):
+        """Field with surrounding quotes stripped, as the loaders' .strip('"') does."""
+        return self[index].strip('"')
+
+    def to_list(self):
+        """Decode every field."""
+        return list(self)
+
+class QuotedRow(CSVRow):
+    """Row matched by QUOTED_ROW; the spans are the match's group spans."""
+
+    __slots__ = ()
+
+    def __len__(self):
+        return COLUMNS
+
+    def __getitem__(self, index):
+        start, end = self._spans[self._index(index) + 1]
+        return normalize_newlines(str(self._view[start:end], 'utf-8'))
+
+    def to_list(self):
+        # No field contains a quote, so one decode of the row splits exactly
+        spans = self._spans
+        text = str(self._view[spans[1][0]:spans[COLUMNS][1]], 'utf-8')
+        return normalize_newlines(text).split('";"')
+
+def parse_row_slow(view, pos, size):
+    """
+    Character-level csv.reader state machine (excel dialect, non-strict) for
+    rows the scanner can't handle, e.g. text after a closing quote.
+    Returns (decoded fields, position after the row).
+    """
+    fields = []
+    field = bytearray()
+    quoted = False
+    after_quote = False
+    at_start = True
+
+    while pos < size:
+        byte = view[pos]
+        if quoted:
+            if byte == QUOTE:
+                quoted = False
+                after_quote = True
+            else:
+                field.append(byte)
+            pos += 1
+            continue
+
+        if byte in (CR, LF):
+            pos += 2 if byte == CR and pos + 1 < size and view[pos + 1] == LF else 1
+            fields.append(field)
+            break
+
+        if byte == DELIMITER:
+            fields.append(field)
+            field = bytearray()
+            at_start = True
+            after_quote = False
+        elif byte == QUOTE and after_quote:
+            # Doubled quote inside a quoted field
+            field.append(QUOTE)
+            quoted = True
+            after_quote = False
+        elif byte == QUOTE and at_start:
+            quoted = True
+            at_start = False
+        else:
+            field.append(byte)
+            at_start = False
+            after_quote = False
+        pos += 1
+    else:
+        fields.append(field)
+
+    return [normalize_newlines(field.decode('utf-8')) for field in fields], pos
+
+def scan_row(view, pos, size):
+    """Find the field spans of the row starting at pos. Returns (spans, position after the row)."""
+    mapped = view.obj
+    start = pos
+    spans = []
+    while True:
+        if pos < size and view[pos] == QUOTE:
+            # Quoted field: skip doubled quotes up to the closing quote
+            body = pos + 1
+            end = mapped.find(b'"', body)
+            while end != -1 and end + 1 < size and view[end + 1] == QUOTE:
+                end = mapped.find(b'"', end + 2)
+            if end == -1:
+                # Unterminated quote: csv.reader keeps the rest of the file in this field
+                spans += (QUOTED, body, size)
+                return spans, size
+            pos = end + 1
+            if pos < size and view[pos] not in (DELIMITER, CR, LF):
+                # Text after the closing quote; let the slow path parse this row
+                fields, pos = parse_row_slow(view, start, size)
+                return [value for field in fields for value in (DECODED, field, None)], pos
+            spans += (QUOTED, body, end)
+        else:
+            # Unquoted field; quotes inside it are literal
+            match = UNQUOTED_END.search(mapped, pos)
+            end = match.start() if match else size
+            spans += (RAW, pos, end)
+            pos = end
+
+        if pos >= size:
+            return spans, pos
+        byte = view[pos]
+        pos += 1
+        if byte == DELIMITER:
+            if pos >= size:
+                spans += (RAW, pos, pos)
+                return spans, pos
+            continue
+        if byte == CR and pos < size and view[pos] == LF:
+            pos += 1
+        return spans, pos
+
+def iter_rows(filepath):
+    """Yield a row view for every row of a class CSV file, like csv.reader."""
+    with open(filepath, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file
+
+    view = memoryview(mapped)
+    size = len(mapped)
+    match_row = QUOTED_ROW.match
+    pos = 0
+    try:
+        while pos < size:
+            match = match_row(mapped, pos)
+            if match:
+                pos = match.end()
+                yield QuotedRow(view, match.regs)
+                continue
+
+            byte = view[pos]
+            if byte in (CR, LF):
+                # Blank line: csv.reader yields an empty row
+                pos += 2 if byte == CR and pos + 1 < size and view[pos + 1] == LF else 1
+                yield CSVRow(view, [])
+                continue
+
+            spans, pos = scan_row(view, pos, size)
+            yield CSVRow(view, spans)
+    finally:
+        view.release()
+        mapped.close()
+
+def spell_from_fields(fields, filename, row_num):
+    """Build the loaders' spell_data dict from the decoded fields of a row."""
+    return {
+        'level': int(fields[0]) if fields[0].isdigit() else 0,
+        'name': fields[1].strip('"'),
+        'school': fields[2].strip('"'),
+        'casting_time': fields[3].strip('"'),
+        'range': fields[4].strip('"'),
+        'components': fields[5].strip('"'),
+        'duration': fields[6].strip('"'),
+        'description': fields[7].strip('"'),
+        'classes': fields[8].strip('"'),
+        'file': filename,
+        'row': row_num
+    }
+
+def iter_spell_rows(filepath):
+    """Yield spell_data dicts for the rows with all nine columns, as load_csv_spells builds them."""
+    filename = Path(filepath).name
+    for row_num, row in enumerate(iter_rows(filepath), 1):
+        if row.__class__ is QuotedRow or len(row) >= COLUMNS:
+            yield spell_from_fields(row.to_list(), filename, row_num)
+
+def main():
+    """Check the tokenizer against csv.reader and benchmark both loaders."""
+    import csv
+    import timeit
+
+    spells_dir = Path(__file__).parent
+    files = [Path(arg) for arg in sys.argv[1:]] or sorted(spells_dir.glob("*.csv"))
+
+    def csv_loader(filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return [{
+                'level': int(row[0]) if row[0].isdigit() else 0,
+                'name': row[1].strip('"'),
+                'school': row[2].strip('"'),
+                'casting_time': row[3].strip('"'),
+                'range': row[4].strip('"'),
+                'components': row[5].strip('"'),
+                'duration': row[6].strip('"'),
+                'description': row[7].strip('"'),
+                'classes': row[8].strip('"'),
+                'file': filepath.name,
+                'row': row_num
+            } for row_num, row in enumerate(csv.reader(f, delimiter=';'), 1) if len(row) >= 9]
+
+    def csv_column(filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return [row[8] for row in csv.reader(f, delimiter=';') if len(row) >= 9]
+
+    def mmap_column(filepath):
+        return [row[8] for row in iter_rows(filepath) if len(row) >= 9]
+
+    mismatches = 0
+    for filepath in files:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            expected = list(csv.reader(f, delimiter=';'))
+        actual = [row.to_list() for row in iter_rows(filepath)]
+        if actual != expected or csv_loader(filepath) != list(iter_spell_rows(filepath)):
+            mismatches += 1
+            print(f"MISMATCH: {filepath.name}")
+    print(f"Checked {len(files)} files against csv.reader: {mismatches} mismatches")
+
+    size = sum(filepath.stat().st_size for filepath in files)
+    print(f"Benchmark over {len(files)} files, {size / 1024:.0f} KiB (best of 5)")
+    for label, function in (("csv.reader loader", csv_loader), ("mmap loader", lambda path: list(iter_spell_rows(path))),
+                            ("csv.reader, class column", csv_column), ("mmap, class column", mmap_column)):
+        best = min(timeit.repeat(lambda: [function(filepath) for filepath in files], number=10, repeat=5)) / 10
+        print(f"  {label:26} {best * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
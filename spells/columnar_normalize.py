@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Columnar backend for turning class CSV rows into spell JSON.
+
+create_spell_json normalizes one row at a time with Python regex calls. This
+backend loads the rows into an Arrow table and applies the same transforms to
+whole columns with pyarrow.compute kernels: quote stripping, level parsing,
+ritual and concentration detection, leading "(material)" extraction, school
+parsing and the <br> paragraph split. Columns with few distinct values (range,
+duration, components, casting time, class) are transformed once per distinct
+value through dictionary encoding with the row-wise helpers. Records are then
+assembled and passed through extract_structured_fields like the row-wise path.
+
+The output is identical to create_spell_json. Patterns are written for RE2,
+which pyarrow uses: Python's Unicode \\s, \\d and \\w are spelled out as
+explicit classes so both engines match the same characters.
+
+pyarrow is optional. Without it, normalize_spells falls back to the row-wise
+path.
+
+Usage:
+    python columnar_normalize.py              # check against create_spell_json
+    python columnar_normalize.py --rows 100000  # and benchmark both at that many rows
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional dependency
+    pa = None
+    pc = None
+
+from class_csv import COLUMNS, iter_rows
+from convert_extra_spells import (
+    create_spell_json,
+    parse_components_from_csv,
+    sanitize_class_name,
+    infer_source_from_class,
+    transform_casting_time_and_description,
+    transform_duration,
+    transform_range,
+)
+from spell_extraction import extract_structured_fields
+
+CSV_FIELDS = ['level', 'name', 'school', 'casting_time', 'range', 'components', 'duration', 'description', 'classes']
+
+# Python's str.isspace() characters (what \s and str.strip() use), and \d / \w, as RE2 classes
+PY_WHITESPACE = ('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006'
+                 '\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+S = r'[\t\n\x0b\x0c\r\x1c-\x1f \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]'
+NOT_S = '[^' + S[1:]
+D = r'\p{Nd}'
+W = r'[\p{L}\p{N}_]'
+
+RITUAL_TAG = rf'(?i){S}*\(ritual\){S}*'
+LEADING_MATERIAL = r'^\((?P<material>[^)]+)\)'
+LEVEL_ONLY = rf'(?i)^{D}+(?:st|nd|rd|th)$'
+LEVEL_SCHOOL = rf'(?i){D}+(?:st|nd|rd|th)(?:-|{S})+level{S}+(?P<school>{W}+)'
+SCHOOL_WORD = rf'(?i)(?P<school>{W}+)(?:{S}+cantrip|{S}+level)'
+FIRST_WORD = rf'^{S}*(?P<word>{NOT_S}+)'
+BR_TAG = rf'(?i)<br{S}*/?>'
+# 'concentration' in duration.lower(): only ASCII capitals lower to these letters
+# (utf8_lower also maps e.g. İ to i, which str.lower() doesn't)
+CONCENTRATION = ''.join(f'[{char}{char.upper()}]' for char in 'concentration')
+
+def available():
+    """True when pyarrow is installed."""
+    return pa is not None
+
+def strip(array):
+    """Vectorized str.strip()."""
+    return pc.utf8_trim(array, characters=PY_WHITESPACE)
+
+def extracted(array, pattern, field):
+    """Extract a named group; rows that don't match are null."""
+    return pc.struct_field(pc.extract_regex(array, pattern=pattern), field)
+
+def map_distinct(array, function):
+    """Apply a Python function once per distinct value; returns a list aligned with the rows."""
+    encoded = pc.dictionary_encode(array)
+    if isinstance(encoded, pa.ChunkedArray):
+        encoded = encoded.combine_chunks()
+    values = [function(value) for value in encoded.dictionary.to_pylist()]
+    return [values[index] for index in encoded.indices.to_pylist()]
+
+def on_distinct(array, kernel):
+    """Run a vectorized kernel over the distinct values only, then expand back to the rows."""
+    encoded = pc.dictionary_encode(array)
+    if isinstance(encoded, pa.ChunkedArray):
+        encoded = encoded.combine_chunks()
+    return pc.take(kernel(encoded.dictionary), encoded.indices)
+
+def table_from_rows(spell_rows):
+    """Build an Arrow table from spell_data dicts (the loaders' output)."""
+    columns = {field: [row[field] for row in spell_rows] for field in CSV_FIELDS + ['file', 'row']}
+    return pa.table(columns)
+
+def load_class_table(csv_files):
+    """
+    Load class CSVs straight into an Arrow table with the loaders' columns,
+    stripping quotes and parsing levels as column operations.
+    """
+    raw = [[] for _ in CSV_FIELDS]
+    files = []
+    row_numbers = []
+    for csv_file in csv_files:
+        csv_file = Path(csv_file)
+        for row_num, row in enumerate(iter_rows(csv_file), 1):
+            if len(row) < COLUMNS:
+                continue
+            for column, value in zip(raw, row.to_list()):
+                column.append(value)
+            files.append(csv_file.name)
+            row_numbers.append(row_num)
+
+    level_text = pa.array(raw[0], pa.string())
+    columns = {'level': pc.if_else(pc.utf8_is_digit(level_text), level_text, '0').cast(pa.int64())}
+    for field, values in zip(CSV_FIELDS[1:], raw[1:]):
+        columns[field] = pc.utf8_trim(pa.array(values, pa.string()), characters='"')
+    columns['file'] = pa.array(files, pa.string())
+    columns['row'] = pa.array(row_numbers, pa.int64())
+    return pa.table(columns)
+
+def title(array):
+    """str.title() per distinct value (utf8_title differs for titlecase letters and ß); nulls stay null."""
+    encoded = pc.dictionary_encode(array)
+    dictionary = pa.array([value.title() for value in encoded.dictionary.to_pylist()], pa.string())
+    return pc.take(dictionary, encoded.indices)
+
+def parse_schools(school):
+    """Vectorized parse_school_from_csv."""
+    level_school = title(extracted(school, LEVEL_SCHOOL, 'school'))
+    school_word = title(extracted(school, SCHOOL_WORD, 'school'))
+    first_word = extracted(school, FIRST_WORD, 'word')
+    first = pc.if_else(pc.match_substring_regex(first_word, LEVEL_ONLY), '', title(first_word))
+
+    parsed = pc.coalesce(level_school, school_word, first, school)
+    is_level = pc.match_substring_regex(strip(school), LEVEL_ONLY)
+    return pc.if_else(pc.or_(pc.equal(school, ''), is_level), '', parsed)
+
+def split_paragraphs(descriptions):
+    """Vectorized convert_description_to_array; returns one list of paragraphs per row."""
+    parts = pc.split_pattern_regex(descriptions, pattern=BR_TAG)
+    parents = pc.list_parent_indices(parts).to_pylist()
+    flat = strip(pc.list_flatten(parts)).to_pylist()
+
+    paragraphs = [[] for _ in range(len(descriptions))]
+    for parent, part in zip(parents, flat):
+        if part:
+            paragraphs[parent].append(part)
+    return paragraphs
+
+def normalize_table(table, unioned_classes=None):
+    """Turn a table of CSV spell rows into spell JSON records, like create_spell_json row by row."""
+    name = table['name'].combine_chunks()
+    description = table['description'].combine_chunks()
+    duration = table['duration'].combine_chunks()
+
+    clean_names = strip(pc.replace_substring_regex(name, pattern=RITUAL_TAG, replacement='')).to_pylist()
+    rituals = pc.match_substring_regex(name, RITUAL_TAG).to_pylist()
+    concentration = pc.match_substring_regex(duration, CONCENTRATION).to_pylist()
+
+    # Leading "(material)" in the stripped description; other descriptions are left as they are
+    stripped = strip(description)
+    leading = extracted(stripped, LEADING_MATERIAL, 'material')
+    has_material = pc.is_valid(leading)
+    materials = pc.if_else(has_material, strip(leading), '').to_pylist()
+    remainder = strip(pc.replace_substring_regex(stripped, pattern=LEADING_MATERIAL, replacement='', max_replacements=1))
+    clean_descriptions = pc.if_else(has_material, remainder, description).to_pylist()
+
+    # Few distinct school strings: parse each once
+    schools = on_distinct(table['school'], parse_schools).to_pylist()
+
+    components = map_distinct(table['components'], parse_components_from_csv)
+    ranges = map_distinct(table['range'], transform_range)
+    durations = map_distinct(duration, transform_duration)
+    class_info = map_distinct(table['classes'], lambda text: (infer_source_from_class(text), sanitize_class_name(text)))
+    # Reaction casting times prepend a line to the description; (casting time, line or None) per distinct value
+    casting = map_distinct(table['casting_time'], lambda text: transform_casting_time_and_description(text, None))
+
+    descriptions = []
+    for (_, reaction), clean in zip(casting, clean_descriptions):
+        if reaction is not None:
+            descriptions.append(f"{reaction}\n\n{clean}" if clean else reaction)
+        else:
+            descriptions.append(clean)
+    paragraphs = split_paragraphs(pa.array(descriptions, pa.string()))
+
+    levels = table['level'].to_pylist()
+    files = table['file'].to_pylist()
+    rows = table['row'].to_pylist()
+
+    records = []
+    for i in range(table.num_rows):
+        school_name = schools[i]
+        component_list, material_from_components = components[i]
+        material = materials[i] or material_from_components
+        source, class_name = class_info[i]
+        # Same keys in the same order as create_spell_json; school and material are the only optional ones
+        spell_json = {'name': clean_names[i], 'level': levels[i]}
+        if school_name:
+            spell_json['school'] = {"index": school_name.lower(), "name": school_name}
+        spell_json['casting_time'] = casting[i][0]
+        spell_json['range'] = ranges[i]
+        spell_json['components'] = component_list
+        spell_json['duration'] = durations[i]
+        spell_json['desc'] = paragraphs[i]
+        spell_json['classes'] = unioned_classes[i] if unioned_classes and unioned_classes[i] else [class_name]
+        spell_json['ritual'] = rituals[i]
+        spell_json['concentration'] = concentration[i]
+        if material:
+            spell_json['material'] = material
+        spell_json['source'] = source
+        spell_json['source_file'] = files[i]
+        spell_json['source_row'] = rows[i]
+        records.append(extract_structured_fields(spell_json))
+    return records
+
+def normalize_spells(spell_rows, unioned_classes=None):
+    """
+    Convert spell_data dicts to spell JSON, with the columnar backend when
+    pyarrow is installed and row by row otherwise.
+    unioned_classes, if given, holds each row's unioned class list (or None).
+    """
+    if not spell_rows:
+        return []
+    if not available():
+        unioned = unioned_classes or [None] * len(spell_rows)
+        return [create_spell_json(row, classes) for row, classes in zip(spell_rows, unioned)]
+    return normalize_table(table_from_rows(spell_rows), unioned_classes)
+
+def main():
+    """Check the columnar backend against create_spell_json, and optionally benchmark both."""
+    from class_csv import iter_spell_rows
+
+    parser = argparse.ArgumentParser(description="Check (and benchmark) the columnar normalization backend.")
+    parser.add_argument('--rows', type=int, help="benchmark both paths on the corpus repeated to this many rows")
+    args = parser.parse_args()
+
+    if not available():
+        print("pyarrow is not installed; normalize_spells uses the row-wise path")
+        return
+
+    csv_files = sorted(Path(__file__).parent.glob("*.csv"))
+    spell_rows = [row for csv_file in csv_files for row in iter_spell_rows(csv_file)]
+
+    table = load_class_table(csv_files)
+    same_table = table.equals(table_from_rows(spell_rows))
+    expected = [create_spell_json(row) for row in spell_rows]
+    actual = normalize_table(table)
+    mismatches = [row for row, a, b in zip(spell_rows, expected, actual) if a != b]
+    print(f"Loaded {len(spell_rows)} rows from {len(csv_files)} files; tables {'match' if same_table else 'DIFFER'}")
+    print(f"Normalized records: {len(mismatches)} mismatches")
+    for row in mismatches[:5]:
+        print(f"  {row['file']}:{row['row']} {row['name']}")
+
+    if args.rows:
+        rows = (spell_rows * (args.rows // len(spell_rows) + 1))[:args.rows]
+        start = time.perf_counter()
+        [create_spell_json(row) for row in rows]
+        row_wise = time.perf_counter() - start
+
+        start = time.perf_counter()
+        normalize_spells(rows)
+        columnar = time.perf_counter() - start
+        print(f"{len(rows)} rows: row-wise {row_wise:.2f}s, columnar {columnar:.2f}s")
+
+if __name__ == "__main__":
+    main()
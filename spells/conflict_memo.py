@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Persistent record of how multi-copy spells were resolved.
+
+The same spell appears in several class CSVs, and convert_extra_spells picks
+one canonical copy per spell. conflict_resolutions.json keeps that decision
+for every multi-copy spell, keyed by spell id:
+
+    "absorb-elements": {
+      "name": "Absorb Elements",
+      "hash": "<content hash of all copies>",
+      "copy": 2,                    # index of the chosen copy
+      "file": "Druid.csv",          # that copy's file
+      "values": {"range": "Self"},  # canonical value of each field that differs
+      "conflicts": ["range"]
+    }
+
+When a later run sees the same copies (same hash), it reuses the entry and
+skips comparing them; only spells whose copies are new or changed are
+compared and reported. Until a spell's copies change, two hand edits hold:
+setting "copy" to another index picks that copy (its values replace the
+recorded ones, and "file" and "values" are rewritten to match), and changing
+a field in "values" overrides that field on whichever copy is chosen. Delete
+the file to recheck everything.
+
+Usage:
+    python conflict_memo.py    # list the recorded conflicts
+"""
+
+import json
+from pathlib import Path
+
+from spell_diff import content_hash
+from spell_store import spell_id
+
+RESOLUTIONS_FILENAME = "conflict_resolutions.json"
+RESOLUTIONS_VERSION = 2
+
+# Everything a resolution depends on: the compared fields, plus the classes and
+# file the copy choice looks at
+COPY_FIELDS = ['level', 'school', 'casting_time', 'range', 'components', 'duration', 'description', 'classes', 'file']
+
+def group_hash(spell_copies):
+    """Content hash of a spell's copies, in the order they were loaded."""
+    return content_hash([[copy[field] for field in COPY_FIELDS] for copy in spell_copies])
+
+def load_resolutions(spells_dir):
+    """Load the recorded resolutions, or an empty dict."""
+    try:
+        with open(Path(spells_dir) / RESOLUTIONS_FILENAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('spells', {}) if data.get('version') == RESOLUTIONS_VERSION else {}
+
+def save_resolutions(spells_dir, resolutions):
+    """Write the resolutions, sorted by spell id, if they changed. Returns True if written."""
+    path = Path(spells_dir) / RESOLUTIONS_FILENAME
+    data = {'version': RESOLUTIONS_VERSION, 'spells': dict(sorted(resolutions.items()))}
+    text = json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.write_text(text, encoding='utf-8')
+    return True
+
+def resolution_key(spell_name):
+    """Key of a spell's entry: its spell id, so renamed capitalizations share one entry."""
+    return spell_id(spell_name)
+
+def make_resolution(spell_name, spell_copies, index, differences, chosen=None):
+    """
+    Record the chosen copy (by index) and the canonical values of the fields that
+    differ: the chosen copy's own, or those of chosen (the copy with overrides applied).
+    """
+    chosen = chosen or spell_copies[index]
+    return {
+        'name': spell_name,
+        'hash': group_hash(spell_copies),
+        'copy': index,
+        'file': spell_copies[index]['file'],
+        'values': {field: chosen[field] for field in differences},
+        'conflicts': list(differences)
+    }
+
+def apply_resolution(spell_copies, resolution):
+    """
+    Return the canonical copy a recorded resolution describes, or None if it
+    no longer applies to these copies.
+
+    Recorded values that still equal the recorded copy's own (the file named in
+    the entry) were derived, not edited, so a different "copy" replaces them;
+    values that differ from it are hand edits and apply to any chosen copy.
+    """
+    index = resolution.get('copy')
+    if resolution.get('hash') != group_hash(spell_copies) or not isinstance(index, int) or not 0 <= index < len(spell_copies):
+        return None
+    recorded = next((copy for copy in spell_copies if copy['file'] == resolution.get('file')), None)
+    overrides = {field: value for field, value in resolution.get('values', {}).items()
+                 if recorded is None or recorded.get(field) != value}
+    return {**spell_copies[index], **overrides}
+
+def main():
+    """List the recorded conflicts."""
+    spells_dir = Path(__file__).parent
+    resolutions = load_resolutions(spells_dir)
+    conflicted = [entry for entry in resolutions.values() if entry.get('conflicts')]
+
+    print(f"{len(resolutions)} multi-copy spells recorded, {len(conflicted)} with conflicts")
+    for entry in conflicted:
+        print(f"  {entry['name']}: {', '.join(entry['conflicts'])} (from {entry['file']})")
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,28 @@ Handles differences between copies of the same spell and groups by source materi
 """
 
 import json
-import csv
 import os
 import re
 from pathlib import Path
 from collections import defaultdict
 
+from class_csv import iter_spell_rows
+from spell_store import build_store_from_outputs, STORE_FILENAME
+from spell_diff import write_manifest, MANIFEST_FILENAME
+from conflict_memo import (load_resolutions, save_resolutions, make_resolution, apply_resolution,
+                           resolution_key, RESOLUTIONS_FILENAME)
+from spell_extraction import extract_structured_fields
+from source_classifier import classifier
+
 def clean_spell_name(name):
     """Clean spell name by removing ritual tags and extra whitespace."""
     if not name:
         return ""
     
-    # Remove ritual tags - case insensitive
-    cleaned = re.sub(r'\s*\(ritual\)\s*', '', name, flags=re.IGNORECASE)
+    # Remove ritual tags - case insensitive. A match starts at the beginning of a whitespace
+    # run, so long runs of spaces don't backtrack quadratically, or right at a tag that
+    # follows whitespace an earlier match consumed ("Foo (ritual) (ritual)")
+    cleaned = re.sub(r'(?:(?<!\s)\s*|(?<=\s))\(ritual\)\s*', '', name, flags=re.IGNORECASE)
     
     # Clean up extra whitespace
     cleaned = cleaned.strip()
@@ -26,7 +35,7 @@ def clean_spell_name(name):
 
 def extract_ritual_from_name(name):
     """Extract ritual flag from spell name."""
-    return bool(re.search(r'\s*\(ritual\)\s*', name, flags=re.IGNORECASE))
+    return bool(re.search(r'\(ritual\)', name, flags=re.IGNORECASE))
 
 def extract_concentration_from_duration(duration):
     """Extract concentration flag from duration field."""
@@ -62,13 +71,14 @@ def parse_school_from_csv(school_text):
         return ""
     
     # Try to extract school from "Xth level School" or "Xth-level School" pattern first (most specific)
-    level_school_match = re.search(r'\d+(st|nd|rd|th)[-\s]+level\s+(\w+)', school_text, re.IGNORECASE)
+    # (?<!\d) and \b only try each digit run / word once: same matches, linear time
+    level_school_match = re.search(r'(?<!\d)\d+(st|nd|rd|th)[-\s]+level\s+(\w+)', school_text, re.IGNORECASE)
     if level_school_match:
         return level_school_match.group(2).title()
     
     # Extract school name from patterns like:
     # "Conjuration cantrip", "1st level Abjuration"
-    school_match = re.search(r'(\w+)(?:\s+cantrip|\s+level)', school_text, re.IGNORECASE)
+    school_match = re.search(r'\b(\w+)(?:\s+cantrip|\s+level)', school_text, re.IGNORECASE)
     if school_match:
         return school_match.group(1).title()
     
@@ -84,39 +94,9 @@ def parse_school_from_csv(school_text):
 
 def infer_source_from_class(class_text):
     """Infer source material from class field."""
-    if not class_text:
-        return "Unknown"
-    
-    # Common source abbreviations (only these are actual source books)
-    source_mapping = {
-        'TCE': 'TashasCauldron',
-        'SCAG': 'SwordCoast',
-        'XGE': 'XanatharsGuide',
-        'FTD': 'FizbansTreasury',
-        'SCC': 'Strixhaven',
-        'VRGR': 'VanRichtens',
-        'WBW': 'WildBeyondWitchlight',
-        'EGW': 'ExplorersGuide',
-        'MTF': 'MordenkainensTome',
-        'GGR': 'GuildmastersGuide',
-        'AI': 'AcquisitionsIncorporated',
-        'LLK': 'LocathahRising',
-        'BMT': 'BigbysManifesto',
-        'SAC': 'SageAdviceCompendium'
-    }
-    
-    # Look for source abbreviations in parentheses
-    source_match = re.search(r'\(([^)]+)\)', class_text)
-    if source_match:
-        source_abbr = source_match.group(1).strip()
-        # Only return the source if it's a known source abbreviation
-        if source_abbr in source_mapping:
-            return source_mapping[source_abbr]
-        # Otherwise, it's likely a subclass name, treat as Core
-        else:
-            return "Core"
-    
-    return "Core"  # Default for spells without source abbreviation
+    # Sourcebook abbreviations and subclass names are resolved by the alias table;
+    # unrecognized tokens fall back to Core and are listed in classifier.report()
+    return classifier.classify(class_text)['source']
 
 def parse_components_from_csv(components_text):
     """
@@ -131,11 +111,14 @@ def parse_components_from_csv(components_text):
     
     # Use regex to extract material component with parentheses
     # Pattern: M followed by optional space, then parentheses with content
-    material_match = re.search(r'M\s*\(([^)]+)\)', components_text)
+    # Nothing after the last ")" can match; cutting it off keeps unbalanced
+    # input like "M (M (M (..." from rescanning to the end from every "M ("
+    end = components_text.rfind(')') + 1
+    material_match = re.search(r'M\s*\(([^)]+)\)', components_text[:end])
     if material_match:
         material_description = material_match.group(1).strip()
         # Remove the entire M (...) part from the components text
-        components_text = re.sub(r'M\s*\([^)]+\)', 'M', components_text)
+        components_text = re.sub(r'M\s*\([^)]+\)', 'M', components_text[:end]) + components_text[end:]
     
     # Now split by comma and clean up
     components = [comp.strip() for comp in components_text.split(',')]
@@ -145,16 +128,7 @@ def parse_components_from_csv(components_text):
 
 def sanitize_class_name(class_text):
     """Extract base class name from class field, removing subclass and source info."""
-    if not class_text:
-        return ""
-    
-    # Extract the base class name (before any parentheses)
-    base_class = class_text.split('(')[0].strip()
-    
-    # Clean up any extra whitespace or special characters
-    base_class = base_class.strip()
-    
-    return base_class
+    return classifier.classify(class_text)['class']
 
 def union_class_names(class_lists):
     """Union and sanitize class names from multiple spell copies."""
@@ -192,29 +166,8 @@ def load_srd_spells(json_file):
 
 def load_csv_spells(csv_file):
     """Load spell data from a CSV file."""
-    csv_spells = []
-    
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f, delimiter=';')
-            
-            for row_num, row in enumerate(reader, 1):
-                if len(row) >= 9:  # Ensure we have all required columns
-                    spell_data = {
-                        'level': int(row[0]) if row[0].isdigit() else 0,
-                        'name': row[1].strip('"'),
-                        'school': row[2].strip('"'),
-                        'casting_time': row[3].strip('"'),
-                        'range': row[4].strip('"'),
-                        'components': row[5].strip('"'),
-                        'duration': row[6].strip('"'),
-                        'description': row[7].strip('"'),
-                        'classes': row[8].strip('"'),
-                        'file': csv_file.name,
-                        'row': row_num
-                    }
-                    csv_spells.append(spell_data)
-        
+        csv_spells = list(iter_spell_rows(csv_file))
         print(f"Loaded {len(csv_spells)} spells from {csv_file.name}")
         return csv_spells
     
@@ -310,8 +263,10 @@ def transform_duration(duration_text):
     if not duration_text:
         return duration_text
     
-    # Match "Instantaneous or X (see below)" pattern
-    match = re.match(r'^Instantaneous\s+or\s+([^(]+)\s*\(see below\)$', duration_text.strip(), re.IGNORECASE)
+    # Match "Instantaneous or X (see below)" pattern. X starts at its first
+    # non-space character and keeps its trailing spaces (stripped below), so
+    # no run of spaces can be split between two quantifiers
+    match = re.match(r'^Instantaneous\s+or\s+([^\s(][^(]*)\(see below\)$', duration_text.strip(), re.IGNORECASE)
     if match:
         return match.group(1).strip() + '*'
     
@@ -420,7 +375,8 @@ def create_spell_json(spell_data, unioned_classes=None):
     # Remove None values
     spell_json = {k: v for k, v in spell_json.items() if v is not None}
     
-    return spell_json
+    # Move higher-level text, damage dice and saves into SRD-shaped fields
+    return extract_structured_fields(spell_json)
 
 def main():
     """Main function to process extra spells."""
@@ -434,7 +390,7 @@ def main():
         return
     
     # Find all CSV files
-    csv_files = list(spells_dir.glob("*.csv"))
+    csv_files = sorted(spells_dir.glob("*.csv"))
     
     # Collect all extra spells
     all_extra_spells = []
@@ -457,9 +413,14 @@ def main():
     
     print(f"Found {len(spells_by_name)} unique extra spells")
     
-    # Process each unique spell
-    processed_spells = []
+    # Pick one copy of each unique spell; normalization runs over all of them at once.
+    # Spells whose copies are unchanged since the last run reuse the recorded resolution.
+    resolutions = load_resolutions(spells_dir)
+    next_resolutions = {}
+    chosen_copies = []
+    chosen_classes = []
     warnings = []
+    reused = 0
     
     for spell_name, spell_copies in spells_by_name.items():
         # Union all class names from all copies
@@ -467,6 +428,18 @@ def main():
         unioned_classes = union_class_names(all_class_texts)
         
         if len(spell_copies) > 1:
+            key = resolution_key(spell_name)
+            resolution = resolutions.get(key)
+            chosen_copy = apply_resolution(spell_copies, resolution) if resolution else None
+            if chosen_copy is not None:
+                reused += 1
+                # Rewritten from the copy actually chosen, so an edited "copy" is recorded in full
+                next_resolutions[key] = make_resolution(spell_name, spell_copies, resolution['copy'],
+                                                        resolution.get('conflicts', []), chosen_copy)
+                chosen_copies.append(chosen_copy)
+                chosen_classes.append(unioned_classes)
+                continue
+            
             # Check for differences (excluding classes since they're expected to differ)
             differences = compare_spell_copies(spell_copies)
             if differences:
@@ -480,15 +453,24 @@ def main():
                 print(warning)
             
             # Choose the "best" copy (prefer Core over expansions, then first occurrence)
-            best_copy = spell_copies[0]  # Default to first
-            for copy in spell_copies:
+            best_index = 0  # Default to first
+            for index, copy in enumerate(spell_copies):
                 if 'Core' in copy['classes'] or '(' not in copy['classes']:
-                    best_copy = copy
+                    best_index = index
                     break
             
-            processed_spells.append(create_spell_json(best_copy, unioned_classes))
+            next_resolutions[resolution_key(spell_name)] = make_resolution(spell_name, spell_copies, best_index, differences)
+            chosen_copies.append(spell_copies[best_index])
         else:
-            processed_spells.append(create_spell_json(spell_copies[0], unioned_classes))
+            chosen_copies.append(spell_copies[0])
+        chosen_classes.append(unioned_classes)
+    
+    if save_resolutions(spells_dir, next_resolutions):
+        print(f"Updated {RESOLUTIONS_FILENAME}")
+    
+    # Columnar backend when pyarrow is installed, create_spell_json row by row otherwise
+    from columnar_normalize import normalize_spells
+    processed_spells = normalize_spells(chosen_copies, chosen_classes)
     
     # Group spells by source
     spells_by_source = defaultdict(list)
@@ -513,10 +495,24 @@ def main():
         
         print(f"Created {filename} with {len(spells)} spells")
     
+    # Pack all generated spell files into the mmap-able store for tools
+    store_count = build_store_from_outputs(spells_dir)
+    print(f"Created {STORE_FILENAME} with {store_count} spells")
+    
+    # Record per-source Merkle trees so later builds can be diffed against this one
+    write_manifest(spells_dir)
+    print(f"Created {MANIFEST_FILENAME}")
+    
     # Summary
     print(f"\n=== SUMMARY ===")
     print(f"Total unique extra spells: {len(processed_spells)}")
     print(f"Warnings generated: {len(warnings)}")
+    print(f"Known resolutions reused: {reused}")
+    
+    unknown_tokens = classifier.report()
+    print(f"Unknown class tokens: {len(unknown_tokens)}")
+    for line in unknown_tokens:
+        print(f"  - {line}")
     print(f"Files created: {len(spells_by_source)}")
     
     for source, spells in spells_by_source.items():
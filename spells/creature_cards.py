@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Precompute creature cards for the frontend's creature mode.
+
+CreatureToCardDataTransformer builds the spec rows, ability modifiers and
+stat-block HTML for every SRD monster on every load, and then each card goes
+through the DOM reflow. This stage does the same formatting once at build
+time and writes cards2/public/data/creature-cards.json. Each entry keeps the
+fields creature filtering needs (name, size, type, challenge rating), plus
+the finished card fields and fit hints per card size. Hints for stat blocks
+that need continuation cards also list "breaks": the indices of the body
+paragraphs that start a new card.
+
+The formatting mirrors Creature.js and CreatureToCardDataTransformer.js;
+keep them in step.
+"""
+
+import json
+import math
+import re
+from pathlib import Path
+
+from spell_fitting import CARD_METRICS, fit_body, measure_paragraphs, split_body
+
+MONSTERS_FILE = "data/5e-SRD-Monsters.json"
+CREATURE_CARDS_FILE = "data/creature-cards.json"
+
+# Creature cards have two spec rows: AC/HP/speed and the ability modifiers
+CREATURE_HEADER_ROWS = 2
+
+CR_FRACTIONS = {0.125: '⅛', 0.25: '¼', 0.5: '½', 0.75: '¾'}
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SKILL_PREFIX = re.compile(r'^Skill:\s*', re.IGNORECASE)
+
+def js_str(value):
+    """Format a number the way JavaScript's toString does (2, not 2.0)."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def modifier(score):
+    """Ability modifier with a sign, e.g. +2 or -1."""
+    mod = math.floor((score - 10) / 2)
+    return f"+{mod}" if mod >= 0 else str(mod)
+
+def parse_ac(ac_data):
+    """Armor class as a string (first entry of the SRD list)."""
+    if isinstance(ac_data, list) and ac_data:
+        first = ac_data[0]
+        return js_str(first.get('value', '')) if isinstance(first, dict) else js_str(first)
+    return js_str(ac_data) if ac_data is not None else ''
+
+def parse_speed(speed_data):
+    """Speed object as 'walk 30 ft., fly 60 ft.'."""
+    if isinstance(speed_data, str):
+        return speed_data
+    if isinstance(speed_data, dict):
+        return ', '.join(f"{mode} {speed_data[mode]}" for mode in ('walk', 'swim', 'fly', 'climb', 'burrow') if speed_data.get(mode))
+    return ''
+
+def parse_senses(senses_data):
+    """Senses object as a string, passive Perception first."""
+    if isinstance(senses_data, str):
+        return senses_data
+    if isinstance(senses_data, dict):
+        senses = []
+        if senses_data.get('passive_perception'):
+            senses.append(f"passive Perception {js_str(senses_data['passive_perception'])}")
+        senses += [f"{key} {js_str(value)}" for key, value in senses_data.items() if key != 'passive_perception' and value]
+        return ', '.join(senses)
+    return ''
+
+def formatted_cr(challenge_rating):
+    """Challenge rating with fraction characters."""
+    try:
+        cr = float(challenge_rating)
+    except (TypeError, ValueError):
+        return '0'
+    if cr.is_integer():
+        return js_str(cr)
+    for value, fraction in CR_FRACTIONS.items():
+        if abs(cr - value) < 0.001:
+            return fraction
+    return js_str(cr)
+
+def named_entries(title, entries):
+    """Section header plus one '<strong>Name.</strong> text' paragraph per entry."""
+    paragraphs = []
+    for entry in entries or []:
+        if entry.get('name') and entry.get('desc'):
+            desc = ' '.join(entry['desc']) if isinstance(entry['desc'], list) else entry['desc']
+            paragraphs.append(f"<p><strong>{entry['name']}.</strong> {desc}</p>")
+    if paragraphs:
+        paragraphs.insert(0, f'<p class="section-header"><strong>{title}</strong></p>')
+    return paragraphs
+
+def body_paragraphs(monster):
+    """Build the stat-block body as a list of HTML paragraphs."""
+    paragraphs = []
+    for label, key in (('Damage Immunities', 'damage_immunities'), ('Damage Resistances', 'damage_resistances'),
+                       ('Damage Vulnerabilities', 'damage_vulnerabilities')):
+        if monster.get(key):
+            paragraphs.append(f"<p><strong>{label}:</strong> {', '.join(monster[key])}</p>")
+    if monster.get('condition_immunities'):
+        immunities = ', '.join(imm['name'] if isinstance(imm, dict) else imm for imm in monster['condition_immunities'])
+        paragraphs.append(f"<p><strong>Condition Immunities:</strong> {immunities}</p>")
+
+    senses = parse_senses(monster.get('senses'))
+    if senses:
+        paragraphs.append(f"<p><strong>Senses:</strong> {senses}</p>")
+    if monster.get('languages'):
+        paragraphs.append(f"<p><strong>Languages:</strong> {monster['languages']}</p>")
+
+    saves, skills = [], []
+    for proficiency in monster.get('proficiencies', []):
+        name = (proficiency.get('proficiency') or {}).get('name')
+        if not name:
+            continue
+        bonus = js_str(proficiency.get('value') or 0)
+        if 'Saving Throw' in name:
+            ability = name.split(':')[1].strip() if ':' in name else ''
+            saves.append(f"{ability.upper()} +{bonus}")
+        else:
+            skills.append(f"{SKILL_PREFIX.sub('', name)} +{bonus}")
+    if saves:
+        paragraphs.append(f"<p><strong>Saving Throws:</strong> {', '.join(saves)}</p>")
+    if skills:
+        paragraphs.append(f"<p><strong>Skills:</strong> {', '.join(skills)}</p>")
+
+    traits = monster.get('special_abilities') if isinstance(monster.get('special_abilities'), list) else monster.get('traits')
+    paragraphs += named_entries('Traits', traits)
+    paragraphs += named_entries('Actions', monster.get('actions'))
+    paragraphs += named_entries('Reactions', monster.get('reactions'))
+    paragraphs += named_entries('Legendary Actions', monster.get('legendary_actions'))
+    return paragraphs
+
+def creature_card(monster):
+    """Build the CardData fields for one monster."""
+    hit_points = monster.get('hit_points') or 0
+    abilities = {key: monster.get(name) or 10 for key, name in (
+        ('str', 'strength'), ('dex', 'dexterity'), ('con', 'constitution'),
+        ('int', 'intelligence'), ('wis', 'wisdom'), ('cha', 'charisma'))}
+
+    specs = [
+        [
+            {'label': 'AC', 'value': parse_ac(monster.get('armor_class'))},
+            {'label': 'HP', 'value': f"{js_str(hit_points)} ({monster.get('hit_dice', '')})"},
+            {'label': 'SPEED', 'value': parse_speed(monster.get('speed'))}
+        ],
+        [{'label': key.upper(), 'value': modifier(score)} for key, score in abilities.items()]
+    ]
+
+    return {
+        'title': monster['name'].strip(),
+        'leftIndicator': '',
+        'rightIndicator': formatted_cr(monster.get('challenge_rating')),
+        'specs': specs,
+        'body': ''.join(body_paragraphs(monster)),
+        'bottomLeft': f"{monster.get('size', '')} {monster.get('type', '')}",
+        'bottomRight': monster.get('alignment', '')
+    }
+
+def creature_fit_hints(paragraphs):
+    """Fit hints per card size for HTML body paragraphs, with paragraph breaks for split cards."""
+    measured = measure_paragraphs([[TAG_PATTERN.sub('', paragraph)] for paragraph in paragraphs])
+    hints = {}
+    for card_size in CARD_METRICS:
+        hint = fit_body(measured, card_size, CREATURE_HEADER_ROWS)
+        if hint['cards'] > 1:
+            hint['breaks'] = split_body(measured, card_size, hint, CREATURE_HEADER_ROWS)
+        hints[card_size] = hint
+    return hints
+
+def build_creature_cards(public_dir):
+    """Write the precomputed creature cards. Returns the entries."""
+    public_dir = Path(public_dir)
+    with open(public_dir / MONSTERS_FILE, 'r', encoding='utf-8') as f:
+        monsters = json.load(f)
+
+    entries = []
+    for monster in monsters:
+        if not monster.get('name'):
+            continue
+        entries.append({
+            'name': monster['name'],
+            'size': monster.get('size', ''),
+            'type': monster.get('type', ''),
+            'alignment': monster.get('alignment', ''),
+            'challenge_rating': monster.get('challenge_rating', 0),
+            'card': creature_card(monster),
+            'fit': creature_fit_hints(body_paragraphs(monster))
+        })
+
+    with open(public_dir / CREATURE_CARDS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, separators=(',', ':'))
+    return entries
+
+def main():
+    """Build creature cards for the frontend's public data directory."""
+    public_dir = Path(__file__).parent.parent / 'cards2' / 'public'
+    entries = build_creature_cards(public_dir)
+
+    print(f"Created {CREATURE_CARDS_FILE} with {len(entries)} creatures")
+    for card_size in CARD_METRICS:
+        split = [entry for entry in entries if entry['fit'][card_size]['cards'] > 1]
+        continuations = sum(entry['fit'][card_size]['cards'] - 1 for entry in split)
+        print(f"  {card_size:13} {len(split):4} split into {continuations} continuation cards")
+
+if __name__ == "__main__":
+    main()
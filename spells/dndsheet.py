@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+One entry point for the spell card tools.
+
+    dndsheet build [STAGE ...]     run the build graph (build_pipeline)
+    dndsheet check                 check the built data the frontend will load
+    dndsheet diff OLD_DIR NEW_DIR  diff two builds (spell_diff)
+    dndsheet search QUERY          search spell names
+    dndsheet render [FILTERS]      write printable HTML sheets (card_service)
+    dndsheet serve                 run the local card service
+
+Only argparse is imported up front; each subcommand imports the modules it
+needs when it runs. search answers from the prebuilt search index and the
+mmap'ed spell store (spells.store) instead of loading and merging the JSON
+sources, so interactive lookups start in a few tens of milliseconds.
+
+Usage:
+    python dndsheet.py COMMAND [ARGS]
+"""
+
+import argparse
+import os
+import sys
+
+SPELLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLIC_DIR = os.path.join(SPELLS_DIR, '..', 'cards2', 'public')
+SEARCH_INDEX = os.path.join(PUBLIC_DIR, 'data', 'search-index.json')
+
+def level_text(level):
+    """Level as the cards print it: 'Cantrip' or '3rd level'."""
+    level = int(level or 0)
+    if level == 0:
+        return 'Cantrip'
+    suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(level, 'th')
+    return f"{level}{suffix} level"
+
+def command_build(args):
+    """Run the build graph."""
+    from build_pipeline import run_pipeline
+
+    results = run_pipeline(args.stages, args.jobs, args.force, args.verbose)
+    return 1 if any(state in ('failed', 'blocked') for state in results.values()) else 0
+
+def command_check(args):
+    """Check that the published data is complete and matches the pipeline outputs."""
+    from pathlib import Path
+
+    from build_pipeline import SPELL_SOURCES, check_artifacts
+
+    problems = []
+    data_dir = Path(PUBLIC_DIR) / 'data'
+    for filename in SPELL_SOURCES:
+        source = Path(SPELLS_DIR) / filename
+        target = data_dir / filename
+        if not target.exists():
+            problems.append(f"{filename}: not published to cards2/public/data")
+        elif source.read_bytes() != target.read_bytes():
+            problems.append(f"{filename}: published copy differs from spells/{filename}")
+
+    try:
+        check_artifacts(Path(PUBLIC_DIR))
+    except (OSError, ValueError) as e:
+        problems.append(str(e))
+
+    for problem in problems:
+        print(f"  - {problem}")
+    print(f"{len(problems)} problem(s)" if problems else "Data OK")
+    return 1 if problems else 0
+
+def command_diff(args):
+    """Diff two build directories."""
+    from spell_diff import diff_builds, print_report
+
+    print_report(diff_builds(args.old_dir, args.new_dir))
+    return 0
+
+def command_search(args):
+    """Search spell names; with --details, show level and school from the store."""
+    import json
+
+    from spell_search import search
+
+    with open(SEARCH_INDEX, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    names = search(index, ' '.join(args.query), limit=args.limit)
+    if not args.details:
+        for name in names:
+            print(name)
+        return 0 if names else 1
+
+    from spell_store import open_store
+
+    with open_store(SPELLS_DIR) as store:
+        for name in names:
+            spell = store.get(name)
+            if spell is None:
+                print(name)
+                continue
+            school = spell.get('school') or ''
+            school = school.get('name', '') if isinstance(school, dict) else school
+            print(f"{name} ({level_text(spell.get('level'))} {school.lower()})".rstrip())
+    return 0 if names else 1
+
+def command_render(args):
+    """Render printable sheets for a selection."""
+    from urllib.parse import urlencode
+
+    from card_service import load_catalog, parse_query, render_sheet
+
+    try:
+        query = parse_query(urlencode({
+            'classes': args.classes, 'levels': args.levels, 'sources': args.sources,
+            'cardSize': args.card_size, 'pageSize': args.page_size, 'guillotine': int(args.guillotine)
+        }))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    document = render_sheet(query, load_catalog())
+    if args.output == '-':
+        sys.stdout.buffer.write(document)
+    else:
+        with open(args.output, 'wb') as f:
+            f.write(document)
+        print(f"Wrote {args.output}")
+    return 0
+
+def command_serve(args):
+    """Run the local card service."""
+    import asyncio
+
+    from card_service import serve
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        print("Stopped")
+    return 0
+
+def build_parser():
+    """Build the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(prog='dndsheet', description="Spell card build and lookup tools.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="run the build graph")
+    build.add_argument('stages', nargs='*', help="stages to build (default: all)")
+    build.add_argument('--jobs', type=int, help="worker processes (default: CPU count)")
+    build.add_argument('--force', action='store_true', help="rebuild even when inputs are unchanged")
+    build.add_argument('--verbose', action='store_true', help="show each stage's output")
+    build.set_defaults(handler=command_build)
+
+    check = commands.add_parser('check', help="check the published data")
+    check.set_defaults(handler=command_check)
+
+    diff = commands.add_parser('diff', help="diff two build directories")
+    diff.add_argument('old_dir')
+    diff.add_argument('new_dir')
+    diff.set_defaults(handler=command_diff)
+
+    search = commands.add_parser('search', help="search spell names")
+    search.add_argument('query', nargs='+')
+    search.add_argument('--limit', type=int, default=20, help="maximum results (default: 20)")
+    search.add_argument('--details', action='store_true', help="show level and school")
+    search.set_defaults(handler=command_search)
+
+    render = commands.add_parser('render', help="write printable HTML sheets")
+    render.add_argument('--classes', default='', help="comma-separated class names")
+    render.add_argument('--levels', default='', help="comma-separated spell levels")
+    render.add_argument('--sources', default='', help="comma-separated source ids")
+    render.add_argument('--card-size', default='standard')
+    render.add_argument('--page-size', default='letter')
+    render.add_argument('--guillotine', action='store_true', help="keep cards in cuttable rows")
+    render.add_argument('--output', '-o', default='sheet.html', help="output file, or - for stdout")
+    render.set_defaults(handler=command_render)
+
+    serve = commands.add_parser('serve', help="run the local card service")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--workers', type=int, default=4, help="render worker processes")
+    serve.add_argument('--cache-size', type=int, default=128, help="cached responses")
+    serve.set_defaults(handler=command_serve)
+
+    return parser
+
+def main():
+    """Dispatch to the chosen subcommand."""
+    args = build_parser().parse_args()
+    sys.exit(args.handler(args))
+
+if __name__ == "__main__":
+    main()
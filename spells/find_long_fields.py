@@ -7,9 +7,11 @@ that might not fit in the card layout.
 import json
 import os
 
+from abbreviations import abbreviate
+
 # Load all spell files (including SRD for comparison)
 spell_files = []
-data_dir = '../cards2/public/data'
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cards2', 'public', 'data')
 for filename in os.listdir(data_dir):
     if filename.endswith('.json'):
         spell_files.append(os.path.join(data_dir, filename))
@@ -20,6 +22,8 @@ long_fields = []
 for filepath in spell_files:
     with open(filepath, 'r', encoding='utf-8') as f:
         spells = json.load(f)
+    if not isinstance(spells, list):
+        continue  # search index and other non-spell data
     
     source_name = os.path.basename(filepath)
     
@@ -29,19 +33,14 @@ for filepath in spell_files:
         range_val = spell.get('range', '')
         casting_time = spell.get('casting_time', '')
         
-        # Simulate UI abbreviations
-        def get_ui_length(text):
+        # Apply the same abbreviations as the cards (abbreviations.json)
+        def get_ui_length(text, table='spec'):
             """Calculate the effective length after UI abbreviations"""
-            text = str(text)
-            # "Concentration" -> "C" (saves 12 chars)
-            text = text.replace('Concentration', 'C')
-            # "up to" -> "↑" (saves 4 chars)
-            text = text.replace('up to', '↑')
-            return len(text)
+            return len(abbreviate(table, text))
         
         # Check for long text after abbreviations
         issues = []
-        duration_ui_len = get_ui_length(duration)
+        duration_ui_len = get_ui_length(duration, 'duration')
         range_ui_len = get_ui_length(range_val)
         casting_time_ui_len = get_ui_length(casting_time)
         
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate spell descriptions across every CSV and JSON source.
+
+combine_spells treats two descriptions as the same when their lengths differ
+by fewer than 5 characters, and compare_spell_copies only matches copies that
+share a name, so reworded or errata'd copies are either missed or reported as
+noise. This module indexes all descriptions at once:
+
+1. Each description is reduced to lowercase words (tags and markdown removed)
+   and shingled into overlapping word 3-grams, hashed to 64 bits.
+2. Each shingle set gets a MinHash signature. One-permutation hashing is
+   used: every shingle hash is computed once and lands in one of NUM_BINS
+   bins, each bin keeps its minimum, and empty bins are filled by rotation.
+3. Locality-sensitive hashing splits the signatures into BANDS bands. Two
+   descriptions become candidates when any band matches exactly, so the
+   work is linear in the corpus instead of quadratic.
+4. Candidates are scored with the exact Jaccard similarity of their shingle
+   sets.
+
+The class CSVs put the material component at the head of the description
+and an "At Higher Levels" heading before the upcast text; both are removed so
+the CSV and SRD copies of a spell compare equal.
+
+Copies are clustered by spell identity (the name without "(ritual)", as a
+spell id), not by chaining similar pairs: chaining joins distinct spells
+that share wording (Cure Wounds / Healing Word / ..., every "Summon *"
+spell) into one cluster. Each cluster scores its variants against its most
+common text. Shingle similarity says little about how much a short text
+changed (one typo costs a 30-word spell 0.25), so a cluster is listed for
+review by the number of words its variants change (word-level diff against
+the representative): at least REVIEW_MIN_CHANGES, which keeps rewordings and
+errata and leaves out "DM"/"GM" swaps and typos. Pairs of different spells at or above the rename threshold are
+reported separately as possible renames (e.g. "Bigby's Hand" / "Arcane Hand").
+
+Byte-identical texts (the same spell in several class CSVs) are collapsed
+before hashing and expanded again in the clusters.
+
+Usage:
+    python near_duplicates.py [--threshold 0.8] [--min-changes 4] [--all] [--json FILE]
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from class_csv import iter_spell_rows
+from convert_extra_spells import clean_spell_name, extract_material_from_description
+from spell_catalog import load_registry
+from spell_store import spell_id
+
+SHINGLE_SIZE = 3
+NUM_BINS = 128
+BANDS = 32  # 4 rows per band: pairs near 0.45 similarity collide half the time
+ROWS_PER_BAND = NUM_BINS // BANDS
+DEFAULT_THRESHOLD = 0.8  # renamed copies score 0.9+; distinct spells sharing a template 0.5-0.7
+REVIEW_MIN_CHANGES = 4  # changed words; below this a variant is a typo, spelling or "DM"/"GM" swap
+
+HASH_BITS = 64
+BIN_SPACE = 2 ** HASH_BITS // NUM_BINS  # bin values lie below this; rotation offsets step by it
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+# The CSVs head their upcast paragraph; the SRD keeps it in higher_level without a heading
+HIGHER_LEVEL_HEADING = re.compile(r'(?:<b>)?\s*At Higher Levels\s*[.:]?\s*(?:</b>)?\s*[.:]?', re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+def words(text):
+    """Lowercase words of a description, without tags or markdown."""
+    text = HIGHER_LEVEL_HEADING.sub(' ', text)
+    return WORD_PATTERN.findall(TAG_PATTERN.sub(' ', text).lower())
+
+def shingle_hashes(text):
+    """Set of 64-bit hashes of the word shingles of a text."""
+    tokens = words(text)
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {' '.join(tokens)} if tokens else set()
+    else:
+        shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return {int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little') for shingle in shingles}
+
+def signature(hashes):
+    """One-permutation MinHash signature of a non-empty hash set, densified by rotation."""
+    bins = [None] * NUM_BINS
+    for h in hashes:
+        index, value = h % NUM_BINS, h // NUM_BINS
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    # Empty bins borrow the next non-empty bin to the right, offset by the distance,
+    # so two sets only agree on a borrowed bin when they agree on its source
+    filled = []
+    for index in range(NUM_BINS):
+        distance = 0
+        value = bins[index]
+        while value is None:
+            distance += 1
+            value = bins[(index + distance) % NUM_BINS]
+        filled.append(value + distance * BIN_SPACE)
+    return filled
+
+def jaccard(set_a, set_b):
+    """Exact Jaccard similarity of two sets."""
+    if not set_a and not set_b:
+        return 1.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+def changed_words(text_a, text_b):
+    """Number of words changed between two texts (the larger side of each differing run)."""
+    matcher = difflib.SequenceMatcher(None, words(text_a), words(text_b), autojunk=False)
+    return sum(max(end_a - start_a, end_b - start_b)
+               for tag, start_a, end_a, start_b, end_b in matcher.get_opcodes() if tag != 'equal')
+
+def lsh_candidates(signatures):
+    """Pairs of keys whose signatures agree on at least one band."""
+    candidates = set()
+    for band in range(BANDS):
+        buckets = defaultdict(list)
+        start = band * ROWS_PER_BAND
+        for key, sig in signatures.items():
+            buckets[tuple(sig[start:start + ROWS_PER_BAND])].append(key)
+        for keys in buckets.values():
+            for i in range(len(keys)):
+                for j in range(i + 1, len(keys)):
+                    candidates.add((keys[i], keys[j]))
+    return candidates
+
+def collect_documents(spells_dir, public_dir):
+    """
+    Gather descriptions from every class CSV and every source registered in spells.json.
+    Returns a list of {'name', 'source', 'ref', 'text'} dicts.
+    """
+    documents = []
+    for csv_file in sorted(Path(spells_dir).glob("*.csv")):
+        for row in iter_spell_rows(csv_file):
+            # The SRD lists the material component separately, not at the head of the text
+            _, text = extract_material_from_description(row['description'])
+            documents.append({'name': row['name'], 'source': csv_file.name,
+                              'ref': f"{csv_file.name}:{row['row']}", 'text': text})
+
+    for source in load_registry(public_dir)['sources']:
+        with open(Path(public_dir) / source['file'], 'r', encoding='utf-8') as f:
+            spells = json.load(f)
+        for spell in spells:
+            text = '\n'.join((spell.get('desc') or []) + (spell.get('higher_level') or []))
+            documents.append({'name': spell.get('name', ''), 'source': source['id'],
+                              'ref': f"{source['id']}:{spell.get('name', '')}", 'text': text})
+    return documents
+
+def identity(name):
+    """Spell identity of a document name: the spell id without a "(ritual)" tag."""
+    return spell_id(clean_spell_name(name))
+
+def hash_texts(documents):
+    """Collapse identical texts. Returns (by_text, texts, shingles, signatures) keyed by text number."""
+    by_text = defaultdict(list)
+    for index, document in enumerate(documents):
+        by_text[document['text']].append(index)
+    texts = list(by_text)
+
+    shingles = {}
+    signatures = {}
+    for key, text in enumerate(texts):
+        hashes = shingle_hashes(text)
+        if hashes:
+            shingles[key] = hashes
+            signatures[key] = signature(hashes)
+    return by_text, texts, shingles, signatures
+
+def find_clusters(documents):
+    """
+    Cluster the copies of each spell by identity.
+    Returns a list of clusters with more than one document, each
+    {'members': [document indices], 'texts': distinct texts,
+     'pairs': [(representative index, variant index, score)]},
+    where the representative is the cluster's most common text.
+    """
+    by_text, texts, shingles, _ = hash_texts(documents)
+    text_key = {text: key for key, text in enumerate(texts)}
+
+    groups = defaultdict(list)
+    for index, document in enumerate(documents):
+        groups[identity(document['name'])].append(index)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        keys = sorted({text_key[documents[index]['text']] for index in members},
+                      key=lambda key: -sum(1 for index in members if documents[index]['text'] == texts[key]))
+        representative = keys[0]
+        pairs = [(by_text[texts[representative]][0], by_text[texts[key]][0],
+                  jaccard(shingles.get(representative, set()), shingles.get(key, set())))
+                 for key in keys[1:]]
+        clusters.append({'members': sorted(members), 'texts': len(keys), 'pairs': pairs})
+    return clusters
+
+def find_renamed(documents, threshold=DEFAULT_THRESHOLD):
+    """
+    Pairs of different spells whose texts are at least threshold similar.
+    Returns [(document index, document index, score)], the best pair per two identities.
+    """
+    by_text, texts, shingles, signatures = hash_texts(documents)
+    identities = []  # text number -> {identity: first document with that name and text}
+    for text in texts:
+        named = {}
+        for index in by_text[text]:
+            named.setdefault(identity(documents[index]['name']), index)
+        identities.append(named)
+
+    best = {}
+
+    def record(a, b, score):
+        for first, first_index in identities[a].items():
+            for second, second_index in identities[b].items():
+                if first == second:
+                    continue
+                pair, indices = ((first, second), (first_index, second_index)) if first < second \
+                    else ((second, first), (second_index, first_index))
+                if pair not in best or best[pair][2] < score:
+                    best[pair] = (*indices, score)
+
+    # One text under several names is a rename with identical wording
+    for key in range(len(texts)):
+        record(key, key, 1.0)
+    for a, b in lsh_candidates(signatures):
+        score = jaccard(shingles[a], shingles[b])
+        if score >= threshold:
+            record(a, b, score)
+    return sorted(best.values(), key=lambda pair: -pair[2])
+
+def describe_cluster(documents, cluster):
+    """Summarize a cluster for review: names, sources, similarity to the representative and words changed."""
+    scores = [score for _, _, score in cluster['pairs']]
+    changes = [changed_words(documents[first]['text'], documents[second]['text'])
+               for first, second, _ in cluster['pairs']]
+    return {
+        'names': sorted({documents[index]['name'] for index in cluster['members']}),
+        'variants': cluster['texts'],
+        'min_similarity': round(min(scores), 3) if scores else 1.0,
+        'max_similarity': round(max(scores), 3) if scores else 1.0,
+        'changed_words': max(changes, default=0),
+        'members': [{'name': documents[index]['name'], 'source': documents[index]['source'],
+                     'ref': documents[index]['ref']} for index in cluster['members']]
+    }
+
+def describe_renamed(documents, pair):
+    """Summarize a possible rename: both names, where each was found and the similarity."""
+    first, second, score = pair
+    return {
+        'similarity': round(score, 3),
+        'spells': [{'name': documents[index]['name'], 'source': documents[index]['source'],
+                    'ref': documents[index]['ref']} for index in (first, second)]
+    }
+
+def main():
+    """Report spells whose copies differ, and possible renames, across the corpus."""
+    parser = argparse.ArgumentParser(description="Find near-duplicate spell descriptions across sources.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="minimum Jaccard similarity of shingles for a possible rename")
+    parser.add_argument('--min-changes', type=int, default=REVIEW_MIN_CHANGES,
+                        help="list spells whose copies differ by at least this many words")
+    parser.add_argument('--all', action='store_true', help="list every spell with several copies")
+    parser.add_argument('--json', help="write the clusters and renames to this file")
+    args = parser.parse_args()
+
+    spells_dir = Path(__file__).parent
+    documents = collect_documents(spells_dir, spells_dir.parent / 'cards2' / 'public')
+    clusters = [describe_cluster(documents, cluster) for cluster in find_clusters(documents)]
+    renamed = [describe_renamed(documents, pair) for pair in find_renamed(documents, args.threshold)]
+
+    # Spells reworded or errata'd between sources are the ones worth reviewing, most changed first
+    differing = [cluster for cluster in clusters if cluster['changed_words']]
+    review = [cluster for cluster in clusters if args.all or cluster['changed_words'] >= args.min_changes]
+    review.sort(key=lambda cluster: (-cluster['changed_words'], cluster['min_similarity'], cluster['names']))
+
+    print(f"Indexed {len(documents)} descriptions; {len(clusters)} spells with several copies, "
+          f"{len(differing)} differ in wording, {len(review)} to review, {len(renamed)} possible renames")
+    for cluster in review:
+        print(f"\n{' / '.join(cluster['names'])}: {cluster['variants']} variants, "
+              f"{cluster['changed_words']} words changed, "
+              f"similarity {cluster['min_similarity']:.2f}-{cluster['max_similarity']:.2f}")
+        sources = defaultdict(list)
+        for member in cluster['members']:
+            sources[member['name']].append(member['source'])
+        for name, member_sources in sources.items():
+            print(f"  {name}: {', '.join(sorted(set(member_sources)))}")
+
+    if renamed:
+        print("\nPossible renames:")
+        for pair in renamed:
+            first, second = pair['spells']
+            print(f"  {pair['similarity']:.2f}  {first['name']} ({first['source']}) / {second['name']} ({second['source']})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'clusters': review, 'renamed': renamed}, f, indent=2, ensure_ascii=False)
+        print(f"\nWrote {len(review)} clusters and {len(renamed)} possible renames to {args.json}")
+
+if __name__ == "__main__":
+    main()
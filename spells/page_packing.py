@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Page packing for printed card decks (reference implementation).
+
+Cards come out of the reflow step as groups: a card followed by its
+continuation cards. Slicing that sequence into fixed pages lets groups
+straddle page boundaries and leaves part-empty pages. This packer treats each
+group as an item and packs items into pages with first-fit decreasing, which
+keeps continuations on the same page as their parent where they fit and
+reaches the minimum page count for almost every real deck.
+
+In guillotine mode groups are packed into rows first and rows onto pages, so
+a group never straddles a row boundary unless it is wider than a row, and the
+sheet can be cut into strips without separating a spell from its continuations.
+
+cards2/src/utils/pagePacker.js is a direct port of pack_pages; keep the two
+in step.
+
+Usage:
+    python page_packing.py [--page letter] [--card standard] [--guillotine] GROUP_SIZE...
+"""
+
+import argparse
+import math
+
+# Mirrors PAGE_SIZES / CARD_SIZES in cards2/src/utils/layoutConfig.js (inches)
+PAGE_SIZES = {
+    'letter': (8.5, 11),
+    'a4': (210 / 25.4, 297 / 25.4),
+    'legal': (8.5, 14),
+    'tabloid': (11, 17),
+    'a3': (297 / 25.4, 420 / 25.4),
+    'a5': (148 / 25.4, 210 / 25.4),
+}
+
+CARD_SIZES = {
+    'mini': (1.75, 2.5),
+    'standard': (2.5, 3.5),
+    'standardPlus': (2.625, 3.5),
+    'large': (3.5, 5),
+}
+
+def grid_layout(page_size='letter', card_size='standard'):
+    """Return (cards_per_row, cards_per_column) for a page and card size."""
+    page_width, page_height = PAGE_SIZES.get(page_size, PAGE_SIZES['letter'])
+    card_width, card_height = CARD_SIZES.get(card_size, CARD_SIZES['standard'])
+    # Small epsilon so metric pages don't lose a column to float rounding
+    cards_per_row = math.floor(page_width / card_width + 1e-9)
+    cards_per_column = math.floor(page_height / card_height + 1e-9)
+    return max(1, cards_per_row), max(1, cards_per_column)
+
+def group_sizes_from_flags(continuation_flags):
+    """Turn per-card continuation flags (True for a continuation card) into group sizes."""
+    sizes = []
+    for is_continuation in continuation_flags:
+        if is_continuation and sizes:
+            sizes[-1] += 1
+        else:
+            sizes.append(1)
+    return sizes
+
+def first_fit_decreasing(items, capacity, bins):
+    """
+    Place (size, payload) items into bins, largest first, each into the first bin with room.
+    Bins are dicts with 'free', 'items' and 'anchor'; new bins are appended.
+    """
+    # sorted() is stable, so equal sizes keep their original order
+    for size, payload in sorted(items, key=lambda item: -item[0]):
+        for target in bins:
+            if target['free'] >= size:
+                target['free'] -= size
+                target['items'].append(payload)
+                # Pages print in order of their earliest card; split bins stay behind their group
+                if not target.get('fixed'):
+                    target['anchor'] = min(target['anchor'], payload['anchor'])
+                break
+        else:
+            bins.append({'free': capacity - size, 'items': [payload], 'anchor': payload['anchor']})
+    return bins
+
+def split_oversized(start, size, capacity, anchor):
+    """
+    Split a group bigger than one bin into full bins plus a seeded bin for the remainder.
+    Returns (full_bins, remainder_bin); other items may still fill the remainder bin.
+    """
+    full_bins = []
+    offset = 0
+    while size - offset > capacity:
+        full_bins.append({'free': 0, 'items': [{'start': start + offset, 'count': capacity, 'anchor': anchor}], 'anchor': anchor, 'fixed': True})
+        offset += capacity
+
+    remainder = size - offset
+    remainder_bin = {
+        'free': capacity - remainder,
+        'items': [{'start': start + offset, 'count': remainder, 'anchor': anchor, 'seed': True}],
+        'anchor': anchor,
+        'fixed': True
+    }
+    return full_bins, remainder_bin
+
+def order_bins(bins):
+    """Order bins by their anchor, and items within a bin by position (seeded item first)."""
+    for target in bins:
+        target['items'].sort(key=lambda item: (not item.get('seed'), item['start']))
+    return sorted(bins, key=lambda target: target['anchor'])
+
+def expand(items):
+    """Expand packed items into card indices."""
+    cards = []
+    for item in items:
+        cards.extend(range(item['start'], item['start'] + item['count']))
+    return cards
+
+def pack_groups(group_sizes, capacity):
+    """Pack groups into bins of the given capacity. Returns ordered bins."""
+    bins = []
+    items = []
+    start = 0
+
+    for size in group_sizes:
+        # Groups are contiguous, so the start index orders them
+        anchor = start
+        if size > capacity:
+            full_bins, remainder_bin = split_oversized(start, size, capacity, anchor)
+            bins.extend(full_bins)
+            bins.append(remainder_bin)
+        else:
+            items.append((size, {'start': start, 'count': size, 'anchor': anchor}))
+        start += size
+
+    return order_bins(first_fit_decreasing(items, capacity, bins))
+
+def pack_pages(group_sizes, cards_per_page, cards_per_row=None, guillotine=False):
+    """
+    Pack card groups onto pages.
+
+    Returns a list of pages; each page is a list of card indices in row-major
+    slot order. Without guillotine mode the result never has more pages than
+    slicing the deck in order. In guillotine mode a page may contain None for
+    empty slots so that rows line up with cuts.
+    """
+    if not guillotine or not cards_per_row:
+        pages = [expand(page['items']) for page in pack_groups(group_sizes, cards_per_page)]
+        total = sum(group_sizes)
+        if len(pages) > math.ceil(total / cards_per_page):
+            # Never print more pages than plain slicing; split groups across pages instead
+            cards = list(range(total))
+            pages = [cards[i:i + cards_per_page] for i in range(0, total, cards_per_page)]
+        return pages
+
+    rows_per_page = max(1, cards_per_page // cards_per_row)
+
+    # Pack groups into rows, padding each row so slots line up with the cuts
+    rows = []
+    row_sizes = []
+    previous_anchor = None
+    for row in pack_groups(group_sizes, cards_per_row):
+        cards = expand(row['items'])
+        rows.append(cards + [None] * (cards_per_row - len(cards)))
+        # Rows split from one oversized group share its anchor and move as one block
+        if row_sizes and row['anchor'] == previous_anchor:
+            row_sizes[-1] += 1
+        else:
+            row_sizes.append(1)
+        previous_anchor = row['anchor']
+
+    # Then pack row blocks onto pages; item start/count index into rows
+    pages = []
+    for page in pack_groups(row_sizes, rows_per_page):
+        slots = []
+        for item in page['items']:
+            for cards in rows[item['start']:item['start'] + item['count']]:
+                slots.extend(cards)
+        pages.append(slots)
+    return pages
+
+def main():
+    """Print a packing plan for the given group sizes."""
+    parser = argparse.ArgumentParser(description="Pack card groups onto pages.")
+    parser.add_argument('sizes', nargs='+', type=int, help="cards per group, in deck order")
+    parser.add_argument('--page', default='letter', choices=sorted(PAGE_SIZES))
+    parser.add_argument('--card', default='standard', choices=sorted(CARD_SIZES))
+    parser.add_argument('--guillotine', action='store_true', help="keep groups within horizontal strips")
+    args = parser.parse_args()
+
+    per_row, per_column = grid_layout(args.page, args.card)
+    per_page = per_row * per_column
+    pages = pack_pages(args.sizes, per_page, per_row, args.guillotine)
+
+    total = sum(args.sizes)
+    print(f"{total} cards in {len(args.sizes)} groups, {per_page} per page ({per_row}x{per_column})")
+    print(f"Sequential slicing: {math.ceil(total / per_page)} pages; packed: {len(pages)} pages")
+    for number, page in enumerate(pages, 1):
+        print(f"  page {number}: {['-' if card is None else card for card in page]}")
+
+if __name__ == "__main__":
+    main()
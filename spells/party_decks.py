@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Build spell decks for a whole table in one pass.
+
+Takes a JSON file of character selections, each shaped like spellSelection in
+cards2/src/utils/stateManager.js:
+
+    {
+      "layoutConfig": {"pageSize": "letter", "cardSize": "standard"},
+      "characters": [
+        {"name": "Aria", "selectedClasses": ["Wizard"], "selectedLevels": [0, 1, 2],
+         "additionalSpellNames": ["Cure Wounds"], "enabledSources": ["srd", "core"]},
+        ...
+      ]
+    }
+
+(a bare list of characters works too). Every selection is resolved against
+the catalog with the Configurator's rules: spells of any selected class at
+any selected level, plus additional spells by name, sorted by level and name.
+With enabledSources, each spell is taken as merging only those sources gives
+it (spell_catalog.select_sources), so its classes come from those sources too.
+Each distinct spell card is rendered once no matter how many characters use
+it, then all decks go into one combined print job. collation.json lists, for
+every character, the page and slot of each of their cards in that job.
+
+Usage:
+    python party_decks.py PARTY.json [--output party_decks] [--guillotine]
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from card_service import load_catalog, render_card_parts, sheet_document
+from page_packing import CARD_SIZES, PAGE_SIZES, grid_layout, pack_pages
+from spell_catalog import select_sources
+from spell_store import spell_id
+
+def load_party(filepath):
+    """Load a party file. Returns (layout_config, characters)."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        party = json.load(f)
+    if isinstance(party, list):
+        return {}, party
+    return party.get('layoutConfig', {}), party.get('characters', [])
+
+def index_catalog(catalog, sources=None):
+    """
+    Index the catalog for one set of enabled sources (all sources when empty):
+    spell id -> spell, and (class, level) -> spell ids.
+    """
+    by_class_level = defaultdict(set)
+    spells = {}
+    for spell in catalog:
+        spell = select_sources(spell, sources or set(spell.get('provenance', [])))
+        if spell is None:
+            continue
+        key = spell_id(spell['name'])
+        spells[key] = spell
+        for cls in spell.get('classes', []):
+            name = cls['name'] if isinstance(cls, dict) else cls
+            by_class_level[(name.lower(), int(spell.get('level', 0)))].add(key)
+    return spells, by_class_level
+
+def resolve_selection(character, spells, by_class_level):
+    """Resolve one character's selection to spell ids, in deck order."""
+    selected = set()
+    # Like the Configurator, class/level filtering needs at least one of each
+    for cls in character.get('selectedClasses', []):
+        for level in character.get('selectedLevels', []):
+            selected |= by_class_level.get((cls.lower(), int(level)), set())
+
+    missing = []
+    for name in character.get('additionalSpellNames', []):
+        key = spell_id(name)
+        if key not in spells:
+            missing.append(name)
+        else:
+            selected.add(key)
+
+    ordered = sorted(selected, key=lambda key: (int(spells[key].get('level', 0)), spells[key]['name'].lower()))
+    return ordered, missing
+
+def build_party(catalog, layout_config, characters, guillotine=False):
+    """
+    Resolve, render and pack all decks.
+    Returns (document bytes, collation dict).
+    """
+    card_size = layout_config.get('cardSize', 'standard')
+    page_size = layout_config.get('pageSize', 'letter')
+    if card_size not in CARD_SIZES or page_size not in PAGE_SIZES:
+        raise ValueError(f"Unknown layout: {page_size}/{card_size}")
+
+    indexes = {}  # enabled sources -> (spells, by_class_level)
+
+    decks = []
+    for number, character in enumerate(characters, 1):
+        name = character.get('name') or f"Character {number}"
+        sources = frozenset(character.get('enabledSources') or [])
+        if sources not in indexes:
+            indexes[sources] = index_catalog(catalog, sources)
+        spells, by_class_level = indexes[sources]
+        ordered, missing = resolve_selection(character, spells, by_class_level)
+        for spell_name in missing:
+            print(f"Warning: {name}: unknown additional spell '{spell_name}'")
+        # Cards are keyed by spell id and provenance: a spell from the same sources renders the same
+        decks.append((name, [((key, tuple(spells[key]['provenance'])), spells[key]) for key in ordered]))
+
+    # Render each distinct spell once; decks reference the rendered parts
+    rendered = {}
+    for _, ordered in decks:
+        for card_key, spell in ordered:
+            if card_key not in rendered:
+                rendered[card_key] = render_card_parts(spell, card_size)
+
+    # Lay out every copy: the combined job holds each deck's cards in turn
+    cards = []
+    group_sizes = []
+    owners = []  # (deck index, spell) per group
+    for deck_index, (_, ordered) in enumerate(decks):
+        for card_key, spell in ordered:
+            cards.extend(rendered[card_key])
+            group_sizes.append(len(rendered[card_key]))
+            owners.append((deck_index, spell))
+
+    per_row, per_column = grid_layout(page_size, card_size)
+    pages = pack_pages(group_sizes, per_row * per_column, per_row, guillotine)
+
+    # Map every card index back to its page and slot
+    positions = {}
+    for page_number, page in enumerate(pages, 1):
+        for slot, index in enumerate(page, 1):
+            if index is not None:
+                positions[index] = (page_number, slot)
+
+    collation = {
+        'pageSize': page_size,
+        'cardSize': card_size,
+        'pages': len(pages),
+        'uniqueSpells': len(rendered),
+        'uniqueCards': sum(len(parts) for parts in rendered.values()),
+        'totalCards': len(cards),
+        'characters': [{'name': name, 'spells': len(ordered), 'cards': []} for name, ordered in decks]
+    }
+    start = 0
+    for (deck_index, spell), size in zip(owners, group_sizes):
+        collation['characters'][deck_index]['cards'].append({
+            'spell': spell['name'],
+            'level': int(spell.get('level', 0)),
+            'positions': [{'page': positions[index][0], 'slot': positions[index][1]} for index in range(start, start + size)]
+        })
+        start += size
+
+    return sheet_document(cards, pages, card_size, page_size), collation
+
+def main():
+    """Build the combined print job and collation lists for a party file."""
+    parser = argparse.ArgumentParser(description="Build spell decks for several characters at once.")
+    parser.add_argument('party', help="JSON file with character selections")
+    parser.add_argument('--output', default='party_decks', help="output directory")
+    parser.add_argument('--guillotine', action='store_true', help="keep cards in cuttable rows")
+    args = parser.parse_args()
+
+    layout_config, characters = load_party(args.party)
+    document, collation = build_party(load_catalog(), layout_config, characters, args.guillotine)
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / 'party.html', 'wb') as f:
+        f.write(document)
+    with open(output_dir / 'collation.json', 'w', encoding='utf-8') as f:
+        json.dump(collation, f, indent=2, ensure_ascii=False)
+
+    for character in collation['characters']:
+        print(f"{character['name']}: {character['spells']} spells, {sum(len(c['positions']) for c in character['cards'])} cards")
+    print(f"Rendered {collation['uniqueCards']} unique cards for {collation['totalCards']} printed cards "
+          f"on {collation['pages']} pages -> {output_dir}/party.html, {output_dir}/collation.json")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Precache manifest of the card data for the frontend's service worker.
+
+Writes cards2/public/precache-manifest.json listing every data artifact the
+app can fetch, each with a content hash as its revision:
+
+    {"files": [{"url": "data/bundles/srd-core.json", "revision": "9f2c...",
+                "size": 691665, "precache": true}, ...]}
+
+The service worker (cards2/public/sw.js) downloads the "precache" files when
+it installs, so the default view works offline from the first visit, and
+caches the other files the first time they are used. A file is only fetched
+again when its revision changes. The app's IndexedDB cache
+(src/utils/datasetCache.js) uses the same revisions to tell whether a parsed
+copy is current without asking the network.
+
+Usage:
+    python precache_manifest.py
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from spell_catalog import load_registry
+
+MANIFEST_FILE = "precache-manifest.json"
+CREATURE_FILES = ["data/creature-cards.json", "data/5e-SRD-Monsters.json"]
+
+def revision(path):
+    """Content hash of a file, short enough for cache keys."""
+    return hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+
+def artifact_files(public_dir, registry):
+    """Return (all artifact paths, paths to precache), relative to public_dir."""
+    default_ids = {source['id'] for source in registry.get('sources', []) if source.get('default')}
+    default_bundle = next((bundle['file'] for bundle in registry.get('bundles', [])
+                           if set(bundle['sources']) == default_ids), None)
+
+    # What the default view loads: the registry, the default bundle (or the
+    # default sources without one), the search index and the creature cards
+    precache = ["spells.json"]
+    if default_bundle:
+        precache.append(default_bundle)
+    else:
+        precache += [source['file'] for source in registry.get('sources', []) if source.get('default')]
+    if registry.get('searchIndex'):
+        precache.append(registry['searchIndex'])
+    precache.append(CREATURE_FILES[0])
+
+    files = ["spells.json"]
+    files += [source['file'] for source in registry.get('sources', [])]
+    files += [bundle['file'] for bundle in registry.get('bundles', [])]
+    files += [registry[key] for key in ('catalog', 'searchIndex') if registry.get(key)]
+    if registry.get('release'):
+        with open(public_dir / registry['release']['index'], 'r', encoding='utf-8') as f:
+            files += [registry['release']['index']] + [patch['file'] for patch in json.load(f)['patches']]
+    files += CREATURE_FILES
+    for index_file in registry.get('thumbnails', {}).values():
+        with open(public_dir / index_file, 'r', encoding='utf-8') as f:
+            files += [index_file] + json.load(f)['atlases']
+
+    files = [filename for filename in dict.fromkeys(files) if (public_dir / filename).exists()]
+    return files, set(precache)
+
+def write_manifest(public_dir):
+    """Write the precache manifest for a public directory. Returns the manifest."""
+    public_dir = Path(public_dir)
+    files, precache = artifact_files(public_dir, load_registry(public_dir))
+
+    manifest = {'files': [{
+        'url': filename,
+        'revision': revision(public_dir / filename),
+        'size': (public_dir / filename).stat().st_size,
+        'precache': filename in precache
+    } for filename in files]}
+
+    with open(public_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    precached = [entry for entry in manifest['files'] if entry['precache']]
+    print(f"Created {MANIFEST_FILE} with {len(files)} files "
+          f"({len(precached)} precached, {sum(entry['size'] for entry in precached) / 1024:.0f} KiB)")
+    return manifest
+
+def main():
+    """Write the manifest for the frontend's public directory."""
+    write_manifest(Path(__file__).parent.parent / 'cards2' / 'public')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Worst-case latency fuzzing for the spell text transforms.
+
+The CSV transforms (transform_duration, parse_school_from_csv, the <br>
+splitter, ...) and the description extractors run regexes over homebrew
+text nobody has checked. A pattern that backtracks catastrophically is fast
+on every real spell and then takes seconds, or hours, on one odd input.
+
+Each transform is fed adversarial inputs: a prefix that gets an anchored
+pattern past its anchor, followed by a run of one unit (spaces, digits, "(",
+"<br", "1st ", ...) that typical backtracking shapes choke on. Every input
+is timed at doubling sizes from 1 KiB to 64 KiB. A case fails when doubling
+the input more than triples the time (super-linear growth), or when one call
+takes longer than BUDGET_SECONDS. Random token soups can be added with
+--random to look for shapes the fixed families miss.
+
+Timings are wall-clock, so a busy machine can make a linear transform look
+super-linear. The gate (run_gate(), up to 16 KiB) therefore measures a
+failing family again, up to GATE_ATTEMPTS times in all, and only fails on
+problems that persist. It is the build pipeline's fuzz stage, which only
+runs when asked for (python build_pipeline.py fuzz) and never alongside
+other stages, so it can't block a deploy.
+
+Usage:
+    python regex_fuzz.py                  # run the gate, exit 1 on failures
+    python regex_fuzz.py --report         # also print the slowest cases
+    python regex_fuzz.py --random 200     # add 200 random inputs per transform
+    python regex_fuzz.py --only parse_school_from_csv
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from convert_extra_spells import (
+    clean_spell_name, extract_ritual_from_name, extract_concentration_from_duration,
+    extract_material_from_description, parse_school_from_csv, parse_components_from_csv,
+    transform_range, transform_duration, transform_casting_time_and_description,
+    convert_description_to_array, sanitize_class_name
+)
+from spell_extraction import split_higher_level, extract_damage, extract_dc
+
+# Every transform, as a function of one string
+TARGETS = {
+    'clean_spell_name': clean_spell_name,
+    'extract_ritual_from_name': extract_ritual_from_name,
+    'extract_concentration_from_duration': extract_concentration_from_duration,
+    'extract_material_from_description': extract_material_from_description,
+    'parse_school_from_csv': parse_school_from_csv,
+    'parse_components_from_csv': parse_components_from_csv,
+    'transform_range': transform_range,
+    'transform_duration': transform_duration,
+    'transform_casting_time': lambda text: transform_casting_time_and_description(text, ''),
+    'convert_description_to_array': convert_description_to_array,
+    'sanitize_class_name': sanitize_class_name,
+    'split_higher_level': lambda text: split_higher_level([text]),
+    'extract_damage': lambda text: extract_damage(1, [text], [text]),
+    'extract_dc': lambda text: extract_dc([text]),
+}
+
+# Prefixes that satisfy the anchors and literals of the patterns above
+PREFIXES = ['', 'Instantaneous or ', '1 reaction, which you take ', 'Self (', '(', 'M (',
+            '1st-level ', 'Concentration, ', '<b>At Higher Levels', 'Wizard (',
+            'take 1d6', 'increases by 1d6 for each ', 'deals an additional 1d6 ', 'At 5th level,',
+            '5th level (', 'using a 3rd', 'Strength']
+
+# Units repeated up to the input size
+UNITS = [' ', '1', 'a', '(', '(a', ')', 'M (', '<br', '<br ', '1st ', '1st-', '1d', '1d6 + ',
+         ' or', ' level', ' cantrip', '(ritual)', ' (ritual', ', ', '. ', '\t\n']
+
+# Suffixes that make an almost-match fail at the very end
+SUFFIXES = ['', '!']
+
+SIZES = [1024 * 2 ** step for step in range(7)]  # 1 KiB .. 64 KiB
+GATE_SIZES = SIZES[:5]  # up to 16 KiB: quadratic growth already shows, and the build stays quick
+BUDGET_SECONDS = 0.05   # longest acceptable call, at any size
+GROWTH_LIMIT = 3.0      # time ratio per doubling; linear is ~2, quadratic ~4
+MIN_MEASURABLE = 0.001  # below this, ratios are timer noise
+REPEATS = 3
+GATE_ATTEMPTS = 3       # a gate failure must reproduce this many times in a row
+
+def build_input(prefix, unit, suffix, size):
+    """prefix + unit repeated to about size characters + suffix."""
+    return prefix + unit * max(1, (size - len(prefix)) // len(unit)) + suffix
+
+def time_call(function, text):
+    """Fastest of REPEATS calls, in seconds."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - start)
+        if best > BUDGET_SECONDS:
+            break  # already over budget; don't wait on more slow calls
+    return best
+
+def measure(function, prefix, unit, suffix, sizes=SIZES):
+    """Time one input family at growing sizes. Returns (timings, problem or None)."""
+    timings = []
+    for size in sizes:
+        seconds = time_call(function, build_input(prefix, unit, suffix, size))
+        timings.append((size, seconds))
+        if seconds > BUDGET_SECONDS:
+            return timings, f"{seconds * 1000:.0f} ms at {size // 1024} KiB"
+        if len(timings) >= 2 and seconds > MIN_MEASURABLE and seconds / timings[-2][1] > GROWTH_LIMIT:
+            # Confirm with more repeats before blaming the transform for timer noise
+            previous = min(time_call(function, build_input(prefix, unit, suffix, size // 2)) for _ in range(3))
+            seconds = min(time_call(function, build_input(prefix, unit, suffix, size)) for _ in range(3))
+            if seconds / previous > GROWTH_LIMIT:
+                return timings, f"x{seconds / previous:.1f} from {size // 2048} to {size // 1024} KiB"
+    return timings, None
+
+def fuzz_families(targets, sizes=SIZES):
+    """Run every prefix/unit/suffix family against the targets. Yields result dicts."""
+    for name, function in targets.items():
+        for prefix in PREFIXES:
+            for unit in UNITS:
+                for suffix in SUFFIXES:
+                    timings, problem = measure(function, prefix, unit, suffix, sizes)
+                    yield {'target': name, 'input': f"{prefix!r} + {unit!r}*n + {suffix!r}",
+                           'family': (prefix, unit, suffix),
+                           'seconds': timings[-1][1], 'size': timings[-1][0], 'problem': problem}
+
+def fuzz_random(targets, count, seed):
+    """Time random soups of the prefix and unit tokens. Yields result dicts."""
+    tokens = [token for token in PREFIXES + UNITS if token]
+    rng = random.Random(seed)
+    for name, function in targets.items():
+        for _ in range(count):
+            pieces = []
+            size = rng.choice(SIZES)
+            while sum(map(len, pieces)) < size:
+                token = rng.choice(tokens)
+                pieces.append(token * rng.randint(1, 64))
+            text = ''.join(pieces)
+            seconds = time_call(function, text)
+            problem = f"{seconds * 1000:.0f} ms at {len(text) // 1024} KiB" if seconds > BUDGET_SECONDS else None
+            yield {'target': name, 'input': repr(text[:60]) + '...', 'seconds': seconds,
+                   'size': len(text), 'problem': problem}
+
+def run(targets, random_count=0, seed=0, sizes=SIZES):
+    """Run all fuzz cases. Returns (results, failures)."""
+    results = list(fuzz_families(targets, sizes))
+    if random_count:
+        results += list(fuzz_random(targets, random_count, seed))
+    return results, [result for result in results if result['problem']]
+
+def print_failures(failures):
+    """Print one line per failing input."""
+    for result in failures:
+        print(f"  {result['target']}: {result['input']}: {result['problem']}")
+
+def run_gate():
+    """Fail (for the build pipeline) when any transform is super-linear or over budget."""
+    start = time.perf_counter()
+    results, failures = run(TARGETS, sizes=GATE_SIZES)
+    for _ in range(GATE_ATTEMPTS - 1):
+        if not failures:
+            break
+        # Re-measure only the failing families; timer noise rarely repeats
+        failures = [dict(result, problem=problem) for result in failures
+                    for problem in [measure(TARGETS[result['target']], *result['family'], GATE_SIZES)[1]] if problem]
+    print(f"Fuzzed {len(TARGETS)} transforms with {len(results)} input families "
+          f"in {time.perf_counter() - start:.1f}s")
+    if failures:
+        print_failures(failures)
+        raise ValueError(f"{len(failures)} regex latency failure(s)")
+
+def main():
+    """Run the fuzz gate from the command line."""
+    parser = argparse.ArgumentParser(description="Worst-case latency fuzzing for the spell text transforms")
+    parser.add_argument('--report', action='store_true', help="print the slowest cases")
+    parser.add_argument('--random', type=int, default=0, metavar='N', help="random inputs per transform")
+    parser.add_argument('--seed', type=int, default=0, help="seed for --random")
+    parser.add_argument('--only', action='append', choices=sorted(TARGETS), help="fuzz only these transforms")
+    args = parser.parse_args()
+
+    targets = {name: TARGETS[name] for name in args.only} if args.only else TARGETS
+    start = time.perf_counter()
+    results, failures = run(targets, args.random, args.seed)
+    print(f"Fuzzed {len(targets)} transforms with {len(results)} inputs in {time.perf_counter() - start:.1f}s")
+
+    if args.report:
+        print("\nSlowest cases:")
+        for result in sorted(results, key=lambda result: -result['seconds'])[:15]:
+            print(f"  {result['seconds'] * 1000:8.2f} ms  {result['size'] // 1024:>3} KiB  "
+                  f"{result['target']}: {result['input']}")
+
+    if failures:
+        print(f"\n{len(failures)} failure(s):")
+        print_failures(failures)
+        sys.exit(1)
+    print("No super-linear or over-budget transforms")
+
+if __name__ == "__main__":
+    main()
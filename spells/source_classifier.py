@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Classify the class field of the spell CSVs into class, subclasses and source.
+
+The class column mixes class names, subclass names and sourcebook
+abbreviations in parentheses, e.g. "Cleric (*)(Life)(Grave)", "Wizard (XGE)"
+or "Druid(FToD)". The alias table in class_aliases.json is compiled once into
+a token index, and every distinct class field is resolved once and memoized,
+so classifying a row is a single dict lookup. Tokens the table doesn't know
+are collected into a report instead of being guessed at.
+"""
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from class_csv import iter_rows
+
+ALIASES_FILE = Path(__file__).parent / "class_aliases.json"
+
+DEFAULT_SOURCE = "Core"
+
+class SourceClassifier:
+    """Resolves class field text using a compiled alias table."""
+
+    def __init__(self, aliases_file=ALIASES_FILE):
+        with open(aliases_file, 'r', encoding='utf-8') as f:
+            aliases = json.load(f)
+
+        self.classes = {name.lower(): name for name in aliases['subclasses']}
+
+        # token (lowercase) -> (kind, value); subclass tokens are keyed per class
+        self.tokens = {}
+        for abbreviation, source in aliases['sourcebooks'].items():
+            self.tokens[abbreviation.lower()] = ('source', source)
+        for marker in aliases['markers']:
+            self.tokens[marker.lower()] = ('marker', marker)
+        for class_name, subclasses in aliases['subclasses'].items():
+            for subclass in subclasses:
+                self.tokens[(class_name.lower(), subclass.lower())] = ('subclass', subclass)
+
+        self.cache = {}
+        self.unknown = defaultdict(set)  # unknown token -> class field texts it appeared in
+
+    def parse(self, class_text):
+        """Resolve class field text without consulting the cache."""
+        base, _, rest = class_text.partition('(')
+        class_key = base.strip().lower()
+        class_name = self.classes.get(class_key, base.strip())
+
+        result = {
+            'class': class_name,
+            'subclasses': [],
+            'source': DEFAULT_SOURCE,
+            'unknown': []
+        }
+
+        if class_key not in self.classes:
+            result['unknown'].append(base.strip())
+
+        # Nothing after the last ")" can match; cutting it off keeps findall linear on "((((..."
+        tokens = '(' + rest if rest else ''
+        for token in re.findall(r'\(([^)]*)\)', tokens[:tokens.rfind(')') + 1]):
+            token = token.strip()
+            kind, value = self.tokens.get(token.lower()) or self.tokens.get((class_key, token.lower())) or (None, None)
+            if kind == 'source':
+                result['source'] = value
+            elif kind == 'subclass':
+                result['subclasses'].append(value)
+            elif kind is None:
+                result['unknown'].append(token)
+
+        return result
+
+    def classify(self, class_text):
+        """Return {'class', 'subclasses', 'source', 'unknown'} for a class field."""
+        class_text = class_text or ""
+        result = self.cache.get(class_text)
+        if result is None:
+            result = self.parse(class_text) if class_text else {
+                'class': "",
+                'subclasses': [],
+                'source': "Unknown",
+                'unknown': []
+            }
+            self.cache[class_text] = result
+            for token in result['unknown']:
+                self.unknown[token].add(class_text)
+        return result
+
+    def report(self):
+        """Return report lines for tokens the alias table didn't recognize."""
+        lines = []
+        for token, class_texts in sorted(self.unknown.items()):
+            examples = ", ".join(f"'{text}'" for text in sorted(class_texts))
+            lines.append(f"Unknown class token '{token}' (in {examples})")
+        return lines
+
+# Shared instance used by the conversion pipeline
+classifier = SourceClassifier()
+
+def main():
+    """Classify every distinct class field in the CSVs and report unknown tokens."""
+    spells_dir = Path(__file__).parent
+    counts = defaultdict(int)
+
+    for csv_file in sorted(spells_dir.glob("*.csv")):
+        # Only the class column is decoded
+        for row in iter_rows(csv_file):
+            if len(row) >= 9:
+                counts[row[8]] += 1
+
+    for class_text in sorted(counts):
+        result = classifier.classify(class_text)
+        subclasses = ", ".join(result['subclasses']) or "-"
+        print(f"{class_text!r:45} -> {result['class']:10} {result['source']:16} {subclasses} ({counts[class_text]} rows)")
+
+    lines = classifier.report()
+    print(f"\n=== UNKNOWN TOKENS ({len(lines)}) ===")
+    for line in lines:
+        print(line)
+
+if __name__ == "__main__":
+    main()
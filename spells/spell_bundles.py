@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Build prebuilt spell bundles for common source combinations.
+
+The frontend loads one file per enabled source and merges them in the
+browser. For the combinations people actually use, this script writes a
+single deduplicated file per combination and lists it under "bundles" in
+cards2/public/spells.json, so the loader can fetch one file and skip the
+merge entirely. A combination of every registered source is what the merged
+catalog already holds, so its entry points at the catalog instead of a copy.
+"""
+
+import json
+from pathlib import Path
+
+from spell_catalog import CATALOG_FILE, load_registry, merge_catalog
+
+# Source id combinations (ids from spells.json) that get a prebuilt bundle.
+# Copies are merged by spell_catalog, so precedence follows spells.json order.
+BUNDLES = [
+    ["srd", "core"],
+    ["srd", "core", "xanathar", "tasha"],
+    ["srd", "core", "xanathar", "tasha", "fizban"],
+]
+
+BUNDLES_DIR = "data/bundles"
+
+def build_bundles(public_dir):
+    """Write the bundle files and record them in spells.json. Returns the bundle entries."""
+    public_dir = Path(public_dir)
+    config = load_registry(public_dir)
+    known_ids = {source['id'] for source in config['sources']}
+    (public_dir / BUNDLES_DIR).mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    for source_ids in BUNDLES:
+        if any(source_id not in known_ids for source_id in source_ids):
+            print(f"Skipping bundle {'+'.join(source_ids)}: unknown source id")
+            continue
+
+        bundle_file = f"{BUNDLES_DIR}/{'-'.join(source_ids)}.json"
+        if set(source_ids) == known_ids:
+            (public_dir / bundle_file).unlink(missing_ok=True)
+            entries.append({
+                "sources": source_ids,
+                "file": CATALOG_FILE
+            })
+            print(f"Bundle {'+'.join(source_ids)} uses {CATALOG_FILE}")
+            continue
+
+        spells, duplicates = merge_catalog(public_dir, source_ids, with_fit_hints=True)
+        with open(public_dir / bundle_file, 'w', encoding='utf-8') as f:
+            json.dump(spells, f, ensure_ascii=False, separators=(',', ':'))
+
+        entries.append({
+            "sources": source_ids,
+            "file": bundle_file
+        })
+        print(f"Created {bundle_file} with {len(spells)} spells ({duplicates} duplicates merged)")
+
+    config['bundles'] = entries
+    with open(public_dir / "spells.json", 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    return entries
+
+def main():
+    """Build bundles for the frontend's public data directory."""
+    public_dir = Path(__file__).parent.parent / 'cards2' / 'public'
+    build_bundles(public_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Merge all spell sources into one canonical catalog.
+
+convert_extra_spells keeps CSV spells out of the expansion files only by an
+exact-name check against the SRD, so copies that differ in capitalization or
+apostrophes (e.g. "Meld Into Stone" / "Meld into Stone") end up in two
+sources. This stage joins every source registered in cards2/public/spells.json
+on canonical spell identity in a single pass, keeps the copy from the
+highest-precedence source (the order sources are listed in spells.json),
+unions class lists across copies and records each spell's provenance.
+Spells in the catalog (and the bundles built from it) also carry fit hints
+from spell_fitting.
+
+Spells found in several sources also keep each source's class list
+("source_classes") and the copies that lost ("copies"), so select_sources()
+can give the spell exactly as merging only the enabled sources would, when
+just some of them are enabled.
+"""
+
+import json
+from pathlib import Path
+
+from spell_fitting import fit_hints
+from spell_store import spell_id
+
+CATALOG_FILE = "data/catalog.json"
+
+def load_registry(public_dir):
+    """Load the source registry (spells.json) from the frontend's public directory."""
+    with open(Path(public_dir) / "spells.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def class_name(cls):
+    """Return the name of a class entry (SRD class objects or plain names)."""
+    return cls['name'] if isinstance(cls, dict) else cls
+
+def union_classes(winner_classes, other_classes):
+    """Add classes from another copy to the winner's list, in the winner's format."""
+    merged = list(winner_classes)
+    names = {class_name(cls) for cls in merged}
+    uses_objects = any(isinstance(cls, dict) for cls in merged)
+
+    for cls in other_classes:
+        name = class_name(cls)
+        if name in names:
+            continue
+        names.add(name)
+        merged.append({"index": name.lower(), "name": name} if uses_objects else name)
+
+    return merged
+
+def merge_catalog(public_dir, source_ids=None, with_fit_hints=False, with_copies=False):
+    """
+    Merge the given sources (all registered sources by default) into one list.
+    Returns (spells, duplicates) where duplicates counts dropped copies.
+    With with_fit_hints, each spell gets a "fit" entry per card size.
+    With with_copies, spells from several sources keep the per-source fields
+    select_sources() needs.
+    """
+    public_dir = Path(public_dir)
+    registry = load_registry(public_dir)
+    sources = [source for source in registry['sources'] if source_ids is None or source['id'] in source_ids]
+
+    catalog = {}  # spell id -> merged spell, in first-seen order
+    copies = {}   # spell id -> {source id: first copy in that source}
+    source_classes = {}  # spell id -> {source id: classes of that source's copies}
+    duplicates = 0
+
+    for source in sources:
+        with open(public_dir / source['file'], 'r', encoding='utf-8') as f:
+            spells = json.load(f)
+
+        for spell in spells:
+            key = spell_id(spell.get('name', ''))
+            copies.setdefault(key, {}).setdefault(source['id'], spell)
+            by_source = source_classes.setdefault(key, {})
+            classes = spell.get('classes', [])
+            by_source[source['id']] = union_classes(by_source[source['id']], classes) if source['id'] in by_source else classes
+
+            merged = catalog.get(key)
+            if merged is None:
+                catalog[key] = dict(spell, provenance=[source['id']])
+                continue
+
+            duplicates += 1
+            if source['id'] not in merged['provenance']:
+                merged['provenance'].append(source['id'])
+            merged['classes'] = union_classes(merged.get('classes', []), spell.get('classes', []))
+
+    if with_fit_hints:
+        for spell in catalog.values():
+            spell['fit'] = fit_hints(spell)
+
+    if with_copies:
+        for key, spell in catalog.items():
+            if len(spell['provenance']) < 2:
+                continue
+            spell['source_classes'] = source_classes[key]
+            spell['copies'] = {
+                source_id: dict(copy, fit=fit_hints(copy)) if with_fit_hints else copy
+                for source_id, copy in copies[key].items() if source_id != spell['provenance'][0]
+            }
+
+    return list(catalog.values()), duplicates
+
+def select_sources(spell, source_ids):
+    """
+    A catalog spell as merging only the given sources gives it, or None if
+    none of its sources are given: the copy from the first enabled source,
+    with the classes of the enabled sources only. (Spells keep their catalog
+    order, which can differ from the merge's first-seen order.)
+    """
+    provenance = [source_id for source_id in spell.get('provenance', []) if source_id in source_ids]
+    if not provenance:
+        return None
+    if 'copies' not in spell:
+        return spell
+    if len(provenance) == len(spell['provenance']):
+        return {key: value for key, value in spell.items() if key not in ('source_classes', 'copies')}
+
+    winner = spell if provenance[0] == spell['provenance'][0] else spell['copies'][provenance[0]]
+    classes = spell['source_classes'][provenance[0]]
+    for source_id in provenance[1:]:
+        classes = union_classes(classes, spell['source_classes'][source_id])
+
+    selected = {key: value for key, value in winner.items() if key not in ('source_classes', 'copies')}
+    selected['provenance'] = provenance
+    selected['classes'] = classes
+    return selected
+
+def main():
+    """Write the merged catalog for all registered sources."""
+    public_dir = Path(__file__).parent.parent / 'cards2' / 'public'
+    spells, duplicates = merge_catalog(public_dir, with_fit_hints=True, with_copies=True)
+
+    with open(public_dir / CATALOG_FILE, 'w', encoding='utf-8') as f:
+        json.dump(spells, f, ensure_ascii=False, separators=(',', ':'))
+
+    registry = load_registry(public_dir)
+    if registry.get('catalog') != CATALOG_FILE:
+        registry['catalog'] = CATALOG_FILE
+        with open(public_dir / "spells.json", 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    print(f"Created {CATALOG_FILE} with {len(spells)} spells ({duplicates} duplicates merged)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Merkle-hashed semantic diff between two pipeline builds.
+
+Each generated spell file gets a content tree: every spell is hashed from its
+canonical JSON, spells are bucketed by a prefix of the hash of their id, and
+bucket hashes roll up to a per-source root. The trees are written next to the
+outputs in spells.merkle.json, and diffing two builds only descends into
+buckets whose hashes differ, so the work is proportional to the change.
+
+Usage:
+    python spell_diff.py                    # (re)write spells.merkle.json
+    python spell_diff.py OLD_DIR NEW_DIR    # diff two build directories
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from spell_store import SOURCE_FILES, STORE_FILENAME, SpellStore, spell_id
+
+MANIFEST_FILENAME = "spells.merkle.json"
+MANIFEST_VERSION = 1
+
+# Two levels of 16-way buckets keyed on the hex digest of the spell id
+BUCKET_DEPTH = 2
+
+def content_hash(data):
+    """Hash a JSON-serializable value by its canonical encoding."""
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+def node_hash(children):
+    """Hash an interior node from its (sorted) child names and hashes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(children):
+        digest.update(f"{name}:{children[name]['hash']};".encode('utf-8'))
+    return digest.hexdigest()
+
+def bucket_path(key):
+    """Return the bucket names a spell id falls into, one per tree level."""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+    return [digest[:i + 1] for i in range(BUCKET_DEPTH)]
+
+def build_tree(spells):
+    """Build a Merkle tree over a list of spell dicts."""
+    root = {'children': {}}
+
+    for spell in spells:
+        key = spell_id(spell.get('name', ''))
+        node = root
+        for name in bucket_path(key):
+            node = node['children'].setdefault(name, {'children': {}})
+        node.setdefault('records', {})[key] = content_hash(spell)
+
+    def finalize(node):
+        if 'records' in node:
+            node['hash'] = content_hash(node['records'])
+            del node['children']
+            return
+        for child in node['children'].values():
+            finalize(child)
+        node['hash'] = node_hash(node['children'])
+
+    finalize(root)
+    return root
+
+def build_manifest(spells_dir):
+    """Build the Merkle manifest for the generated spell files in spells_dir."""
+    spells_dir = Path(spells_dir)
+    sources = {}
+
+    for filename in SOURCE_FILES:
+        filepath = spells_dir / filename
+        if not filepath.exists():
+            continue
+        with open(filepath, 'r', encoding='utf-8') as f:
+            spells = json.load(f)
+        sources[filepath.stem] = {'file': filename, **build_tree(spells)}
+
+    return {'version': MANIFEST_VERSION, 'sources': sources}
+
+def write_manifest(spells_dir):
+    """Write spells.merkle.json next to the generated outputs."""
+    manifest = build_manifest(spells_dir)
+    with open(Path(spells_dir) / MANIFEST_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def load_manifest(build_dir):
+    """Load a build's manifest, building it on the fly for builds that predate it."""
+    filepath = Path(build_dir) / MANIFEST_FILENAME
+    if filepath.exists():
+        with open(filepath, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    return build_manifest(build_dir)
+
+def diff_records(old_records, new_records):
+    """Compare two leaf record maps. Returns added ids, removed ids and (id, old_hash, new_hash) changes."""
+    added = [key for key in new_records if key not in old_records]
+    removed = [key for key in old_records if key not in new_records]
+    changed = [(key, old_records[key], new_records[key])
+               for key in new_records if key in old_records and new_records[key] != old_records[key]]
+    return added, removed, changed
+
+def diff_trees(old_node, new_node):
+    """Walk two trees, descending only into subtrees whose hashes differ."""
+    added, removed, changed = [], [], []
+    if old_node.get('hash') == new_node.get('hash'):
+        return added, removed, changed
+
+    if 'records' in old_node or 'records' in new_node:
+        return diff_records(old_node.get('records', {}), new_node.get('records', {}))
+
+    old_children = old_node.get('children', {})
+    new_children = new_node.get('children', {})
+    for name in sorted(set(old_children) | set(new_children)):
+        result = diff_trees(old_children.get(name, {}), new_children.get(name, {}))
+        added += result[0]
+        removed += result[1]
+        changed += result[2]
+
+    return added, removed, changed
+
+class BuildReader:
+    """Fetches individual spells from a build, via its packed store when present."""
+
+    def __init__(self, build_dir):
+        self.build_dir = Path(build_dir)
+        self.store = None
+        self.files = {}
+        if (self.build_dir / STORE_FILENAME).exists():
+            self.store = SpellStore(self.build_dir / STORE_FILENAME)
+
+    def get(self, filename, key, expected_hash):
+        if self.store:
+            spell = self.store.get_by_id(key)
+            # The store holds one spell per id across sources, so check it is this copy
+            if spell and content_hash(spell) == expected_hash:
+                return spell
+        # Fall back to loading the source file once
+        if filename not in self.files:
+            with open(self.build_dir / filename, 'r', encoding='utf-8') as f:
+                self.files[filename] = {spell_id(s.get('name', '')): s for s in json.load(f)}
+        return self.files[filename].get(key)
+
+    def close(self):
+        if self.store:
+            self.store.close()
+
+def diff_fields(old_spell, new_spell):
+    """Return {field: (old_value, new_value)} for fields that differ between two spells."""
+    fields = {}
+    for field in sorted(set(old_spell) | set(new_spell)):
+        if old_spell.get(field) != new_spell.get(field):
+            fields[field] = (old_spell.get(field), new_spell.get(field))
+    return fields
+
+def diff_builds(old_dir, new_dir):
+    """Diff two build directories. Returns {source: {'added', 'removed', 'changed'}}."""
+    old_manifest = load_manifest(old_dir)
+    new_manifest = load_manifest(new_dir)
+    old_reader = BuildReader(old_dir)
+    new_reader = BuildReader(new_dir)
+
+    report = {}
+    try:
+        sources = sorted(set(old_manifest['sources']) | set(new_manifest['sources']))
+        for source in sources:
+            old_tree = old_manifest['sources'].get(source, {})
+            new_tree = new_manifest['sources'].get(source, {})
+            added, removed, changed = diff_trees(old_tree, new_tree)
+            if not (added or removed or changed):
+                continue
+
+            changed_fields = {}
+            for key, old_hash, new_hash in changed:
+                old_spell = old_reader.get(old_tree['file'], key, old_hash)
+                new_spell = new_reader.get(new_tree['file'], key, new_hash)
+                changed_fields[key] = diff_fields(old_spell, new_spell)
+
+            report[source] = {
+                'added': sorted(added),
+                'removed': sorted(removed),
+                'changed': dict(sorted(changed_fields.items()))
+            }
+    finally:
+        old_reader.close()
+        new_reader.close()
+
+    return report
+
+def format_value(value, limit=80):
+    """Shorten a field value for display."""
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+def print_report(report):
+    """Print a diff report."""
+    if not report:
+        print("No differences")
+        return
+
+    for source, result in report.items():
+        print(f"=== {source} ===")
+        for key in result['added']:
+            print(f"  + {key}")
+        for key in result['removed']:
+            print(f"  - {key}")
+        for key, fields in result['changed'].items():
+            print(f"  ~ {key}")
+            for field, (old_value, new_value) in fields.items():
+                print(f"      {field}: {format_value(old_value)} -> {format_value(new_value)}")
+        print()
+
+def main():
+    """Write the manifest for this directory, or diff two build directories."""
+    if len(sys.argv) == 3:
+        print_report(diff_builds(sys.argv[1], sys.argv[2]))
+        return
+
+    if len(sys.argv) != 1:
+        print(__doc__.strip())
+        sys.exit(1)
+
+    spells_dir = Path(__file__).parent
+    manifest = write_manifest(spells_dir)
+    for source, tree in manifest['sources'].items():
+        print(f"{source}: root {tree['hash']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Extract structured fields from CSV-derived spell descriptions.
+
+The class CSVs keep "At Higher Levels" text, damage dice and saving throws
+inline in the description, while the SRD has separate higher_level, damage
+and dc fields. This stage fills in the SRD-shaped fields once at build time so
+the frontend and tools can read them directly instead of parsing descriptions.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from spell_diff import write_manifest
+from spell_store import build_store_from_outputs
+
+DAMAGE_TYPES = [
+    'acid', 'bludgeoning', 'cold', 'fire', 'force', 'lightning', 'necrotic',
+    'piercing', 'poison', 'psychic', 'radiant', 'slashing', 'thunder'
+]
+
+ABILITY_INDEXES = {
+    'strength': 'str',
+    'dexterity': 'dex',
+    'constitution': 'con',
+    'intelligence': 'int',
+    'wisdom': 'wis',
+    'charisma': 'cha'
+}
+
+HIGHER_LEVEL_PREFIX = re.compile(r'^(?:<b>)?\s*At Higher Levels\s*[.:]?\s*(?:</b>)?\s*[.:]?\s*', re.IGNORECASE)
+
+# "take 3d6 fire damage", "1d8 + 2 cold damage"
+DAMAGE_PATTERN = re.compile(r'(?<!\d)(\d+)d(\d+)(?:\s*\+\s*(\d+))?\s+(' + '|'.join(DAMAGE_TYPES) + r')\s+damage', re.IGNORECASE)
+
+DAMAGE_TYPE_NAMES = '|'.join(DAMAGE_TYPES)
+
+# "increases by 1d6 for each slot level above 1st", "the cold damage increases by 1d6 ...",
+# "deals an additional 1d6 fire damage for each slot level above 3rd"
+SLOT_SCALING_PATTERN = re.compile(
+    r'(?:(?:(' + DAMAGE_TYPE_NAMES + r') damage )?increases? by|deals? an additional) (\d+)d(\d+)'
+    r'(?: (' + DAMAGE_TYPE_NAMES + r'))?(?: damage)?,? for each (?:spell )?slot(?: level)? above (?:the )?(\d+)(?:st|nd|rd|th)',
+    re.IGNORECASE)
+
+# "using a 3rd- or 4th-level spell slot, the damage increases to 3d8"
+SLOT_TIER_PATTERN = re.compile(r'(?<!\d)(\d+)(?:st|nd|rd|th)[^,.]{0,60}?, the damage increases to (\d+)d(\d+)', re.IGNORECASE)
+
+# "5th level (2d6)", "5th level (2d8 or 2d12)", "11th level (2d8 and 3d8)"
+CANTRIP_SCALING_PATTERN = re.compile(r'(?<!\d)(\d+)(?:st|nd|rd|th) level \(([^()]{0,40})\)', re.IGNORECASE)
+
+# "At 5th level, ... the damage the target takes for moving increases to 2d8"
+CANTRIP_STEP_PATTERN = re.compile(r'\bAt (\d+)(?:st|nd|rd|th) level,[^.]{0,200}?increases to (\d+d\d+)', re.IGNORECASE)
+
+DICE_PATTERN = re.compile(r'(?<!\d)(\d+)d(\d+)')
+
+SAVE_PATTERN = re.compile(r'(' + '|'.join(ABILITY_INDEXES) + r') saving throw', re.IGNORECASE)
+
+def split_higher_level(desc):
+    """Split "At Higher Levels" paragraphs out of a description array. Returns (desc, higher_level)."""
+    remaining = []
+    higher_level = []
+
+    for paragraph in desc:
+        if HIGHER_LEVEL_PREFIX.match(paragraph):
+            higher_level.append(HIGHER_LEVEL_PREFIX.sub('', paragraph, count=1))
+        else:
+            remaining.append(paragraph)
+
+    return remaining, higher_level
+
+def format_dice(count, sides, bonus=None):
+    """Format dice in the SRD style, e.g. '3d6' or '1d4 + 1'."""
+    dice = f"{count}d{sides}"
+    return f"{dice} + {bonus}" if bonus else dice
+
+def damage_object(damage_type):
+    """SRD-shaped damage object with just the damage type."""
+    damage_type = damage_type.lower()
+    return {'damage_type': {'index': damage_type, 'name': damage_type.title()}}
+
+def pick_damage(matches, damage_type=None, sides=None):
+    """
+    The damage match the scaling text refers to: by type, then by die size, else
+    the first. Among several such rolls the largest wins, so a spell scales from
+    its failed-save damage rather than the half on a success (Enervation).
+    """
+    for fits in (lambda match: damage_type and match.group(4).lower() == damage_type.lower(),
+                 lambda match: sides and int(match.group(2)) == sides):
+        candidates = [match for match in matches if fits(match)]
+        if candidates:
+            return max(candidates, key=lambda match: int(match.group(1)))
+    return matches[0]
+
+def extract_cantrip_damage(desc):
+    """Damage for a cantrip, which scales with character level, or None."""
+    base_text = ' '.join(paragraph for paragraph in desc if not HIGHER_LEVEL_PREFIX.match(paragraph))
+    text = ' '.join(desc)
+    matches = list(DAMAGE_PATTERN.finditer(base_text))
+    if not matches:
+        # Dice only in the scaling text (e.g. Green-Flame Blade): the type is known, the base damage isn't
+        match = DAMAGE_PATTERN.search(text)
+        return damage_object(match.group(4)) if match else None
+
+    match = pick_damage(matches)
+    count, sides, bonus, damage_type = match.groups()
+    damage = damage_object(damage_type)
+
+    by_level = {'1': format_dice(int(count), int(sides), bonus)}
+    for character_level, dice in CANTRIP_STEP_PATTERN.findall(text):
+        by_level[character_level] = dice
+    for character_level, dice_text in CANTRIP_SCALING_PATTERN.findall(text):
+        # "(2d8 or 2d12)": take the die of the base damage; with several, the last one is the base roll
+        dice = [f"{c}d{s}" for c, s in DICE_PATTERN.findall(dice_text) if s == sides]
+        if dice:
+            by_level[character_level] = dice[-1]
+
+    if len(by_level) == 1 and DICE_PATTERN.search(text[match.end():]):
+        # More dice after the base damage that didn't parse as scaling; don't claim it stays flat
+        return damage
+    damage['damage_at_character_level'] = dict(sorted(by_level.items(), key=lambda item: int(item[0])))
+    return damage
+
+def extract_damage(level, desc, higher_level):
+    """Build an SRD-shaped damage object from description text, or None.
+
+    damage_at_* is only filled in when the scaling is understood; when the
+    higher-level text mentions dice that don't parse, only the type is kept.
+    """
+    if level == 0:
+        return extract_cantrip_damage(desc)
+
+    matches = list(DAMAGE_PATTERN.finditer(' '.join(desc)))
+    if not matches:
+        return None
+
+    higher_text = ' '.join(higher_level)
+    scaling = SLOT_SCALING_PATTERN.search(higher_text)
+    tiers = SLOT_TIER_PATTERN.findall(higher_text)
+
+    if scaling:
+        scaled_type = scaling.group(1) or scaling.group(4)
+        match = pick_damage(matches, scaled_type, int(scaling.group(3)))
+    else:
+        match = pick_damage(matches, sides=int(tiers[0][2]) if tiers else None)
+
+    count, sides, bonus, damage_type = match.groups()
+    count, sides = int(count), int(sides)
+    damage = damage_object(damage_type)
+
+    step_count = 0
+    if scaling:
+        if int(scaling.group(3)) != sides or int(scaling.group(5)) != level:
+            return damage
+        step_count = int(scaling.group(2))
+    elif DICE_PATTERN.search(higher_text) and not any(int(tier_sides) == sides for _, _, tier_sides in tiers):
+        return damage
+
+    by_slot = {
+        slot: format_dice(count + step_count * (slot - level), sides, bonus)
+        for slot in range(level, 10)
+    }
+
+    # Fixed tiers override the flat value from their slot level upwards
+    for tier_slot, tier_count, tier_sides in tiers:
+        if int(tier_sides) != sides:
+            continue
+        for slot in range(max(int(tier_slot), level), 10):
+            by_slot[slot] = format_dice(int(tier_count), sides, bonus)
+
+    damage['damage_at_slot_level'] = {str(slot): dice for slot, dice in by_slot.items()}
+    return damage
+
+def extract_dc(desc):
+    """Build an SRD-shaped saving throw object from description text, or None."""
+    text = ' '.join(desc)
+    match = SAVE_PATTERN.search(text)
+    if not match:
+        return None
+
+    index = ABILITY_INDEXES[match.group(1).lower()]
+    return {
+        'dc_type': {
+            'index': index,
+            'name': index.upper()
+        },
+        'dc_success': 'half' if re.search(r'half as much damage', text, re.IGNORECASE) else 'none'
+    }
+
+def extract_structured_fields(spell_json):
+    """Fill in higher_level, damage and dc on a CSV-derived spell. Existing fields are kept."""
+    desc = spell_json.get('desc', [])
+    level = spell_json.get('level', 0)
+
+    if 'higher_level' not in spell_json and level > 0:
+        desc, higher_level = split_higher_level(desc)
+        if higher_level:
+            spell_json['desc'] = desc
+            spell_json['higher_level'] = higher_level
+
+    higher_level = spell_json.get('higher_level', [])
+
+    if 'damage' not in spell_json:
+        damage = extract_damage(level, desc, higher_level)
+        if damage:
+            spell_json['damage'] = damage
+
+    if 'dc' not in spell_json:
+        dc = extract_dc(desc)
+        if dc:
+            spell_json['dc'] = dc
+
+    return spell_json
+
+def main():
+    """Apply the extraction stage to the generated spell files in place."""
+    spells_dir = Path(__file__).parent
+    public_data_dir = spells_dir.parent / 'cards2' / 'public' / 'data'
+
+    for filename in ["Core.json", "XanatharsGuide.json", "TashasCauldron.json"]:
+        filepath = spells_dir / filename
+        if not filepath.exists():
+            continue
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            spells = json.load(f)
+
+        spells = [extract_structured_fields(spell) for spell in spells]
+
+        for output in [filepath, public_data_dir / filename]:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(spells, f, indent=2, ensure_ascii=False)
+
+        with_damage = sum(1 for spell in spells if 'damage' in spell)
+        with_dc = sum(1 for spell in spells if 'dc' in spell)
+        with_higher = sum(1 for spell in spells if 'higher_level' in spell)
+        print(f"{filename}: {len(spells)} spells, {with_damage} with damage, {with_dc} with saves, {with_higher} with higher_level")
+
+    # Keep the derived artifacts in step with the rewritten outputs
+    build_store_from_outputs(spells_dir)
+    write_manifest(spells_dir)
+
+if __name__ == "__main__":
+    main()
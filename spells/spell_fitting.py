@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Offline text fitting for spell cards.
+
+The frontend's reflowCalculator fits each card by rendering it off-screen over
+and over: it tightens letter spacing, then shrinks the body font in 0.01 steps,
+and splits the body into continuation cards when even the smallest setting
+overflows. This module models the same card layout with glyph metrics and
+optimal (Knuth-Plass style) line breaking, so the whole corpus can be fitted
+offline. The result is a fit hint per card size, e.g.
+
+    "fit": {"standard": {"fontScale": 0.93, "letterSpacing": -0.02, "cards": 1}, ...}
+
+which spell_catalog attaches to the catalog and bundles. The browser still
+measures, but starts from the hint instead of searching.
+
+The probe order (letter spacing first, then font scale) mirrors
+reflowCalculator.js; keep the two in step.
+
+Usage:
+    python spell_fitting.py                 # fit report for the merged catalog
+    python spell_fitting.py "Spell Name"    # show the fit for one spell
+"""
+
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+# Probe settings, generated with the same float accumulation as reflowCalculator.js
+MIN_SCALE = 0.7
+SCALE_STEP = 0.01
+LETTER_SPACING_STEP = -0.005
+MIN_LETTER_SPACING = -0.02
+
+# Card geometry in CSS px (96 DPI), derived from Card.css:
+# text width = card width - card padding - content border - paragraph padding;
+# text height = card height - title - paddings/borders - header bar - footer.
+CARD_METRICS = {
+    'mini': {'width': 168, 'height': 240, 'title': 25, 'header': 33, 'font': 9.6},
+    'standard': {'width': 240, 'height': 336, 'title': 40, 'header': 33, 'font': 9.6},
+    'standardPlus': {'width': 252, 'height': 336, 'title': 42, 'header': 33, 'font': 9.6},
+    'large': {'width': 336, 'height': 480, 'title': 45, 'header': 41, 'font': 16},
+}
+CARD_CHROME_HEIGHT = 33  # paddings, borders, body padding and footer
+TEXT_INSET = 20          # horizontal padding and borders around the text
+LINE_HEIGHT = 1.2
+PARAGRAPH_GAP = 0.5      # em, margin between paragraphs
+BREAK_GAP = 0.5          # em, margins around <br/>
+
+# Advance widths in 1/1000 em (Helvetica AFM); the card font is Noto Sans, which
+# runs wider, and the frontend bolds dice and damage, so widths are scaled up.
+GLYPH_WIDTHS = dict(zip(
+    " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~",
+    [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+     556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+     1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+     667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+     333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+     556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584]
+))
+DEFAULT_GLYPH_WIDTH = 556
+FONT_WIDTH_FACTOR = 1.08
+
+MARKDOWN_PATTERN = re.compile(r'\*+|`')
+
+def fit_probes():
+    """Return (fontScale, letterSpacing) settings in the order reflowCalculator tries them."""
+    probes = []
+    spacing = 0
+    while spacing >= MIN_LETTER_SPACING:
+        probes.append((1.0, spacing))
+        spacing += LETTER_SPACING_STEP
+
+    scale = 1.0
+    while scale >= MIN_SCALE:
+        probes.append((scale, MIN_LETTER_SPACING))
+        scale -= SCALE_STEP
+    return probes
+
+FIT_PROBES = fit_probes()
+
+def glyph_units(text):
+    """Return (advance width in 1/1000 em, character count) for text."""
+    return sum(GLYPH_WIDTHS.get(char, DEFAULT_GLYPH_WIDTH) for char in text) * FONT_WIDTH_FACTOR, len(text)
+
+def text_width(units, font_px, letter_spacing):
+    """Width in px of measured text at a font size, with letter spacing in em."""
+    advance, chars = units
+    return (advance / 1000 + chars * letter_spacing) * font_px
+
+def body_paragraphs(spell):
+    """Return the measured card body paragraphs of a spell, as Spell.js builds it."""
+    desc = spell.get('desc') or []
+    text = '\n\n'.join(desc) if isinstance(desc, list) else (spell.get('description') or '')
+    higher_level = spell.get('higher_level') or []
+    if higher_level:
+        text += '\n\n' + '\n\n'.join(higher_level)
+
+    paragraphs = []
+    material = (spell.get('material') or spell.get('material_component') or '').strip()
+    if material:
+        paragraphs.append([f"Material Component: {material}"])
+
+    for paragraph in re.split(r'\n\n', MARKDOWN_PATTERN.sub('', text)):
+        paragraph = paragraph.strip()
+        if paragraph:
+            paragraphs.append(paragraph.split('\n'))
+    return measure_paragraphs(paragraphs)
+
+def measure_paragraphs(paragraphs):
+    """
+    Measure paragraphs given as lists of forced lines of plain text.
+    Glyph widths don't depend on the probe, so each word is measured once.
+    """
+    return [[[glyph_units(word) for word in line.split()] for line in paragraph] for paragraph in paragraphs]
+
+def break_lines(word_widths, space_width, line_width):
+    """
+    Break a line of words optimally and return the number of lines.
+
+    Total-fit dynamic programming in the style of Knuth-Plass: every break
+    point is considered and the cheapest sequence wins. Cost is the number of
+    lines first (the browser sets ragged-right text, so height is what
+    matters), then the sum of cubed slack so ties go to the most even breaks.
+    A single word wider than the line wraps across several lines.
+    """
+    count = len(word_widths)
+    if count == 0:
+        return 1
+
+    # Each line's slack term is at most 1, so weighting lines by count + 1
+    # keeps the line count as the primary key in a single float cost
+    line_cost = count + 1
+    best = [0.0] + [math.inf] * count  # best[j] = cost of setting words[:j]
+    lines = [0] * (count + 1)
+    for end in range(1, count + 1):
+        width = -space_width
+        for start in range(end - 1, -1, -1):
+            width += word_widths[start] + space_width
+            if width > line_width and start < end - 1:
+                break
+            rows = math.ceil(width / line_width) if width > line_width else 1
+            slack = 0.0 if end == count or width >= line_width else ((line_width - width) / line_width) ** 3
+            candidate = best[start] + rows * line_cost + slack
+            if candidate < best[end]:
+                best[end] = candidate
+                lines[end] = lines[start] + rows
+    return lines[count]
+
+def line_heights(paragraphs, font_px, letter_spacing, line_width):
+    """Return the height of every rendered line, with gaps added to the line they precede."""
+    space_width = text_width(glyph_units(' '), font_px, letter_spacing)
+    line_height = font_px * LINE_HEIGHT
+    heights = []
+
+    for paragraph_index, paragraph in enumerate(paragraphs):
+        for line_index, line in enumerate(paragraph):
+            words = [text_width(units, font_px, letter_spacing) for units in line]
+            for row in range(break_lines(words, space_width, line_width)):
+                gap = 0.0
+                if row == 0 and paragraph_index > 0 and line_index == 0:
+                    gap = PARAGRAPH_GAP * font_px
+                elif row == 0 and line_index > 0:
+                    gap = BREAK_GAP * font_px
+                heights.append(gap + line_height)
+    return heights
+
+def count_cards(heights, first_height, continuation_height):
+    """Count the cards needed to hold the lines; continuation cards have no header bar."""
+    cards = 1
+    available = first_height
+    used = 0.0
+    for height in heights:
+        if used + height > available and used > 0:
+            cards += 1
+            available = continuation_height
+            used = 0.0
+        used += height
+    return cards
+
+def text_height(card_size, header_rows=1):
+    """Height in px available to the body of a card with the given number of spec rows."""
+    metrics = CARD_METRICS[card_size]
+    return metrics['height'] - metrics['title'] - CARD_CHROME_HEIGHT - metrics['header'] * header_rows
+
+def fit_body(paragraphs, card_size='standard', header_rows=1):
+    """Return the fit hint for measured body paragraphs at one card size."""
+    metrics = CARD_METRICS[card_size]
+    line_width = metrics['width'] - TEXT_INSET
+    first_height = text_height(card_size, header_rows)
+
+    def fits(probe):
+        scale, spacing = FIT_PROBES[probe]
+        return sum(line_heights(paragraphs, metrics['font'] * scale, spacing, line_width)) <= first_height
+
+    def hint(probe, cards=1):
+        scale, spacing = FIT_PROBES[probe]
+        return {'fontScale': round(scale, 4), 'letterSpacing': round(spacing, 4), 'cards': cards}
+
+    # Most bodies fit as they are, and long ones don't fit at all; check both ends first
+    last = len(FIT_PROBES) - 1
+    if fits(0):
+        return hint(0)
+    if not fits(last):
+        # Nothing fits: the body is split at the smallest setting
+        scale, spacing = FIT_PROBES[last]
+        heights = line_heights(paragraphs, metrics['font'] * scale, spacing, line_width)
+        return hint(last, count_cards(heights, first_height, text_height(card_size, 0)))
+
+    # Fitting only gets easier along the probe list, so binary search the first probe that fits
+    low, high = 1, last
+    while low < high:
+        middle = (low + high) // 2
+        if fits(middle):
+            high = middle
+        else:
+            low = middle + 1
+    return hint(low)
+
+def split_body(paragraphs, card_size, hint, header_rows=1):
+    """
+    Split a body that needs continuation cards at paragraph boundaries.
+    Returns the indices of the paragraphs that start a new card.
+    """
+    metrics = CARD_METRICS[card_size]
+    font_px = metrics['font'] * hint['fontScale']
+    line_width = metrics['width'] - TEXT_INSET
+    breaks = []
+    used = 0.0
+    available = text_height(card_size, header_rows)
+    for index, paragraph in enumerate(paragraphs):
+        height = sum(line_heights([paragraph], font_px, hint['letterSpacing'], line_width))
+        if index > 0 and used + height > available:
+            breaks.append(index)
+            used = 0.0
+            available = text_height(card_size, 0)
+        used += height
+    return breaks
+
+def fit_card(spell, card_size='standard', paragraphs=None):
+    """Return the fit hint for one spell at one card size."""
+    return fit_body(paragraphs if paragraphs is not None else body_paragraphs(spell), card_size)
+
+_hint_cache = {}
+
+def fit_hints(spell):
+    """Return fit hints for every card size, memoized on the card body."""
+    key = json.dumps([spell.get('desc'), spell.get('description'), spell.get('higher_level'),
+                      spell.get('material'), spell.get('material_component')])
+    if key not in _hint_cache:
+        paragraphs = body_paragraphs(spell)
+        _hint_cache[key] = {card_size: fit_card(spell, card_size, paragraphs) for card_size in CARD_METRICS}
+    return _hint_cache[key]
+
+def main():
+    """Report fitting results for the merged catalog."""
+    from spell_catalog import merge_catalog
+    from spell_store import spell_id
+
+    public_dir = Path(__file__).parent.parent / 'cards2' / 'public'
+    spells, _ = merge_catalog(public_dir)
+
+    if len(sys.argv) > 1:
+        wanted = spell_id(' '.join(sys.argv[1:]))
+        for spell in spells:
+            if spell_id(spell['name']) == wanted:
+                for card_size, hint in fit_hints(spell).items():
+                    print(f"{card_size:13} {hint}")
+                return
+        print(f"Spell not found: {' '.join(sys.argv[1:])}")
+        return
+
+    print(f"Fitting {len(spells)} spells")
+    all_hints = [fit_hints(spell) for spell in spells]
+    for card_size in CARD_METRICS:
+        hints = [spell_hints[card_size] for spell_hints in all_hints]
+        reduced = sum(1 for hint in hints if hint['cards'] == 1 and (hint['fontScale'] < 1 or hint['letterSpacing'] < 0))
+        continuations = sum(hint['cards'] - 1 for hint in hints)
+        split = sum(1 for hint in hints if hint['cards'] > 1)
+        print(f"  {card_size:13} {reduced:4} reduced, {split:4} split into {continuations} continuation cards")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Pluggable importers for external spell datasets.
+
+Each importer recognizes one dataset layout and streams its spells one at a
+time, normalized into the same record shape create_spell_json produces, so
+large third-party or homebrew dumps can be merged without loading them
+wholesale. JSON files are read incrementally with ijson when it is installed,
+falling back to a chunked stdlib reader that decodes one array item at a time.
+
+Usage:
+    python spell_importers.py INPUT [--format NAME] [--source NAME] [--output FILE]
+    python spell_importers.py --list
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from class_csv import iter_spell_rows
+from convert_extra_spells import (
+    create_spell_json,
+    convert_description_to_array,
+    extract_concentration_from_duration,
+    parse_components_from_csv,
+    transform_duration,
+    transform_range,
+)
+from spell_extraction import HIGHER_LEVEL_PREFIX, extract_structured_fields
+from spell_store import STORE_FILENAME, SpellStore, spell_id
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+IMPORTERS = {}
+
+def register_importer(importer_class):
+    """Class decorator that adds an importer to the registry under its name."""
+    IMPORTERS[importer_class.name] = importer_class()
+    return importer_class
+
+class _JSONStream:
+    """Chunked reader that decodes JSON values one at a time from a file."""
+
+    def __init__(self, f, chunk_size=65536):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """Read another chunk into the buffer. Returns False at end of file."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self.pos += 1
+
+    def decode(self):
+        """Decode the next complete JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not isinstance(value, (dict, list, str)) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def seek_key(self, key):
+        """Advance into the top-level object until the value of key is next."""
+        self.expect('{')
+        while self.peek() != '}':
+            name = self.decode()
+            self.expect(':')
+            if name == key:
+                return
+            self.decode()  # skip this member's value
+            if self.peek() == ',':
+                self.pos += 1
+        raise KeyError(key)
+
+    def iter_array(self):
+        """Yield the items of the array that is next in the stream."""
+        self.expect('[')
+        while True:
+            char = self.peek()
+            if char == ']' or char == '':
+                return
+            if char == ',':
+                self.pos += 1
+                continue
+            yield self.decode()
+
+def iter_json_items(filepath, key=None):
+    """Stream the items of a top-level JSON array, or of the array under a top-level key."""
+    if ijson:
+        with open(filepath, 'rb') as f:
+            yield from ijson.items(f, f"{key}.item" if key else 'item')
+        return
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f)
+        if key:
+            stream.seek_key(key)
+        yield from stream.iter_array()
+
+def finalize_spell(spell_json):
+    """Drop empty values and derive structured fields, as create_spell_json does."""
+    spell_json = {k: v for k, v in spell_json.items() if v is not None}
+    return extract_structured_fields(spell_json)
+
+def school_object(school_name):
+    """Convert a school name to the SRD school object."""
+    if not school_name:
+        return None
+    school_name = school_name.strip().title()
+    return {
+        "index": school_name.lower(),
+        "name": school_name
+    }
+
+def split_classes(class_text):
+    """Split a comma-separated class list, dropping empty entries."""
+    return [cls.strip() for cls in (class_text or "").split(',') if cls.strip()]
+
+class SpellImporter:
+    """Base class for importers. Subclasses set name/description and implement iter_spells."""
+
+    name = None
+    description = ""
+
+    def matches(self, filepath, head):
+        """Return True if this importer recognizes the file from its path and first few KB."""
+        return False
+
+    def iter_spells(self, filepath, source):
+        """Yield normalized spell dicts from the file."""
+        raise NotImplementedError
+
+@register_importer
+class ClassCSVImporter(SpellImporter):
+    """The project's 9-column semicolon class CSVs."""
+
+    name = "class-csv"
+    description = "Semicolon-separated class spell lists (spells/*.csv)"
+
+    def matches(self, filepath, head):
+        return filepath.suffix.lower() == '.csv' and '";"' in head
+
+    def iter_spells(self, filepath, source):
+        for spell_data in iter_spell_rows(filepath):
+            spell_json = create_spell_json(spell_data)
+            if source:
+                spell_json['source'] = source
+            yield spell_json
+
+@register_importer
+class SRDJSONImporter(SpellImporter):
+    """The 5e-SRD API spell dump (5e-SRD-Spells.json)."""
+
+    name = "srd-json"
+    description = "5e-SRD API spell arrays"
+
+    def matches(self, filepath, head):
+        return head.lstrip().startswith('[') and '"/api/' in head
+
+    def iter_spells(self, filepath, source):
+        for row_num, spell in enumerate(iter_json_items(filepath), 1):
+            components, _ = parse_components_from_csv(', '.join(spell.get('components') or []))
+            spell_json = {
+                'name': (spell.get('name') or '').strip(),
+                'level': spell.get('level', 0),
+                'school': school_object((spell.get('school') or {}).get('name')),
+                'casting_time': spell.get('casting_time'),
+                'range': transform_range(spell.get('range')),
+                'components': components,
+                'duration': transform_duration(spell.get('duration')),
+                'desc': spell.get('desc') or [],
+                'higher_level': spell.get('higher_level') or None,
+                'classes': [cls['name'] for cls in spell.get('classes') or []],
+                'ritual': bool(spell.get('ritual')),
+                'concentration': bool(spell.get('concentration')),
+                'material': spell.get('material'),
+                'damage': spell.get('damage'),
+                'dc': spell.get('dc'),
+                'source': source or "SRD",
+                'source_file': filepath.name,
+                'source_row': row_num
+            }
+            yield finalize_spell(spell_json)
+
+def open5e_flag(value):
+    """Open5e exports flags as "yes"/"no" strings in older dumps and booleans in newer ones."""
+    if isinstance(value, str):
+        return value.strip().lower() == 'yes'
+    return bool(value)
+
+@register_importer
+class Open5eImporter(SpellImporter):
+    """Open5e spell exports (a results page or a bare array)."""
+
+    name = "open5e-json"
+    description = "Open5e /spells/ exports"
+
+    def matches(self, filepath, head):
+        return '"dnd_class"' in head or '"level_int"' in head
+
+    def iter_spells(self, filepath, source):
+        key = 'results' if head_of(filepath).lstrip().startswith('{') else None
+        for row_num, spell in enumerate(iter_json_items(filepath, key), 1):
+            components, material = parse_components_from_csv(spell.get('components', ''))
+            duration = spell.get('duration', '')
+            higher_level = convert_description_to_array((spell.get('higher_level') or '').replace('\n', '<br>'))
+            spell_json = {
+                'name': (spell.get('name') or '').strip(),
+                'level': int(spell.get('level_int', spell.get('spell_level', 0)) or 0),
+                'school': school_object(spell.get('school')),
+                'casting_time': spell.get('casting_time'),
+                'range': transform_range(spell.get('range')),
+                'components': components,
+                'duration': transform_duration(duration),
+                'desc': convert_description_to_array((spell.get('desc') or '').replace('\n', '<br>')),
+                'higher_level': higher_level or None,
+                'classes': split_classes(spell.get('dnd_class')),
+                'ritual': open5e_flag(spell.get('ritual') or spell.get('can_be_cast_as_ritual')),
+                'concentration': open5e_flag(spell.get('concentration') or spell.get('requires_concentration'))
+                                 or extract_concentration_from_duration(duration),
+                'material': spell.get('material') or material,
+                'source': source or re.sub(r'\W+', '', spell.get('document__title') or '') or "Open5e",
+                'source_file': filepath.name,
+                'source_row': row_num
+            }
+            yield finalize_spell(spell_json)
+
+FIVETOOLS_SCHOOLS = {
+    'A': 'Abjuration', 'C': 'Conjuration', 'D': 'Divination', 'E': 'Enchantment',
+    'V': 'Evocation', 'I': 'Illusion', 'N': 'Necromancy', 'T': 'Transmutation'
+}
+
+def fivetools_text(entries):
+    """Flatten 5etools entries into paragraphs, unwrapping {@tag text|...} markup."""
+    paragraphs = []
+    for entry in entries or []:
+        if isinstance(entry, str):
+            paragraphs.append(re.sub(r'\{@\w+ ([^|}]*)[^}]*\}', r'\1', entry))
+        elif isinstance(entry, dict):
+            nested = fivetools_text(entry.get('entries') or entry.get('items'))
+            if entry.get('name') and nested:
+                nested[0] = f"<b>{entry['name']}.</b> {nested[0]}"
+            paragraphs.extend(nested)
+    return paragraphs
+
+def fivetools_time(times):
+    parts = []
+    for time in times or []:
+        number, unit = time.get('number', 1), time.get('unit', '')
+        unit = 'bonus action' if unit == 'bonus' else unit
+        text = f"{number} {unit}{'s' if number != 1 else ''}"
+        if time.get('condition'):
+            text += f", {time['condition']}"
+        parts.append(text)
+    return ' or '.join(parts)
+
+def fivetools_range(spell_range):
+    spell_range = spell_range or {}
+    distance = spell_range.get('distance', {})
+    distance_type = distance.get('type', '')
+    amount = distance.get('amount')
+
+    if spell_range.get('type') in ('radius', 'sphere', 'cone', 'line', 'cube', 'hemisphere'):
+        return f"{amount}-foot {spell_range['type']}"
+    if distance_type in ('feet', 'miles'):
+        unit = distance_type if amount != 1 else distance_type.rstrip('s')
+        return f"{amount} {unit}"
+    return distance_type.title()
+
+def fivetools_duration(durations):
+    parts = []
+    for duration in durations or []:
+        kind = duration.get('type')
+        if kind == 'instant':
+            parts.append("Instantaneous")
+        elif kind == 'timed':
+            amount = duration['duration'].get('amount', 1)
+            unit = duration['duration'].get('type', '')
+            text = f"{amount} {unit}{'s' if amount != 1 else ''}"
+            parts.append(f"Concentration, up to {text}" if duration.get('concentration') else text)
+        elif kind == 'permanent':
+            parts.append("Until dispelled")
+        else:
+            parts.append(str(kind).title())
+    return ' or '.join(parts)
+
+@register_importer
+class FiveToolsImporter(SpellImporter):
+    """5etools spell files ({"spell": [...]})."""
+
+    name = "5etools-json"
+    description = "5etools spells-*.json files"
+
+    def matches(self, filepath, head):
+        return head.lstrip().startswith('{') and '"spell"' in head
+
+    def iter_spells(self, filepath, source):
+        for row_num, spell in enumerate(iter_json_items(filepath, 'spell'), 1):
+            components = spell.get('components', {})
+            material = components.get('m')
+            if isinstance(material, dict):
+                material = material.get('text')
+            duration = fivetools_duration(spell.get('duration'))
+            class_list = spell.get('classes', {}).get('fromClassList', [])
+
+            spell_json = {
+                'name': (spell.get('name') or '').strip(),
+                'level': spell.get('level', 0),
+                'school': school_object(FIVETOOLS_SCHOOLS.get(spell.get('school'))),
+                'casting_time': fivetools_time(spell.get('time')),
+                'range': fivetools_range(spell.get('range')),
+                'components': [c.upper() for c in ('v', 's', 'm') if components.get(c)],
+                'duration': duration,
+                'desc': fivetools_text(spell.get('entries')),
+                'higher_level': [HIGHER_LEVEL_PREFIX.sub('', paragraph, count=1)
+                                 for paragraph in fivetools_text(spell.get('entriesHigherLevel'))] or None,
+                'classes': sorted({cls['name'] for cls in class_list}),
+                'ritual': bool(spell.get('meta', {}).get('ritual')),
+                'concentration': extract_concentration_from_duration(duration),
+                'material': material if isinstance(material, str) else None,
+                'source': source or spell.get('source') or "5etools",
+                'source_file': filepath.name,
+                'source_row': row_num
+            }
+            yield finalize_spell(spell_json)
+
+@register_importer
+class JSONLinesImporter(SpellImporter):
+    """Spells already in the pipeline's record shape, one JSON object per line."""
+
+    name = "jsonl"
+    description = "JSON Lines of pipeline-shaped spell records (homebrew)"
+
+    def matches(self, filepath, head):
+        return filepath.suffix.lower() in ('.jsonl', '.ndjson')
+
+    def iter_spells(self, filepath, source):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for row_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                spell = json.loads(line)
+                spell.setdefault('source', source or "Homebrew")
+                spell.setdefault('source_file', filepath.name)
+                spell.setdefault('source_row', row_num)
+                yield finalize_spell(spell)
+
+def head_of(filepath, size=4096):
+    """Return the first few KB of a file for format sniffing."""
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read(size)
+
+def find_importer(filepath, format_name=None):
+    """Return the importer for a file, by explicit name or by sniffing its contents."""
+    if format_name:
+        if format_name not in IMPORTERS:
+            raise ValueError(f"Unknown format '{format_name}' (known: {', '.join(IMPORTERS)})")
+        return IMPORTERS[format_name]
+
+    head = head_of(filepath)
+    for importer in IMPORTERS.values():
+        if importer.matches(filepath, head):
+            return importer
+    raise ValueError(f"No importer recognizes {filepath.name}; pass --format")
+
+def import_spells(filepath, format_name=None, source=None):
+    """Stream normalized spells from an external dataset file."""
+    filepath = Path(filepath)
+    importer = find_importer(filepath, format_name)
+    yield from importer.iter_spells(filepath, source)
+
+def write_spells_stream(spells, output_file):
+    """
+    Write spells as a JSON array one record at a time (same layout as json.dump(..., indent=2)).
+    The array goes to a temporary file that replaces output_file only once every
+    spell is written, so a failed import leaves the old file untouched.
+    """
+    output_file = Path(output_file)
+    fd, temp_name = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for spell in spells:
+                body = json.dumps(spell, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+                f.write(('\n  ' if count == 0 else ',\n  ') + body)
+                count += 1
+            f.write('\n]' if count else ']')
+        os.replace(temp_name, output_file)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    return count
+
+def protected_paths():
+    """Files the build pipeline reads or writes, which an import must never overwrite."""
+    from build_pipeline import ROOT, STAGES
+
+    paths = set()
+    for stage in STAGES:
+        for pattern in stage['inputs'] + stage['outputs']:
+            paths.update(path.resolve() for path in ROOT.glob(pattern))
+            paths.add((ROOT / pattern).resolve())
+    return paths
+
+def main():
+    """Import an external dataset, skipping spells the existing catalog already has."""
+    parser = argparse.ArgumentParser(description="Import an external spell dataset.")
+    parser.add_argument('input', nargs='?', help="dataset file to import")
+    parser.add_argument('--format', choices=sorted(IMPORTERS), help="importer to use (sniffed by default)")
+    parser.add_argument('--source', help="source name to record on imported spells")
+    parser.add_argument('--output', help="output JSON file (default: spells/<source>.json)")
+    parser.add_argument('--list', action='store_true', help="list available importers")
+    args = parser.parse_args()
+
+    if args.list or not args.input:
+        for name, importer in IMPORTERS.items():
+            print(f"{name:14} {importer.description}")
+        return
+
+    spells_dir = Path(__file__).parent
+    input_file = Path(args.input)
+    source = args.source or input_file.stem
+    output_file = Path(args.output) if args.output else spells_dir / f"{re.sub(r'[^A-Za-z0-9_-]', '', source)}.json"
+
+    # Settle the format (reading the input) before anything touches the output
+    try:
+        importer = find_importer(input_file, args.format)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if output_file.resolve() == input_file.resolve():
+        parser.error(f"{output_file} is the input file; pass a different --output")
+    if output_file.resolve() in protected_paths():
+        parser.error(f"{output_file} is a build pipeline file; pass a different --output or --source")
+
+    # Check ids against the packed store so the existing catalog is never loaded
+    store = SpellStore(spells_dir / STORE_FILENAME) if (spells_dir / STORE_FILENAME).exists() else None
+    seen = set()
+    skipped = 0
+
+    def new_spells():
+        nonlocal skipped
+        for spell in import_spells(input_file, importer.name, source):
+            key = spell_id(spell.get('name'))
+            if not key or key in seen or (store and store.get_by_id(key)):
+                skipped += 1
+                continue
+            seen.add(key)
+            yield spell
+
+    try:
+        count = write_spells_stream(new_spells(), output_file)
+    finally:
+        if store:
+            store.close()
+
+    print(f"Imported {count} spells into {output_file.name} ({skipped} duplicates skipped)")
+
+if __name__ == "__main__":
+    main()
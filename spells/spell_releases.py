@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Versioned releases of the card data with per-version delta patches.
+
+Each build that changes any registered data file (sources, bundles and the
+catalog in cards2/public/spells.json) becomes a new dataset version. The
+registry records the current version:
+
+    "release": {"version": 7, "index": "data/releases/index.json"}
+
+and next to the full snapshots, data/releases/ holds one patch per version
+plus an index of the patches still published (and "minVersion", the oldest
+version they can update):
+
+    patch-7.json  {"from": 6, "to": 7, "files": {
+                     "data/Core.json": {"added": [...], "changed": [...],
+                                        "removed": ["old-spell-id"],
+                                        "order": [...], "count": 81}}}
+
+Records are keyed by spell id; "changed" and "added" carry whole records,
+"order" (the full id order) is only present when records were added or
+moved, and "count" lets the client check the result. A file that is new in
+a version gets {"reset": true} instead, so older copies are refetched. A
+client holding version N of a file applies patches N+1..M instead of
+downloading it again; clients older than minVersion fetch the snapshot.
+
+The per-record hashes of the last release are kept in spells/dataset-release.json
+so the next build can tell what changed.
+
+Usage:
+    python spell_releases.py    # cut a release if the data changed
+"""
+
+import json
+from pathlib import Path
+
+from spell_catalog import load_registry
+from spell_diff import content_hash
+from spell_store import spell_id
+
+RELEASES_DIR = "data/releases"
+INDEX_FILE = f"{RELEASES_DIR}/index.json"
+STATE_FILENAME = "dataset-release.json"
+STATE_VERSION = 1
+
+# Patches older than this many versions are dropped; those clients refetch
+KEEP_PATCHES = 20
+
+def registered_files(registry):
+    """Data files in spells.json whose records the client caches."""
+    files = [source['file'] for source in registry.get('sources', [])]
+    files += [bundle['file'] for bundle in registry.get('bundles', [])]
+    if registry.get('catalog'):
+        files.append(registry['catalog'])
+    return list(dict.fromkeys(files))  # a bundle may be the catalog itself
+
+def record_hashes(records):
+    """[id, content hash] for each record of a data file, in file order."""
+    return [[spell_id(record.get('name', '')), content_hash(record)] for record in records]
+
+def diff_file(previous, records):
+    """
+    Patch for one data file from the previous [id, hash] list to the current records.
+    Returns None if nothing changed.
+    """
+    current = record_hashes(records)
+    if current == previous:
+        return None
+
+    previous_hashes = dict(previous)
+    current_ids = {record_id for record_id, _ in current}
+    patch = {
+        'added': [record for record, (record_id, _) in zip(records, current) if record_id not in previous_hashes],
+        'changed': [record for record, (record_id, digest) in zip(records, current)
+                    if record_id in previous_hashes and previous_hashes[record_id] != digest],
+        'removed': [record_id for record_id, _ in previous if record_id not in current_ids]
+    }
+
+    # Without additions or moves the client's order minus removals is already right
+    kept_order = [record_id for record_id, _ in previous if record_id in current_ids]
+    if [record_id for record_id, _ in current] != kept_order:
+        patch['order'] = [record_id for record_id, _ in current]
+    patch['count'] = len(records)
+    return patch
+
+def apply_patch(records, patch):
+    """Apply a file patch to a list of records, as the client does. Returns the new list."""
+    by_id = {spell_id(record.get('name', '')): record for record in records}
+    for record_id in patch['removed']:
+        by_id.pop(record_id, None)
+    for record in patch['added'] + patch['changed']:
+        by_id[spell_id(record.get('name', ''))] = record
+
+    order = patch.get('order') or [spell_id(record.get('name', '')) for record in records
+                                   if spell_id(record.get('name', '')) in by_id]
+    return [by_id[record_id] for record_id in order]
+
+def load_state(state_path):
+    """Load the last release's version and record hashes, or an empty state."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {'version': 0, 'files': {}}
+    if state.get('format') != STATE_VERSION:
+        return {'version': state.get('version', 0), 'files': {}}
+    return state
+
+def write_release(public_dir, state_path=None):
+    """
+    Cut a new dataset version if any registered data file changed since the last
+    release: write its patch, update the patch index and stamp spells.json.
+    Returns the current version.
+    """
+    public_dir = Path(public_dir)
+    state_path = Path(state_path) if state_path else Path(__file__).parent / STATE_FILENAME
+    registry = load_registry(public_dir)
+    state = load_state(state_path)
+
+    files = {}
+    patches = {}
+    for filename in registered_files(registry):
+        with open(public_dir / filename, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        files[filename] = record_hashes(records)
+        if filename not in state['files']:
+            # New (or re-added) file: any client copy predates it and must be refetched
+            patches[filename] = {'reset': True}
+            continue
+        patch = diff_file(state['files'][filename], records)
+        if patch:
+            patches[filename] = patch
+
+    version = state['version']
+    releases_dir = public_dir / RELEASES_DIR
+    releases_dir.mkdir(parents=True, exist_ok=True)
+    if files != state['files']:
+        version += 1
+        if version > 1 and patches:
+            with open(public_dir / f"{RELEASES_DIR}/patch-{version}.json", 'w', encoding='utf-8') as f:
+                json.dump({'from': version - 1, 'to': version, 'files': patches}, f, ensure_ascii=False, separators=(',', ':'))
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': STATE_VERSION, 'version': version, 'files': files}, f, ensure_ascii=False, separators=(',', ':'))
+            f.write('\n')
+        reset = sum(1 for patch in patches.values() if patch.get('reset'))
+        print(f"Released dataset version {version} ({len(patches) - reset} file(s) patched, {reset} new)")
+    else:
+        print(f"Dataset unchanged at version {version}")
+
+    # Publish the patches for the last KEEP_PATCHES versions. A version without a
+    # patch file only removed files, so clients step over it.
+    oldest = max(2, version - KEEP_PATCHES + 1)
+    entries = []
+    for patch_file in sorted(releases_dir.glob("patch-*.json")):
+        to_version = int(patch_file.stem.split('-')[1])
+        if to_version < oldest:
+            patch_file.unlink()
+            continue
+        entries.append({'from': to_version - 1, 'to': to_version, 'file': f"{RELEASES_DIR}/{patch_file.name}"})
+    entries.sort(key=lambda entry: entry['to'])
+    index = {'version': version, 'minVersion': oldest - 1, 'patches': entries}
+    with open(public_dir / INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    release = {'version': version, 'index': INDEX_FILE}
+    if registry.get('release') != release:
+        registry['release'] = release
+        with open(public_dir / "spells.json", 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    return version
+
+def main():
+    """Cut a release for the frontend's public data directory."""
+    write_release(Path(__file__).parent.parent / 'cards2' / 'public')
+
+if __name__ == "__main__":
+    main()
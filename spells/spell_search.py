@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Build an n-gram search index over spell names for the Additional Spells picker.
+
+Every 1-, 2- and 3-character substring of each lowercased spell name maps to
+the sorted ids of the names containing it. A query of up to three characters
+is a single posting lookup; longer queries intersect the postings of their
+trigrams and verify the few remaining candidates. Matches are ranked exact
+name, then name prefix, then word prefix, then any substring.
+
+Usage:
+    python spell_search.py              # write cards2/public/data/search-index.json
+    python spell_search.py QUERY        # search the catalog from the command line
+"""
+
+import json
+import re
+import sys
+from collections import defaultdict
+
+INDEX_VERSION = 1
+INDEX_FILE = "data/search-index.json"
+GRAM_SIZE = 3
+
+def grams(text, max_size=GRAM_SIZE):
+    """Return the set of substrings of text with length 1..max_size."""
+    return {text[i:i + size] for size in range(1, max_size + 1) for i in range(len(text) - size + 1)}
+
+def build_index(names):
+    """Build the search index for a list of spell names."""
+    names = sorted(set(names), key=str.lower)
+    postings = defaultdict(list)
+
+    for name_id, name in enumerate(names):
+        for gram in sorted(grams(name.lower())):
+            postings[gram].append(name_id)
+
+    return {
+        'version': INDEX_VERSION,
+        'names': names,
+        'grams': dict(sorted(postings.items()))
+    }
+
+def match_rank(name, query):
+    """Rank a matching name: 0 exact, 1 name prefix, 2 word prefix, 3 substring."""
+    lowered = name.lower()
+    if lowered == query:
+        return 0
+    if lowered.startswith(query):
+        return 1
+    if re.search(r'(?<![a-z0-9])' + re.escape(query), lowered):
+        return 2
+    return 3
+
+def search(index, query, limit=None):
+    """Return names containing query (case-insensitive), best matches first."""
+    query = query.strip().lower()
+    names = index['names']
+    if not query:
+        return list(names)
+
+    if len(query) <= GRAM_SIZE:
+        candidates = index['grams'].get(query, [])
+    else:
+        lists = sorted((index['grams'].get(query[i:i + GRAM_SIZE], []) for i in range(len(query) - GRAM_SIZE + 1)), key=len)
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+
+    matches = [names[name_id] for name_id in candidates if query in names[name_id].lower()]
+    matches.sort(key=lambda name: (match_rank(name, query), name.lower()))
+    return matches[:limit] if limit else matches
+
+def write_index(public_dir):
+    """Build the index over the merged catalog and register it in spells.json."""
+    # Imported here so searching an existing index (dndsheet search) doesn't pay for
+    # pathlib or the catalog and fitting code at startup
+    from pathlib import Path
+
+    from spell_catalog import load_registry, merge_catalog
+
+    public_dir = Path(public_dir)
+    spells, _ = merge_catalog(public_dir)
+    index = build_index(spell['name'] for spell in spells)
+
+    with open(public_dir / INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    registry = load_registry(public_dir)
+    if registry.get('searchIndex') != INDEX_FILE:
+        registry['searchIndex'] = INDEX_FILE
+        with open(public_dir / "spells.json", 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    return index
+
+def main():
+    """Write the index, or search it when given a query."""
+    from pathlib import Path
+
+    public_dir = Path(__file__).parent.parent / 'cards2' / 'public'
+
+    if len(sys.argv) > 1:
+        with open(public_dir / INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        for name in search(index, ' '.join(sys.argv[1:]), limit=20):
+            print(name)
+        return
+
+    index = write_index(public_dir)
+    print(f"Created {INDEX_FILE} with {len(index['names'])} names and {len(index['grams'])} grams")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Read-only packed spell store.
+
+Packs the generated spell JSON files into a single binary file that can be
+mmap'ed and queried by spell id (or name) without deserializing the rest of
+the corpus. Layout (all integers little-endian):
+
+    header   : magic(8) version(u32) record_count(u32) slot_count(u32)
+    slots    : slot_count x (key_hash(u64) offset(u32) length(u32))
+    records  : record_count x (offset(u32) length(u32))
+    heap     : UTF-8 JSON bytes of each spell, back to back
+
+The slot table is an open-addressing hash table (linear probing) keyed on the
+spell id, so a lookup touches one or two slots and decodes a single record.
+"""
+
+import hashlib
+import json
+import mmap
+import re
+import struct
+import sys
+from pathlib import Path
+
+STORE_MAGIC = b'DNDSPELL'
+STORE_VERSION = 1
+STORE_FILENAME = "spells.store"
+
+HEADER = struct.Struct('<8sIII')
+SLOT = struct.Struct('<QII')
+RECORD = struct.Struct('<II')
+
+# Generated spell files packed into the store, in source precedence order
+SOURCE_FILES = [
+    "5e-SRD-Spells.json",
+    "Core.json",
+    "XanatharsGuide.json",
+    "TashasCauldron.json",
+    "FizbansTreasury.json",
+]
+
+def spell_id(name):
+    """Convert a spell name to its id, matching the SRD 'index' format (e.g. 'acid-arrow')."""
+    if not name:
+        return ""
+    slug = re.sub(r"[’']", '', name.strip().lower())
+    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    return slug.strip('-')
+
+def key_hash(key):
+    """Stable 64-bit hash of a spell id (Python's hash() is salted per process)."""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    # Zero marks an empty slot
+    return int.from_bytes(digest, 'little') or 1
+
+def build_store(spells, store_file):
+    """Write the given spell dicts to a packed store file. Later duplicates of an id are skipped."""
+    heap = bytearray()
+    records = []
+    keys = []
+    seen = set()
+
+    for spell in spells:
+        key = spell_id(spell.get('name', ''))
+        if not key or key in seen:
+            continue
+        seen.add(key)
+
+        data = json.dumps(spell, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        records.append((len(heap), len(data)))
+        keys.append(key)
+        heap += data
+
+    # Keep the table at most half full so probe chains stay short
+    slot_count = 1
+    while slot_count < 2 * len(records):
+        slot_count *= 2
+
+    heap_start = HEADER.size + slot_count * SLOT.size + len(records) * RECORD.size
+    slots = [(0, 0, 0)] * slot_count
+    for key, (offset, length) in zip(keys, records):
+        h = key_hash(key)
+        i = h & (slot_count - 1)
+        while slots[i][0]:
+            i = (i + 1) & (slot_count - 1)
+        slots[i] = (h, heap_start + offset, length)
+
+    with open(store_file, 'wb') as f:
+        f.write(HEADER.pack(STORE_MAGIC, STORE_VERSION, len(records), slot_count))
+        for slot in slots:
+            f.write(SLOT.pack(*slot))
+        for offset, length in records:
+            f.write(RECORD.pack(heap_start + offset, length))
+        f.write(heap)
+
+    return len(records)
+
+def build_store_from_outputs(spells_dir, store_file=None):
+    """Pack the generated spell JSON files in spells_dir into a store file."""
+    spells_dir = Path(spells_dir)
+    store_file = store_file or spells_dir / STORE_FILENAME
+
+    all_spells = []
+    for filename in SOURCE_FILES:
+        filepath = spells_dir / filename
+        if not filepath.exists():
+            continue
+        with open(filepath, 'r', encoding='utf-8') as f:
+            all_spells.extend(json.load(f))
+
+    return build_store(all_spells, store_file)
+
+class SpellStore:
+    """Memory-mapped, read-only view of a packed spell store."""
+
+    def __init__(self, store_file):
+        with open(store_file, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.record_count, self.slot_count = HEADER.unpack_from(self._mm, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self._mm.close()
+            raise ValueError(f"{store_file} is not a version {STORE_VERSION} spell store")
+
+        self._records_start = HEADER.size + self.slot_count * SLOT.size
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.record_count
+
+    def _decode(self, offset, length):
+        return json.loads(self._mm[offset:offset + length].decode('utf-8'))
+
+    def get_by_id(self, key):
+        """Return the spell with the given id, or None."""
+        h = key_hash(key)
+        mask = self.slot_count - 1
+        i = h & mask
+
+        while True:
+            slot_hash, offset, length = SLOT.unpack_from(self._mm, HEADER.size + i * SLOT.size)
+            if slot_hash == 0:
+                return None
+            if slot_hash == h:
+                spell = self._decode(offset, length)
+                # Guard against 64-bit hash collisions
+                if spell_id(spell.get('name', '')) == key:
+                    return spell
+            i = (i + 1) & mask
+
+    def get(self, name):
+        """Return the spell with the given name, or None."""
+        return self.get_by_id(spell_id(name))
+
+    def __getitem__(self, position):
+        """Return the spell at the given position in build order."""
+        if not 0 <= position < self.record_count:
+            raise IndexError(position)
+        offset, length = RECORD.unpack_from(self._mm, self._records_start + position * RECORD.size)
+        return self._decode(offset, length)
+
+    def __iter__(self):
+        for position in range(self.record_count):
+            yield self[position]
+
+def open_store(spells_dir=None):
+    """
+    Open the default store in spells_dir (the directory of this script by default).
+    The store isn't checked in, so in a fresh clone it is packed from the
+    committed spell JSON files first.
+    """
+    spells_dir = Path(spells_dir) if spells_dir else Path(__file__).parent
+    store_file = spells_dir / STORE_FILENAME
+    if not store_file.exists():
+        count = build_store_from_outputs(spells_dir, store_file)
+        print(f"Built {STORE_FILENAME} from the spell JSON files ({count} spells); "
+              f"build_pipeline.py keeps it up to date", file=sys.stderr)
+    return SpellStore(store_file)
+
+def main():
+    """Build the store from the generated JSON files, or look up spells by name."""
+    spells_dir = Path(__file__).parent
+
+    if len(sys.argv) > 1:
+        with open_store(spells_dir) as store:
+            for name in sys.argv[1:]:
+                spell = store.get(name)
+                if spell:
+                    print(json.dumps(spell, indent=2, ensure_ascii=False))
+                else:
+                    print(f"{name}: NOT FOUND")
+        return
+
+    count = build_store_from_outputs(spells_dir)
+    print(f"Packed {count} spells into {STORE_FILENAME}")
+
+if __name__ == "__main__":
+    main()